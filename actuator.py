@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Worker thread'ini durdurmak için kuyruğa konan işaret
+_STOP = object()
+
+
+class MotorActuator:
+    """Motor komutlarını kendi thread'inde uygulayan sürücü.
+
+    request() beklemeden döner; komutlar kuyruğa yazılır. Worker kuyrukta
+    biriken komutlardan sadece en sonuncusunu uygular ve motor zaten istenen
+    durumdaysa hiçbir şey yapmaz. Böylece Telegram handler'ları motorun
+    bekleme sürelerini hiç beklemez.
+    """
+
+    def __init__(self, start_motor, stop_motor, is_running):
+        # start_motor() / stop_motor() başarılıysa True döndürmeli
+        self._start_motor = start_motor
+        self._stop_motor = stop_motor
+
+        self.last_state = bool(is_running())  # Son uygulanan durum
+        self.last_latency = None  # İstekten uygulamaya geçen süre (saniye)
+        self.applied_count = 0
+        self.coalesced_count = 0
+
+        self._desired_state = self.last_state
+        self._queue = queue.Queue()
+        self._thread = None
+        # start/stop ile request arasındaki yarışı önler: durdurma işaretinden
+        # sonra kuyruğa komut eklenmez
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Worker thread'ini başlat."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="motor-actuator", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """Bekleyen komutları uygulayıp worker thread'ini durdur."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None:
+            thread.join(timeout)
+
+    def request(self, running):
+        """Motorun çalışmasını (True) veya durmasını (False) iste.
+
+        Komut kuyruğa alındıysa True, worker çalışmadığı için (başlatılmamış,
+        durdurulmuş ya da çökmüş) reddedildiyse False döndürür.
+        """
+        running = bool(running)
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                logger.error("Motor worker'ı çalışmıyor, komut reddedildi.")
+                return False
+            self._desired_state = running
+            self._queue.put((running, time.monotonic()))
+        return True
+
+    def state(self):
+        """Motorun istenen durumu (bekleyen komut varsa onun sonucu)."""
+        return self._desired_state
+
+    def stats(self):
+        """Son uygulanan durum ve komut istatistikleri."""
+        return {
+            "state": self.last_state,
+            "pending": self._queue.qsize(),
+            "last_latency": self.last_latency,
+            "applied": self.applied_count,
+            "coalesced": self.coalesced_count
+        }
+
+    def _run(self):
+        while True:
+            command = self._queue.get()
+
+            # Kuyrukta biriken komutlardan sadece sonuncusu önemli
+            stopping = command is _STOP
+            while not stopping:
+                try:
+                    newer = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if newer is _STOP:
+                    stopping = True
+                else:
+                    command = newer
+                    self.coalesced_count += 1
+
+            if command is not _STOP:
+                self._apply(*command)
+            if stopping:
+                return
+
+    def _apply(self, running, requested_at):
+        if running == self.last_state:
+            self.coalesced_count += 1
+            return
+
+        try:
+            ok = self._start_motor() if running else self._stop_motor()
+        except Exception as e:
+            logger.error(f"Motor komutu uygulanamadı: {e}")
+            ok = False
+
+        if ok:
+            self.last_state = running
+            self.last_latency = time.monotonic() - requested_at
+            self.applied_count += 1
+            logger.info(f"Motor {'çalıştırıldı' if running else 'durduruldu'} ({self.last_latency * 1000:.1f} ms)")
+        else:
+            logger.error(f"Motor {'çalıştırılamadı' if running else 'durdurulamadı'}!")
+            # Uygulanamayan istek durum olarak gösterilmesin
+            if self._queue.empty():
+                self._desired_state = self.last_state
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import rules
+
+# Geri test sonucu: süreler saniye cinsindendir
+BacktestResult = namedtuple("BacktestResult", [
+    "samples",            # Oynatılan örnek sayısı
+    "start",              # İlk örneğin zamanı
+    "end",                # Son örneğin zamanı
+    "toggles",            # Motor durumunun kaç kez değişeceği
+    "starts",             # Bunlardan kaçının çalıştırma olduğu
+    "stops",              # Bunlardan kaçının durdurma olduğu
+    "time_on",            # Motorun açık kalacağı süre
+    "time_off",           # Motorun kapalı kalacağı süre
+    "duty_cycle",         # time_on / (time_on + time_off)
+    "recorded_toggles"    # Kayıtlı geçmişte motorun gerçekte kaç kez değiştiği
+])
+
+
+def chain_mask(chain, columns):
+    """Derlenmiş zinciri tüm örnekler için tek seferde değerlendir.
+
+    Pasif koşullar sağlanmamış sayılır; bağlaçlar CompiledChain.fold ile
+    aynı biçimde soldan sağa uygulanır.
+    """
+    samples = len(next(iter(columns.values())))
+    if not chain.length:
+        return numpy.zeros(samples, dtype=bool)
+
+    def condition_mask(i):
+        if not chain.active[i]:
+            return numpy.zeros(samples, dtype=bool)
+        return numpy.asarray(chain.functions[i](columns[chain.sensors[i]], chain.values[i]), dtype=bool)
+
+    result = condition_mask(0)
+    for i in range(1, chain.length):
+        join = chain.joins[i]
+        if join == rules.JOIN_AND:
+            result = result & condition_mask(i)
+        elif join == rules.JOIN_OR:
+            result = result | condition_mask(i)
+    return result
+
+
+def replay(should_stop, should_run, initial_power=False):
+    """evaluate_conditions'ın karar kuralını tüm örneklere uygula.
+
+    Önce durdurma: durdurma zinciri sağlanıyorsa motor durur, yoksa çalıştırma
+    zinciri sağlanıyorsa çalışır, hiçbiri sağlanmıyorsa önceki durum korunur.
+    """
+    decisions = numpy.where(should_stop, 0, numpy.where(should_run, 1, -1)).astype(numpy.int8)
+
+    # Karar verilmeyen örneklerde son kararı ileri taşı
+    positions = numpy.where(decisions >= 0, numpy.arange(len(decisions)), -1)
+    numpy.maximum.accumulate(positions, out=positions)
+    power = numpy.where(positions >= 0, decisions[positions], 1 if initial_power else 0)
+    return power.astype(bool)
+
+
+def backtest(records, on_conditions, off_conditions, initial_power=None, max_gap=None):
+    """Kayıtlı sensör geçmişini verilen koşul setiyle yeniden oynat.
+
+    records, history.RECORD_DTYPE tipinde bir NumPy dizisidir
+    (History.range_numpy). initial_power verilmezse ilk kayıttaki motor
+    durumu kullanılır. Ardışık iki örnek arasındaki süre max_gap'ten uzunsa
+    (ör. bot kapalıyken) o aralık süre hesaplarına katılmaz.
+    """
+    if numpy is None:
+        raise RuntimeError("Geri test için NumPy gerekli.")
+
+    samples = len(records)
+    if not samples:
+        return BacktestResult(0, None, None, 0, 0, 0, 0.0, 0.0, 0.0, 0)
+
+    # Eşikler Python float'ı; karşılaştırma canlı değerlendirmedeki gibi float64'te yapılır
+    columns = {
+        "temperature": records["temperature"].astype(numpy.float64),
+        "humidity": records["humidity"].astype(numpy.float64),
+        "light": records["light"].astype(numpy.float64)
+    }
+    plan = rules.CompiledPlan(None, on_conditions, off_conditions)
+    should_stop = chain_mask(plan.off_chain, columns)
+    should_run = chain_mask(plan.on_chain, columns)
+
+    recorded = records["power"].astype(bool)
+    if initial_power is None:
+        initial_power = bool(recorded[0])
+    power = replay(should_stop, should_run, initial_power)
+
+    # Durum değişimleri (başlangıç durumundan ilk örneğe geçiş dahil)
+    changes = numpy.diff(power.astype(numpy.int8), prepend=numpy.int8(initial_power))
+    starts = int(numpy.count_nonzero(changes == 1))
+    stops = int(numpy.count_nonzero(changes == -1))
+
+    # Her örnek bir sonraki örneğe kadar geçerli sayılır
+    timestamps = records["timestamp"]
+    durations = numpy.diff(timestamps, append=timestamps[-1])
+    if max_gap is not None:
+        durations[durations > max_gap] = 0.0
+    time_on = float(durations[power].sum())
+    time_off = float(durations[~power].sum())
+    total = time_on + time_off
+
+    return BacktestResult(
+        samples,
+        float(timestamps[0]),
+        float(timestamps[-1]),
+        starts + stops,
+        starts,
+        stops,
+        time_on,
+        time_off,
+        time_on / total if total else float(power.mean()),
+        int(numpy.count_nonzero(numpy.diff(recorded.astype(numpy.int8))))
+    )
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Bir aylık geçmiş (5 saniyelik kontrol periyodunda ~518k örnek) üzerinde
+vektörize geri test ile örnek örnek Python döngüsünün karşılaştırması.
+
+Döngü, evaluate_conditions ile aynı karar kuralını (önce durdurma, sonra
+çalıştırma, yoksa durumu koru) derlenmiş zincirlerle uygular; iki yöntemin
+toggle sayısı ve açık kalma süresi aynı olmalıdır.
+
+Kullanım (proje kök dizininden, NumPy gerekli):
+    python benchmarks/bench_backtest.py
+"""
+
+import os
+import sys
+import time
+
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import backtest  # noqa: E402
+import history  # noqa: E402
+import rules  # noqa: E402
+
+PERIOD = 5.0
+DAYS = 30
+SAMPLES = int(DAYS * 86400 / PERIOD)
+
+ON_CONDITIONS = [
+    {"id": "1", "type": "temperature", "operator": ">", "value": 26.0, "state": True, "logical": "AND"},
+    {"id": "2", "type": "light", "operator": ">=", "value": 400.0, "state": True, "logical": "OR"},
+    {"id": "3", "type": "humidity", "operator": ">", "value": 80.0, "state": True}
+]
+OFF_CONDITIONS = [
+    {"id": "4", "type": "temperature", "operator": "<", "value": 23.0, "state": True, "logical": "AND"},
+    {"id": "5", "type": "humidity", "operator": "<", "value": 70.0, "state": True, "logical": "OR"},
+    {"id": "6", "type": "light", "operator": "<", "value": 50.0, "state": False}
+]
+
+
+def make_records(rng):
+    """Günlük döngülü, gürültülü sentetik sensör geçmişi."""
+    records = numpy.zeros(SAMPLES, dtype=history.RECORD_DTYPE)
+    timestamps = 1.7e9 + numpy.arange(SAMPLES) * PERIOD
+    day = 2 * numpy.pi * timestamps / 86400
+    records["timestamp"] = timestamps
+    records["temperature"] = 24 + 3 * numpy.sin(day) + rng.normal(0, 0.5, SAMPLES)
+    records["humidity"] = 65 + 15 * numpy.cos(day) + rng.normal(0, 2, SAMPLES)
+    records["light"] = numpy.clip(500 * numpy.sin(day), 0, None) + rng.normal(0, 20, SAMPLES)
+    return records
+
+
+def loop_backtest(records, initial_power):
+    """Örnek örnek oynatma: (toggle sayısı, açık kalma süresi)."""
+    plan = rules.CompiledPlan(None, ON_CONDITIONS, OFF_CONDITIONS)
+    power = initial_power
+    toggles = 0
+    time_on = 0.0
+    rows = records.tolist()
+    for i, (timestamp, temperature, humidity, light, _, _, _) in enumerate(rows):
+        sensor_data = {"temperature": temperature, "humidity": humidity, "light": light}
+        if plan.off_chain.evaluate(sensor_data)[0]:
+            state = False
+        elif plan.on_chain.evaluate(sensor_data)[0]:
+            state = True
+        else:
+            state = power
+        if state != power:
+            toggles += 1
+            power = state
+        if power and i + 1 < len(rows):
+            time_on += rows[i + 1][0] - timestamp
+    return toggles, time_on
+
+
+if __name__ == "__main__":
+    records = make_records(numpy.random.default_rng(208))
+
+    start = time.perf_counter()
+    expected_toggles, expected_on = loop_backtest(records, False)
+    loop_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    result = backtest.backtest(records, ON_CONDITIONS, OFF_CONDITIONS, initial_power=False)
+    vector_ms = (time.perf_counter() - start) * 1000
+
+    assert result.toggles == expected_toggles
+    assert abs(result.time_on - expected_on) < 1e-6 * SAMPLES * PERIOD
+
+    print(f"örnek={SAMPLES}  toggle={result.toggles}  doluluk=%{result.duty_cycle * 100:.1f}")
+    print(f"döngü={loop_ms:9.1f} ms  vektörize={vector_ms:7.1f} ms  hızlanma={loop_ms / vector_ms:6.1f}x")
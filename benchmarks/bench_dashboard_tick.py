@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Dashboard yenileme maliyetini açık dashboard sayısına göre ölçer.
+
+Eski yöntem (her chat için ayrı job: update_motor_status + get_sensor_data)
+ile yeni global yenileme (refresh_dashboards) karşılaştırılır. Değerler
+sabit olduğu için yeni yöntemde içeriği değişmeyen dashboard'lar
+düzenlenmez. Sensörler sahte okuyucularla
+değiştirilir, böylece sadece okuma ve dosya yükleme sayıları ile
+Python tarafındaki süre ölçülür.
+
+Kullanım (proje kök dizininden):
+    python benchmarks/bench_dashboard_tick.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bot  # noqa: E402
+
+CHAT_COUNTS = (1, 10, 100)
+TICKS = 20
+
+
+class Counter:
+    def __init__(self):
+        self.sensor_reads = 0
+        self.condition_loads = 0
+        self.edits = 0
+
+
+class FakeBot:
+    def __init__(self, counter):
+        self.counter = counter
+
+    def edit_message_text(self, **kwargs):
+        self.counter.edits += 1
+
+
+class FakeOutbox:
+    """Düzenlemeleri göndermek yerine sayan sahte gönderim kuyruğu."""
+
+    def __init__(self, counter):
+        self.counter = counter
+
+    def edit(self, chat_id, message_id, text, reply_markup=None, on_error=None):
+        self.counter.edits += 1
+
+
+class FakeContext:
+    def __init__(self, counter):
+        self.bot = FakeBot(counter)
+
+
+def install_fakes(counter):
+    """Sensör okuyucularını ve koşul yüklemeyi sayaçlı sahteleriyle değiştir."""
+    def read_light():
+        counter.sensor_reads += 1
+        return 512.0
+
+    def read_climate():
+        counter.sensor_reads += 1
+        return 24.0, 45.0
+
+    original_get = bot.CONDITION_STORE.get_versioned
+
+    def get_versioned():
+        counter.condition_loads += 1
+        return original_get()
+
+    bot.SENSOR_SAMPLER = bot.sensor_sampler.SensorSampler(read_light, read_climate)
+    bot.CONDITION_STORE.get_versioned = get_versioned
+    return original_get
+
+
+def legacy_tick(context, chat_ids):
+    """Eski davranış: her chat için ayrı sensör okuması ve render."""
+    for chat_id in chat_ids:
+        bot.update_motor_status()
+        sensor_data = bot.get_sensor_data()
+        context.bot.edit_message_text(
+            chat_id=chat_id,
+            message_id=1,
+            text=bot.dashboard_message(
+                sensor_data["temperature"],
+                sensor_data["humidity"],
+                sensor_data["light"],
+                sensor_data["power"],
+                sensor_data["on_conditions"],
+                sensor_data["off_conditions"]
+            ),
+            reply_markup=bot.get_dashboard_keyboard()
+        )
+
+
+def run(name, chats, tick):
+    counter = Counter()
+    original_get = install_fakes(counter)
+    # Eski yöntemde her get_sensor_data taze okuma yapıyordu
+    if name == "legacy":
+        bot.SENSOR_SAMPLER.max_staleness = 0
+    context = FakeContext(counter)
+    original_outbox = bot.OUTBOX
+    bot.OUTBOX = FakeOutbox(counter)
+    bot.ACTIVE_DASHBOARDS.clear()
+    bot.DASHBOARD_CONTENT.clear()
+    bot.ACTIVE_DASHBOARDS.update({chat_id: 1 for chat_id in range(chats)})
+    try:
+        start = time.perf_counter()
+        for _ in range(TICKS):
+            tick(context)
+        elapsed = time.perf_counter() - start
+    finally:
+        bot.CONDITION_STORE.get_versioned = original_get
+        bot.OUTBOX = original_outbox
+        bot.ACTIVE_DASHBOARDS.clear()
+        bot.DASHBOARD_CONTENT.clear()
+
+    print(
+        f"{name:<8} chats={chats:<4} "
+        f"sensör okuma/tick={counter.sensor_reads / TICKS:7.1f} "
+        f"koşul okuma/tick={counter.condition_loads / TICKS:7.1f} "
+        f"edit/tick={counter.edits / TICKS:7.1f} "
+        f"süre/tick={elapsed / TICKS * 1000:8.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    for chats in CHAT_COUNTS:
+        run("legacy", chats, lambda context: legacy_tick(context, list(range(chats))))
+        run("tick", chats, lambda context: bot.refresh_dashboards())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+DHT11 çerçeve çözücülerinin süre ve doğruluk karşılaştırması.
+
+Eski üç geçişli çözücü (decode_legacy), tek geçişli run-length çözücü (decode)
+ve NumPy kuruluysa vektörize çözücü (decode_numpy) aynı korpus üzerinde
+çalıştırılır.
+
+Kullanım (proje kök dizininden):
+    python benchmarks/bench_dht11_decoder.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dht11 import decoder  # noqa: E402
+import dht11_corpus  # noqa: E402
+
+ROUNDS = 20
+
+
+def classify(the_bytes):
+    """Çözücü çıktısını DHT11.read() ile aynı şekilde sınıflandır."""
+    if the_bytes is None:
+        return "missing"
+    checksum = the_bytes[0] + the_bytes[1] + the_bytes[2] + the_bytes[3] & 255
+    if the_bytes[4] != checksum:
+        return "crc"
+    return bytes(the_bytes)
+
+
+def run(name, decode, corpus):
+    correct = 0
+    for kind, waveform, expected in corpus:
+        if classify(decode(waveform)) == expected:
+            correct += 1
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for kind, waveform, expected in corpus:
+            decode(waveform)
+    elapsed = time.perf_counter() - start
+
+    per_frame = elapsed / (ROUNDS * len(corpus)) * 1e6
+    print(f"{name:<8} çerçeve başına={per_frame:9.1f} µs  doğruluk={correct}/{len(corpus)}")
+
+
+if __name__ == "__main__":
+    corpus = dht11_corpus.build()
+    average = sum(len(waveform) for _, waveform, _ in corpus) / len(corpus)
+    print(f"Korpus: {len(corpus)} dalga formu, ortalama {average:.0f} örnek")
+
+    run("legacy", decoder.decode_legacy, corpus)
+    run("decode", decoder.decode, corpus)
+    if decoder.numpy is not None:
+        run("numpy", decoder.decode_numpy, corpus)
+    else:
+        print("numpy    kurulu değil, atlandı")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Eş zamanlı yük altında callback handler gecikmesi (p50/p99).
+
+10 sohbetten 20 ms arayla gelen 20 "refresh" callback'leri iki modda işlenir:
+
+- eski: tek dispatcher thread'i, handler sensör görüntüsü eskiyse taze
+  okumayı (~1.2 s) bekler
+- yeni: handler'lar HANDLER_WORKERS thread'lik havuzda çalışır, sensör
+  okuması GPIO executor'ına bırakılır, handler beklemez
+
+Gecikme, güncellemenin gelişinden query.answer() çağrısına (onay) ve
+handler'ın bitişine kadar ölçülür. Sensörler sahte okuyucularla
+değiştirilir.
+
+Kullanım (proje kök dizininden):
+    python benchmarks/bench_handlers.py
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bot  # noqa: E402
+import latency  # noqa: E402
+
+UPDATES = 20
+CHATS = 10
+ARRIVAL_INTERVAL = 0.02  # saniye
+READ_TIME = 1.2  # DHT11 + LDR okuma süresi (saniye)
+MAX_STALENESS = 1.0  # Görüntünün hızla eskimesi için kısa tutulur
+
+
+class FakeMessage:
+    def __init__(self, chat_id):
+        self.chat_id = chat_id
+        self.message_id = 1
+
+
+class FakeQuery:
+    def __init__(self, chat_id, arrived, ack_stats):
+        self.data = "refresh"
+        self.message = FakeMessage(chat_id)
+        self.arrived = arrived
+        self.ack_stats = ack_stats
+        self.acked = False
+
+    def answer(self, *args, **kwargs):
+        if not self.acked:
+            self.acked = True
+            self.ack_stats.record(time.perf_counter() - self.arrived)
+
+
+class FakeUpdate:
+    def __init__(self, query):
+        self.callback_query = query
+
+
+class FakeOutbox:
+    def edit(self, *args, **kwargs):
+        pass
+
+    def send(self, *args, **kwargs):
+        pass
+
+
+def slow_climate():
+    time.sleep(READ_TIME)
+    return 24.0, 45.0
+
+
+def install_fakes():
+    bot.OUTBOX = FakeOutbox()
+    bot.SENSOR_MAX_STALENESS = MAX_STALENESS
+    bot.SENSOR_SAMPLER = bot.sensor_sampler.SensorSampler(
+        lambda: 512.0, slow_climate, interval=MAX_STALENESS, max_staleness=MAX_STALENESS
+    )
+    bot.GPIO_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gpio")
+    bot.sensor_refresh = None
+
+
+def run(name, dispatch):
+    install_fakes()
+    ack_stats = latency.LatencyStats()
+    done_stats = latency.LatencyStats()
+
+    def handle(update):
+        bot.handle_callback_query(update, None)
+        done_stats.record(time.perf_counter() - update.callback_query.arrived)
+
+    finished = dispatch(handle, ack_stats)
+    bot.GPIO_EXECUTOR.shutdown(wait=True)
+
+    ack, done = ack_stats.summary(), done_stats.summary()
+    print(f"{name:<5} onay p50={ack['p50_ms']:8.1f} ms p99={ack['p99_ms']:8.1f} ms  "
+          f"bitiş p50={done['p50_ms']:8.1f} ms p99={done['p99_ms']:8.1f} ms  "
+          f"toplam={finished:5.2f} s")
+
+
+def arrivals(ack_stats):
+    """Güncellemeleri gerçek zamanlı geliş aralıklarıyla üret."""
+    for i in range(UPDATES):
+        query = FakeQuery(i % CHATS, time.perf_counter(), ack_stats)
+        yield FakeUpdate(query)
+        time.sleep(ARRIVAL_INTERVAL)
+
+
+def sync_dispatch(handle, ack_stats):
+    """Eski mod: tek dispatcher thread'i, handler'lar sırayla ve engelleyerek."""
+    original = bot.get_sensor_data
+    bot.get_sensor_data = lambda max_staleness=None, block=True: original(max_staleness, block=True)
+    updates = queue.Queue()
+    started = time.perf_counter()
+
+    def dispatcher():
+        while True:
+            update = updates.get()
+            if update is None:
+                return
+            handle(update)
+
+    thread = threading.Thread(target=dispatcher)
+    thread.start()
+    try:
+        for update in arrivals(ack_stats):
+            updates.put(update)
+        updates.put(None)
+        thread.join()
+    finally:
+        bot.get_sensor_data = original
+    return time.perf_counter() - started
+
+
+def async_dispatch(handle, ack_stats):
+    """Yeni mod: handler'lar worker havuzunda, sensör okuması GPIO executor'ında."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=bot.HANDLER_WORKERS) as pool:
+        for update in arrivals(ack_stats):
+            pool.submit(handle, update)
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    run("eski", sync_dispatch)
+    run("yeni", async_dispatch)
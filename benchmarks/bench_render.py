@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Dashboard metni ve koşul yönetimi klavyesinin render maliyeti.
+
+Yüzlerce koşulla eski render (her çağrıda tüm metin, tüm koşul satırları
+ve tüm koşulları içeren klavye baştan oluşturulur) ile sürümlü render
+önbelleği ve sayfalanmış koşul yönetimi ekranı üç durumda karşılaştırılır:
+
+- aynı: koşullar ve sensör görüntüsü değişmemiş (ör. aynı anda gelen
+  yenileme istekleri)
+- görüntü: her turda yeni sensör görüntüsü, koşullar aynı
+- toggle: her turda bir koşulun durumu değişiyor
+
+Koşul deposu geçici bir dizinde gerçek ConditionStore ile tutulur; sadece
+render süresi ölçülür (toggle'ın diske yazılması ölçüme katılmaz). Ayrıca
+Telegram'a gönderilecek koşul yönetimi klavyesinin JSON boyutu yazdırılır.
+
+Kullanım (proje kök dizininden):
+    python benchmarks/bench_render.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bot  # noqa: E402
+import stores  # noqa: E402
+from bench_rules import make_conditions  # noqa: E402
+
+RULE_COUNTS = (100, 300, 1000)
+ROUNDS = 50
+
+
+def legacy_condition_lines(conditions, flags):
+    lines = ""
+    for condition, is_satisfied in zip(conditions, flags):
+        if is_satisfied is None:
+            active_emoji = "⚪"
+        else:
+            active_emoji = "✅" if is_satisfied else "❌"
+        lines += f"{active_emoji} {bot.format_condition(condition)}\n"
+    return lines
+
+
+def legacy_body(sensor_data):
+    """Önbelleksiz dashboard içeriği (koşul satırları her seferinde formatlanır)."""
+    message = f"🌡️ Sıcaklık: {sensor_data['temperature']:.1f}°C\n"
+    message += f"💧 Nem: {sensor_data['humidity']:.1f}%\n"
+    message += f"💡 Işık: {sensor_data['light']:.0f} lux\n\n"
+    message += f"🔌 Güç: {'✅ Açık' if sensor_data['power'] else '❌ Kapalı'} \n\n"
+    plan = bot.rules.get_plan(sensor_data["conditions_version"], sensor_data["on_conditions"], sensor_data["off_conditions"])
+    _, on_flags = plan.on_chain.evaluate(sensor_data)
+    _, off_flags = plan.off_chain.evaluate(sensor_data)
+    message += "🔄 Çalıştırma Koşulları: \n" + legacy_condition_lines(sensor_data["on_conditions"], on_flags) + "\n"
+    message += "⏹️ Durdurma Koşulları: \n" + legacy_condition_lines(sensor_data["off_conditions"], off_flags)
+    return message
+
+
+def legacy_management_keyboard():
+    """Önbelleksiz koşul yönetimi klavyesi (tüm butonlar her seferinde oluşturulur)."""
+    on_conditions, off_conditions = bot.CONDITION_STORE.get()
+    keyboard = []
+    for condition_type, conditions in (("on", on_conditions), ("off", off_conditions)):
+        keyboard.append([bot.InlineKeyboardButton("---", callback_data="do_nothing")])
+        for condition in conditions:
+            state_emoji = "✅" if condition.get("state", True) else "❌"
+            keyboard.append([
+                bot.InlineKeyboardButton(
+                    f"{state_emoji} {bot.format_condition(condition)}",
+                    callback_data=f"toggle_{condition_type}_condition:{condition['id']}"
+                ),
+                bot.InlineKeyboardButton("Sil 🗑️", callback_data=f"delete_{condition_type}_condition:{condition['id']}")
+            ])
+    keyboard.append([bot.InlineKeyboardButton("◀️ Geri", callback_data="back_to_dashboard")])
+    return bot.InlineKeyboardMarkup(keyboard)
+
+
+def legacy_render(sensor_data):
+    legacy_body(sensor_data)
+    legacy_management_keyboard()
+
+
+def cached_render(sensor_data):
+    bot.dashboard_content(sensor_data)
+    bot.get_condition_management_keyboard(0)
+
+
+def sensor_data(snapshot_version, light):
+    version, on_conditions, off_conditions = bot.CONDITION_STORE.get_versioned()
+    snapshot = bot.sensor_sampler.SensorSnapshot(
+        24.0, 45.0, light, 0.0, None, None, None, time.time(), snapshot_version
+    )
+    return {
+        "temperature": snapshot.temperature,
+        "humidity": snapshot.humidity,
+        "light": snapshot.light,
+        "snapshot": snapshot,
+        "power": False,
+        "on_conditions": on_conditions,
+        "off_conditions": off_conditions,
+        "conditions_version": version
+    }
+
+
+def reset_caches():
+    """Her çalıştırmada yeni depo kullanıldığı için (sürümler 1'den başlar) önbellekleri sıfırla."""
+    bot.DASHBOARD_BODY_CACHE = bot.render_cache.VersionedValue()
+    bot.MANAGEMENT_PAGE_CACHE = bot.render_cache.VersionedValue()
+    for name in ("ON_CONDITION_TEXTS", "OFF_CONDITION_TEXTS"):
+        cache = getattr(bot, name)
+        setattr(bot, name, bot.render_cache.FragmentCache(cache.render, cache.key))
+
+
+def run(name, rules_count, scenario, render):
+    rng = random.Random(rules_count)
+    with tempfile.TemporaryDirectory() as directory:
+        bot.CONDITION_STORE = stores.ConditionStore(os.path.join(directory, "conditions.json"))
+        bot.CONDITION_STORE.replace(make_conditions(rules_count // 2, rng), make_conditions(rules_count // 2, rng))
+        reset_caches()
+        on_conditions, _ = bot.CONDITION_STORE.get()
+
+        # Önbellekleri ısıt
+        render(sensor_data(0, 512.0))
+        before = bot.ON_CONDITION_TEXTS.rendered
+
+        elapsed = 0.0
+        for i in range(1, ROUNDS + 1):
+            if scenario == "aynı":
+                data = sensor_data(0, 512.0)
+            elif scenario == "görüntü":
+                data = sensor_data(i, 512.0 + i)
+            else:
+                condition = on_conditions[rng.randrange(len(on_conditions))]
+                bot.CONDITION_STORE.toggle_condition("on", condition["id"])
+                data = sensor_data(0, 512.0)
+            start = time.perf_counter()
+            render(data)
+            elapsed += time.perf_counter() - start
+
+        rendered = bot.ON_CONDITION_TEXTS.rendered - before
+        markup = legacy_management_keyboard() if render is legacy_render else bot.get_condition_management_keyboard()
+        markup_bytes = len(markup.to_json().encode())
+
+    print(
+        f"{name:<8} koşul={rules_count:<5} {scenario:<8} "
+        f"render/tur={elapsed / ROUNDS * 1000:8.3f} ms  klavye={markup_bytes:7d} bayt"
+        + (f"  yeniden render edilen metin/tur={rendered / ROUNDS:6.1f}" if render is cached_render else "")
+    )
+
+
+if __name__ == "__main__":
+    for rules_count in RULE_COUNTS:
+        for scenario in ("aynı", "görüntü", "toggle"):
+            run("eski", rules_count, scenario, legacy_render)
+            run("önbellek", rules_count, scenario, cached_render)
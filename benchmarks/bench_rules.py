@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Koşul zinciri değerlendirme mikrobenchmark'ı.
+
+Eski yöntem (her koşul için sözlük erişimi ve if/elif operatör merdiveni,
+zincir ve dashboard bayrakları için ayrı ayrı) ile derlenmiş plan
+(rules.get_plan) yüzlerce kural üzerinde karşılaştırılır. Ayrıca kontrol
+döngüsünün artımlı planı (rules.get_incremental_plan), her örnekte sadece
+ışık değeri değişirken ölçülür.
+
+Kullanım (proje kök dizininden):
+    python benchmarks/bench_rules.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rules  # noqa: E402
+
+RULE_COUNTS = (10, 100, 500)
+ROUNDS = 200
+SENSORS = ("temperature", "humidity", "light")
+OPERATORS = (">", "<", "=", ">=", "<=")
+
+
+def make_conditions(count, rng):
+    conditions = []
+    for i in range(count):
+        condition = {
+            "id": str(i),
+            "type": rng.choice(SENSORS),
+            "operator": rng.choice(OPERATORS),
+            "value": float(rng.randint(0, 100)),
+            "state": rng.random() > 0.1
+        }
+        if i < count - 1:
+            condition["logical"] = rng.choice(("AND", "OR"))
+        conditions.append(condition)
+    return conditions
+
+
+def legacy_check(condition, sensor_data):
+    if not condition.get('state', True):
+        return False
+    sensor_value = sensor_data[condition['type']]
+    operator = condition['operator']
+    value = condition['value']
+    if operator == ">":
+        return sensor_value > value
+    elif operator == "<":
+        return sensor_value < value
+    elif operator == "=":
+        return sensor_value == value
+    elif operator == ">=":
+        return sensor_value >= value
+    elif operator == "<=":
+        return sensor_value <= value
+    return False
+
+
+def legacy_chain(conditions, sensor_data):
+    if not conditions:
+        return False
+    result = legacy_check(conditions[0], sensor_data)
+    for i in range(1, len(conditions)):
+        logical = conditions[i - 1].get("logical", "NONE")
+        if logical == "NONE":
+            break
+        current = legacy_check(conditions[i], sensor_data)
+        if logical == "AND":
+            result = result and current
+        elif logical == "OR":
+            result = result or current
+    return result
+
+
+def legacy_round(on_conditions, off_conditions, sensor_data):
+    """Eski yöntemde bir yenileme: iki zincir + dashboard için tüm bayraklar."""
+    stop = legacy_chain(off_conditions, sensor_data)
+    run = legacy_chain(on_conditions, sensor_data)
+    flags = [legacy_check(c, sensor_data) if c.get("state", True) else None
+             for c in on_conditions + off_conditions]
+    return stop, run, flags
+
+
+def compiled_round(on_conditions, off_conditions, sensor_data):
+    """Derlenmiş planla bir yenileme: zincir sonucu ve bayraklar tek geçişte."""
+    plan = rules.get_plan(1, on_conditions, off_conditions)
+    stop, off_flags = plan.off_chain.evaluate(sensor_data)
+    run, on_flags = plan.on_chain.evaluate(sensor_data)
+    return stop, run, on_flags + off_flags
+
+
+def incremental_round(on_conditions, off_conditions, sensor_data):
+    """Artımlı planla bir kontrol adımı: sadece değişen sensörün koşulları."""
+    return rules.get_incremental_plan(1, on_conditions, off_conditions).update(sensor_data)
+
+
+def measure(function, on_conditions, off_conditions, samples):
+    start = time.perf_counter()
+    for i in range(ROUNDS):
+        function(on_conditions, off_conditions, samples[i % len(samples)])
+    return (time.perf_counter() - start) / ROUNDS * 1e6
+
+
+if __name__ == "__main__":
+    rng = random.Random(208)
+    samples = [
+        {sensor: float(rng.randint(0, 100)) for sensor in SENSORS}
+        for _ in range(50)
+    ]
+    for count in RULE_COUNTS:
+        on_conditions = make_conditions(count, rng)
+        off_conditions = make_conditions(count, rng)
+
+        # Yeni kural kümesi: önbellekteki eski planı at
+        rules._cached_plan = None
+
+        # Sonuçlar aynı olmalı
+        for sample in samples:
+            legacy = legacy_round(on_conditions, off_conditions, sample)
+            compiled = compiled_round(on_conditions, off_conditions, sample)
+            assert legacy[:2] == compiled[:2] and legacy[2] == compiled[2]
+
+        legacy_us = measure(legacy_round, on_conditions, off_conditions, samples)
+        compiled_us = measure(compiled_round, on_conditions, off_conditions, samples)
+
+        # Artımlı değerlendirme: sadece ışık değişiyor
+        rules._incremental_plan = None
+        light_samples = [dict(samples[0], light=float(light)) for light in range(0, 100, 2)]
+        incremental_us = measure(incremental_round, on_conditions, off_conditions, light_samples)
+
+        print(f"kural={2 * count:<5} eski={legacy_us:9.1f} µs  derlenmiş={compiled_us:9.1f} µs  "
+              f"artımlı={incremental_us:9.1f} µs  hızlanma={legacy_us / compiled_us:5.2f}x")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Eşik indeksli artımlı değerlendirme ile check_single_condition döngüsünün
+10, 1k ve 100k kural üzerinde karşılaştırması.
+
+Sensör değerleri gerçekçi olması için küçük adımlarla rastgele yürür;
+her adımda bir sensör değişir.
+
+Kullanım (proje kök dizininden):
+    python benchmarks/bench_threshold_index.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rules  # noqa: E402
+
+RULE_COUNTS = (10, 1_000, 100_000)
+STEPS = 200
+SENSORS = ("temperature", "humidity", "light")
+RANGES = {"temperature": (0, 50), "humidity": (0, 100), "light": (0, 1000)}
+OPERATORS = (">", "<", "=", ">=", "<=")
+
+
+def make_conditions(count, rng):
+    conditions = []
+    for i in range(count):
+        sensor = rng.choice(SENSORS)
+        low, high = RANGES[sensor]
+        condition = {
+            "id": str(i),
+            "type": sensor,
+            "operator": rng.choice(OPERATORS),
+            "value": float(rng.randint(low, high)),
+            "state": True
+        }
+        if i < count - 1:
+            condition["logical"] = rng.choice(("AND", "OR"))
+        conditions.append(condition)
+    return conditions
+
+
+def make_walk(rng):
+    sensor_data = {sensor: float(sum(RANGES[sensor]) // 2) for sensor in SENSORS}
+    walk = []
+    for _ in range(STEPS):
+        sensor = rng.choice(SENSORS)
+        low, high = RANGES[sensor]
+        step = (high - low) / 100
+        value = sensor_data[sensor] + rng.choice((-step, step))
+        sensor_data = dict(sensor_data, **{sensor: min(high, max(low, value))})
+        walk.append(sensor_data)
+    return walk
+
+
+def loop_chain(conditions, sensor_data):
+    """Eski yöntem: her örnekte tüm koşullar check_single_condition ile."""
+    result = rules.check_single_condition(conditions[0], sensor_data)
+    for i in range(1, len(conditions)):
+        current = rules.check_single_condition(conditions[i], sensor_data)
+        if conditions[i - 1]["logical"] == "AND":
+            result = result and current
+        else:
+            result = result or current
+    return result
+
+
+if __name__ == "__main__":
+    rng = random.Random(208)
+    for count in RULE_COUNTS:
+        conditions = make_conditions(count, rng)
+        walk = make_walk(rng)
+
+        start = time.perf_counter()
+        expected = [loop_chain(conditions, sensor_data) for sensor_data in walk]
+        loop_us = (time.perf_counter() - start) / STEPS * 1e6
+
+        # İndeks kurulumu ve ilk tam değerlendirme ayrı ölçülür
+        start = time.perf_counter()
+        chain = rules.IncrementalChain(rules.CompiledChain(conditions))
+        chain.update(walk[0])
+        setup_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        results = [chain.update(sensor_data)[0] for sensor_data in walk]
+        index_us = (time.perf_counter() - start) / STEPS * 1e6
+
+        assert results == expected
+        print(f"kural={count:<7} döngü={loop_us:11.1f} µs/örnek  indeks={index_us:8.1f} µs/örnek  "
+              f"kurulum={setup_ms:8.1f} ms  hızlanma={loop_us / index_us:8.1f}x")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+DHT11 dalga formu korpusu.
+
+Her dalga formu, DHT11.__collect_input() çıktısı biçiminde 0/1 örneklerinden
+oluşan bir bytes dizisidir. Korpus DHT11 zamanlamalarından (80/80 µs yanıt,
+50 µs bit başlangıcı, 26-28 µs "0", 70 µs "1") farklı örnekleme
+periyotları ve zamanlama sapmalarıyla sabit bir tohumla üretilir; böylece
+her çalıştırmada aynıdır.
+
+Türler:
+    good       -> geçerli çerçeve, beklenen sonuç 5 bayt
+    truncated  -> sonu kesilmiş çerçeve, beklenen sonuç "missing"
+    crc        -> veri biti bozulmuş çerçeve, beklenen sonuç "crc"
+"""
+
+import random
+
+SEED = 208
+
+# Raspberry Pi üzerinde Python örnekleme döngüsünün tipik periyotları (µs)
+SAMPLE_PERIODS_US = (1.5, 2.5, 4.0, 6.0)
+
+
+def frame_bytes(humidity, temperature):
+    data = [int(humidity), int(humidity * 10) % 10, int(temperature), int(temperature * 10) % 10]
+    data.append(sum(data) & 255)
+    return data
+
+
+def pulses(the_bytes, rng, jitter_us):
+    """Çerçeveyi (seviye, süre µs) darbe listesine çevir."""
+    def width(us):
+        return max(1.0, us + rng.uniform(-jitter_us, jitter_us))
+
+    # Host hattı bıraktığında: kısa HIGH, yanıt LOW/HIGH
+    result = [(1, width(30)), (0, width(80)), (1, width(80))]
+    for byte in the_bytes:
+        for bit in range(7, -1, -1):
+            result.append((0, width(50)))
+            result.append((1, width(70 if (byte >> bit) & 1 else 27)))
+    # Son bitin ardından LOW ve hattın serbest bırakılması
+    result.append((0, width(50)))
+    result.append((1, 1000.0))
+    return result
+
+
+def sample(pulse_list, period_us, rng):
+    """Darbe listesini sabit periyotla (küçük sapmalarla) örnekle."""
+    samples = bytearray()
+    t = 0.0
+    edge = 0.0
+    for level, duration in pulse_list:
+        edge += duration
+        while t < edge:
+            samples.append(level)
+            t += period_us * rng.uniform(0.8, 1.2)
+    # __collect_input 100 değişmeyen örnekten sonra durur
+    tail = len(samples) - len(samples.rstrip(b"\x01"))
+    if tail > 101:
+        del samples[len(samples) - tail + 101:]
+    return bytes(samples)
+
+
+def build(count=200):
+    """(tür, örnekler, beklenen) üçlülerinden oluşan korpusu üret."""
+    rng = random.Random(SEED)
+    corpus = []
+    for i in range(count):
+        humidity = rng.randint(20, 90)
+        temperature = rng.randint(0, 45) + rng.randint(0, 9) / 10
+        period = SAMPLE_PERIODS_US[i % len(SAMPLE_PERIODS_US)]
+        the_bytes = frame_bytes(humidity, temperature)
+        kind = ("good", "truncated", "crc")[i % 3]
+
+        if kind == "crc":
+            # Bir veri bitini çevir, sağlama toplamı artık tutmaz
+            broken = list(the_bytes)
+            bit = rng.randrange(32)
+            broken[bit // 8] ^= 1 << (7 - bit % 8)
+            waveform = sample(pulses(broken, rng, 4), period, rng)
+            expected = "crc"
+        else:
+            pulse_list = pulses(the_bytes, rng, 4)
+            if kind == "truncated":
+                # Çerçevenin sonundaki bitleri kaybet, hat HIGH kalsın
+                cut = rng.randint(10, 60)
+                pulse_list = pulse_list[:-cut]
+                pulse_list.append((1, 1000.0))
+            waveform = sample(pulse_list, period, rng)
+            expected = bytes(the_bytes) if kind == "good" else "missing"
+
+        corpus.append((kind, waveform, expected))
+    return corpus
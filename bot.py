@@ -1,18 +1,36 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import functools
 import os
-import json
+import re
+import time
 import logging
+import secrets
+import signal
+import threading
 import random  # Örnek değerler için kullanıyoruz
 import uuid  # Benzersiz ID'ler için
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, ReplyKeyboardRemove
 from telegram.ext import Updater, CommandHandler, MessageHandler, Filters, CallbackContext, CallbackQueryHandler, ConversationHandler
+from telegram.error import TelegramError
 from dotenv import load_dotenv
 import dc_motor  # servo yerine dc_motor modülünü import et
 import ldr  # LDR modülünü import et
 import dhteleven  # DHT11 modülünü import et
+import sensor_sampler  # Arka plan sensör örnekleyicisi
+import stores  # Bellek içi koşul ve kullanıcı depoları
+import rules  # Derlenmiş koşul zinciri değerlendiricisi
+import actuator  # Motor komut kuyruğu
+import control_loop  # Sabit periyotlu kontrol döngüsü
+import history  # Sensör geçmişi
+import backtest  # Koşulların geçmiş üzerinde geri testi
+import outbox  # Hız sınırlı Telegram gönderim kuyruğu
+import latency  # Handler gecikme ölçümü
+import webhook  # Webhook modu için gömülü HTTP sunucusu
+import render_cache  # Sürümlü dashboard/klavye render önbelleği
 
 # .env dosyasından değişkenleri yükle
 load_dotenv()
@@ -30,8 +48,134 @@ CORRECT_PASSWORD = os.getenv("PASSWORD", "12345")
 VERIFIED_USERS_FILE = "verified_users.json"
 CONDITIONS_FILE = "conditions.json"
 
-# Aktif dashboard mesajlarını takip etmek için
+# Doğrulanmış kullanıcıların bellekteki tek kopyası
+VERIFIED_USERS = stores.VerifiedUserStore(VERIFIED_USERS_FILE)
+
+# Motor komutlarını kendi thread'inde uygulayan sürücü
+MOTOR = actuator.MotorActuator(dc_motor.basla, dc_motor.durdur, dc_motor.durum_kontrol)
+
+# Koşulların bellekteki tek kopyası
+CONDITION_STORE = stores.ConditionStore(CONDITIONS_FILE)
+
+# Sensör örnekleme ayarları (saniye)
+SENSOR_SAMPLE_INTERVAL = float(os.getenv("SENSOR_SAMPLE_INTERVAL", "5"))
+SENSOR_MAX_STALENESS = float(os.getenv("SENSOR_MAX_STALENESS", "15"))
+
+# Sensörlere tek başına sahip olan örnekleyici
+SENSOR_SAMPLER = sensor_sampler.SensorSampler(
+    ldr.get_lux_filtered,
+    dhteleven.read_sensor,
+    interval=SENSOR_SAMPLE_INTERVAL,
+    max_staleness=SENSOR_MAX_STALENESS
+)
+
+# Kontrol döngüsü ayarları (saniye)
+CONTROL_PERIOD = float(os.getenv("CONTROL_PERIOD", "5"))
+# Bir sensörün verisi bundan eskiyse o sensöre bağlı koşullar son sonuçlarını
+# korur; diğer koşullar değerlendirilmeye devam eder
+CONTROL_MAX_SENSOR_AGE = float(os.getenv("CONTROL_MAX_SENSOR_AGE", "60"))
+
+# Sensör geçmişi ayarları
+HISTORY_FILE = "history.bin"
+HISTORY_MAX_BYTES = int(os.getenv("HISTORY_MAX_BYTES", str(64 * 1024 * 1024)))
+HISTORY_FLUSH_EVERY = int(os.getenv("HISTORY_FLUSH_EVERY", "60"))  # kayıt
+HISTORY_NOISY_SPREAD = 50.0  # Bu sapmanın üstündeki ışık okumaları gürültülü sayılır
+
+# Kontrol döngüsünün her adımında bir kayıt tutan geçmiş
+HISTORY = history.History(HISTORY_FILE, flush_every=HISTORY_FLUSH_EVERY, max_bytes=HISTORY_MAX_BYTES)
+
+# /history komutu ayarları
+HISTORY_DEFAULT_WINDOW = "24h"
+HISTORY_MAX_POINTS = 24  # Mesajda gösterilecek en fazla özet satırı
+DURATION_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+# /backtest komutunun varsayılan aralığı
+BACKTEST_DEFAULT_WINDOW = "7d"
+
+# /backtest ile denenecek aday koşul setlerinde kullanılabilen adlar
+RULE_SPEC_SECTIONS = {"on": "on", "çalıştır": "on", "off": "off", "durdur": "off"}
+RULE_SPEC_SENSORS = {
+    "temperature": "temperature", "sıcaklık": "temperature", "sicaklik": "temperature",
+    "humidity": "humidity", "nem": "humidity",
+    "light": "light", "ışık": "light", "isik": "light"
+}
+RULE_SPEC_JOINS = {"and": "AND", "ve": "AND", "or": "OR", "veya": "OR"}
+RULE_SPEC_CONDITION = re.compile(r"\s*(\w+)\s*(>=|<=|>|<|=)\s*(-?\d+(?:[.,]\d+)?)\s*(?:(\w+)\s+)?")
+
+# Aktif dashboard mesajlarını takip etmek için; sadece dashboard ekranını
+# gösteren mesajlar burada tutulur (koşul yönetimi ekranına geçen mesaj çıkarılır)
 ACTIVE_DASHBOARDS = {}  # chat_id: message_id şeklinde
+# ACTIVE_DASHBOARDS/DASHBOARD_CONTENT değişiklikleri ve ilgili düzenlemelerin
+# kuyruğa alınması bu kilitle yapılır; böylece bir mesaja en son kuyruğa
+# alınan düzenleme her zaman mesajın son ekranına aittir
+DASHBOARD_LOCK = threading.Lock()
+
+# Handler'lar eş zamanlı (run_async) çalışsın mı ve en fazla kaç worker thread'i kullanılsın
+CONCURRENT_HANDLERS = os.getenv("CONCURRENT_HANDLERS", "1") == "1"
+HANDLER_WORKERS = int(os.getenv("HANDLER_WORKERS", "8"))
+
+# Handler sürelerinin istatistiği (p50/p99)
+HANDLER_LATENCY = latency.LatencyStats()
+
+# Engelleyen GPIO işleri (zorunlu sensör okuması) için tek thread'li executor;
+# handler'lar donanımı hiç beklemez
+GPIO_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gpio")
+sensor_refresh = None  # Bekleyen taze okuma işi
+
+# Webhook modu: WEBHOOK_URL verilirse güncellemeler yerel HTTP sunucusuna
+# POST edilir, verilmezse (ya da webhook kurulamazsa) polling kullanılır
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")  # Telegram'ın erişeceği https adresi (path hariç)
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "127.0.0.1")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8443"))
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/telegram")
+# Telegram her istekte bu anahtarı başlıkta gönderir; verilmezse her açılışta rastgele üretilir
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET") or secrets.token_urlsafe(32)
+
+# Bot API'ye giden düzenleme ve yanıtların hız sınırlı kuyruğu (bot main() içinde atanır)
+OUTBOX = outbox.Outbox()
+
+# Son gönderilen dashboard içeriği (tarih/saat hariç); değişmediyse düzenleme yapılmaz
+DASHBOARD_CONTENT = {}  # chat_id: içerik şeklinde
+
+# Render önbellekleri: koşul deposu sürümü ve sensör görüntüsü sürümü
+# değişmedikçe metinler ve klavyeler yeniden oluşturulmaz; sürüm değişince
+# sadece yeni ya da değişmiş koşulların satırları render edilir
+DASHBOARD_BODY_CACHE = render_cache.VersionedValue()  # (koşul sürümü, görüntü sürümü, güç)
+MANAGEMENT_PAGE_CACHE = render_cache.VersionedValue()  # (koşul sürümü, sayfa)
+ON_CONDITION_TEXTS = render_cache.FragmentCache(lambda condition: format_condition(condition), lambda condition: condition["id"])
+OFF_CONDITION_TEXTS = render_cache.FragmentCache(lambda condition: format_condition(condition), lambda condition: condition["id"])
+
+# Koşul yönetimi ekranı sayfalanır; sadece görünen sayfanın butonları oluşturulur
+MANAGEMENT_PAGE_SIZE = int(os.getenv("MANAGEMENT_PAGE_SIZE", "8"))
+MANAGEMENT_TEXT = "Koşul Yönetimi\n\nAşağıda mevcut koşulları görebilir, durumlarını değiştirebilir veya silebilirsiniz:"
+
+# Koşul yönetimi ekranının kısa callback verileri (Telegram sınırı 64 bayt):
+#   mp:<sayfa>                 sayfayı göster
+#   mt:<sayfa>:<kısa kimlik>   koşulun durumunu değiştir
+#   md:<sayfa>:<kısa kimlik>   koşulu sil
+# Eski biçim (toggle_on_condition:<id> vb.) önceden gönderilmiş mesajlar için desteklenir
+MANAGE_PAGE = "mp"
+MANAGE_TOGGLE = "mt"
+MANAGE_DELETE = "md"
+LEGACY_CONDITION_ACTIONS = {
+    "toggle_on_condition": MANAGE_TOGGLE,
+    "toggle_off_condition": MANAGE_TOGGLE,
+    "delete_on_condition": MANAGE_DELETE,
+    "delete_off_condition": MANAGE_DELETE
+}
+
+# Tüm dashboard'ları yenileyen tek global job
+DASHBOARD_TICK_JOB = "dashboard_tick"
+DASHBOARD_REFRESH_INTERVAL = 5  # saniye, en kısa yenileme aralığı
+DASHBOARD_MAX_INTERVAL = 60  # saniye, değerler sabitken ulaşılan en uzun aralık
+dashboard_interval = DASHBOARD_REFRESH_INTERVAL  # Şu anki yenileme aralığı
+
+# Sensör değeri bir koşulun eşiğine bu kadar yakınsa dashboard en sık aralıkla yenilenir
+NEAR_THRESHOLD_BANDS = {
+    "temperature": 1.0,
+    "humidity": 3.0,
+    "light": 50.0
+}
 
 # Kullanıcı durumları için sabitler
 SELECTING_SENSOR, SELECTING_OPERATOR, ENTERING_VALUE, SELECTING_LOGICAL = range(4)
@@ -71,112 +215,62 @@ UNITS = {
 
 # Doğrulanmış kullanıcılar listesini yükle
 def load_verified_users():
-    if os.path.exists(VERIFIED_USERS_FILE):
-        try:
-            with open(VERIFIED_USERS_FILE, 'r') as file:
-                return json.load(file)
-        except json.JSONDecodeError:
-            logger.error("Doğrulanmış kullanıcılar dosyası bozuk. Yeni bir liste oluşturuluyor.")
-    return []
+    return list(VERIFIED_USERS.get())
 
 # Doğrulanmış kullanıcılar listesini kaydet
 def save_verified_users(users):
-    with open(VERIFIED_USERS_FILE, 'w') as file:
-        json.dump(users, file)
+    VERIFIED_USERS.replace(users)
 
-# Kullanıcı doğrulanmış mı kontrol et
+# Kullanıcı doğrulanmış mı kontrol et (bellekteki kümeden, disk erişimi yok)
 def is_user_verified(user_id):
-    verified_users = load_verified_users()
-    return user_id in verified_users
+    return VERIFIED_USERS.contains(user_id)
 
 # Kullanıcıyı doğrulanmış olarak kaydet
 def verify_user(user_id, username):
-    verified_users = load_verified_users()
-    if user_id not in verified_users:
-        verified_users.append(user_id)
-        save_verified_users(verified_users)
+    if VERIFIED_USERS.add(user_id):
         logger.info(f"Yeni kullanıcı doğrulandı: {username} (ID: {user_id})")
 
-# Koşulları yükle
+# Koşulları yükle (bellekteki depodan, dosya her seferinde okunmaz)
 def load_conditions():
-    if os.path.exists(CONDITIONS_FILE):
-        try:
-            with open(CONDITIONS_FILE, 'r') as file:
-                conditions = json.load(file)
-                return conditions.get("on_conditions", []), conditions.get("off_conditions", [])
-        except json.JSONDecodeError:
-            logger.error("Koşullar dosyası bozuk. Yeni bir liste oluşturuluyor.")
-    return [], []
+    return CONDITION_STORE.get()
 
 # Koşulları kaydet
 def save_conditions(on_conditions, off_conditions):
-    with open(CONDITIONS_FILE, 'w') as file:
-        json.dump({
-            "on_conditions": on_conditions,
-            "off_conditions": off_conditions
-        }, file, indent=4)
+    CONDITION_STORE.replace(on_conditions, off_conditions)
 
 def evaluate_condition_chain(conditions, sensor_data):
     """Koşulları ve mantıksal bağlaçları değerlendir."""
-    if not conditions:
-        return False
-    
-    # İlk koşulu değerlendir
-    result = check_single_condition(conditions[0], sensor_data)
-    
-    # Diğer koşulları ve bağlaçları değerlendir
-    for i in range(1, len(conditions)):
-        current_condition = conditions[i]
-        logical = conditions[i-1].get("logical", "NONE")
-        
-        # Eğer bağlaç yoksa döngüyü sonlandır
-        if logical == "NONE":
-            break
-            
-        # Mevcut koşulu değerlendir
-        current_result = check_single_condition(current_condition, sensor_data)
-        
-        # Bağlaca göre sonucu güncelle
-        if logical == "AND":
-            result = result and current_result
-        elif logical == "OR":
-            result = result or current_result
-    
-    return result
+    return rules.evaluate_condition_chain(conditions, sensor_data)
 
 def check_single_condition(condition, sensor_data):
     """Tek bir koşulu değerlendir."""
-    # Koşul pasifse False döndür
-    if not condition.get('state', True):
-        return False
-        
-    sensor_type = condition['type']
-    operator = condition['operator']
-    value = condition['value']
-    sensor_value = sensor_data[sensor_type]
-    
-    # Koşulu değerlendir
-    if operator == ">":
-        return sensor_value > value
-    elif operator == "<":
-        return sensor_value < value
-    elif operator == "=":
-        return sensor_value == value
-    elif operator == ">=":
-        return sensor_value >= value
-    elif operator == "<=":
-        return sensor_value <= value
-    return False
+    return rules.check_single_condition(condition, sensor_data)
+
+def get_condition_plan(sensor_data):
+    """Sensör verisindeki koşullar için önbellekteki derlenmiş planı döndür."""
+    return rules.get_plan(
+        sensor_data.get("conditions_version"),
+        sensor_data["on_conditions"],
+        sensor_data["off_conditions"]
+    )
 
 def evaluate_conditions(sensor_data):
     """Koşulları değerlendir ve motor durumunu güncelle."""
     try:
+        # Artımlı planı al: sadece değeri değişen sensörlere bağlı koşullar
+        # yeniden kontrol edilir (koşullar değişmedikçe plan korunur)
+        plan = rules.get_incremental_plan(
+            sensor_data.get("conditions_version"),
+            sensor_data["on_conditions"],
+            sensor_data["off_conditions"]
+        )
+        should_stop, should_run = plan.update(sensor_data, sensor_data.get("stale", ()))
+        
         # Önce durdurma koşullarını kontrol et
-        should_stop = evaluate_condition_chain(sensor_data["off_conditions"], sensor_data)
         if should_stop:
             if sensor_data["power"]:
                 logger.info("Durdurma koşulu sağlandı, motor durduruluyor.")
-                if dc_motor.durdur():
+                if MOTOR.request(False):
                     sensor_data["power"] = False
                     return False
                 else:
@@ -185,11 +279,10 @@ def evaluate_conditions(sensor_data):
             return False
 
         # Sonra çalıştırma koşullarını kontrol et
-        should_run = evaluate_condition_chain(sensor_data["on_conditions"], sensor_data)
         if should_run:
             if not sensor_data["power"]:
                 logger.info("Çalıştırma koşulu sağlandı, motor çalıştırılıyor.")
-                if dc_motor.basla():
+                if MOTOR.request(True):
                     sensor_data["power"] = True
                     return True
                 else:
@@ -204,6 +297,10 @@ def evaluate_conditions(sensor_data):
         logger.error(f"Koşul değerlendirme hatası: {e}")
         return sensor_data["power"]  # Hata durumunda mevcut durumu koru
 
+def reply(update: Update, text, reply_markup=None, on_sent=None):
+    """Güncellemenin geldiği sohbete hız sınırlı gönderim kuyruğu üzerinden yanıt ver."""
+    OUTBOX.send(update.effective_chat.id, text, reply_markup, on_sent=on_sent)
+
 def start(update: Update, context: CallbackContext) -> None:
     """Bot başlatıldığında kullanıcıya karşılama mesajı gönder."""
     user = update.effective_user
@@ -211,20 +308,28 @@ def start(update: Update, context: CallbackContext) -> None:
     username = user.username or user.first_name
     
     if is_user_verified(user_id):
-        update.message.reply_text(
+        reply(
+            update,
             f'Tekrardan Hoşgeldin @{username}!\nDashboardı açmak için /dashboard yazınız.'
-        )        
+        )
     else:
-        update.message.reply_text(
+        reply(
+            update,
             f'Merhaba {username}! Lütfen devam etmek için şifreyi girin.'
         )
 
-def dashboard_message(temperature: float, humidity: float, light: float, power: bool, on_conditions: list, off_conditions: list) -> str:
+def dashboard_message(temperature: float, humidity: float, light: float, power: bool, on_conditions: list, off_conditions: list, conditions_version=None) -> str:
     """Dashboard mesajını oluştur."""
     message = f"📅 Tarih/Saat: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-    message += f"🌡️ Sıcaklık: {temperature}°C\n"
-    message += f"💧 Nem: {humidity}%\n"
-    message += f"💡 Işık: {light} lux\n\n"
+    message += dashboard_body(temperature, humidity, light, power, on_conditions, off_conditions, conditions_version)
+    return message
+
+def dashboard_body(temperature: float, humidity: float, light: float, power: bool, on_conditions: list, off_conditions: list, conditions_version=None) -> str:
+    """Dashboard mesajının tarih/saat dışındaki, değişiklik tespitinde kullanılan kısmı."""
+    # Değerler gösterim hassasiyetinde yazılır; daha küçük oynamalar mesajı değiştirmez
+    message = f"🌡️ Sıcaklık: {temperature:.1f}°C\n"
+    message += f"💧 Nem: {humidity:.1f}%\n"
+    message += f"💡 Işık: {light:.0f} lux\n\n"
     message += f"🔌 Güç: {'✅ Açık' if power else '❌ Kapalı'} \n\n"
 
     # Sensör verileri
@@ -234,35 +339,19 @@ def dashboard_message(temperature: float, humidity: float, light: float, power:
         "light": light
     }
 
+    # Koşulların sağlanıp sağlanmadığını derlenmiş planla tek seferde hesapla
+    plan = rules.get_plan(conditions_version, on_conditions, off_conditions)
+    _, on_flags = plan.on_chain.evaluate(sensor_data)
+    _, off_flags = plan.off_chain.evaluate(sensor_data)
+
+    # Koşul metinleri sürüm değişmedikçe önbellekten gelir
+    on_texts = ON_CONDITION_TEXTS.render_all(conditions_version, on_conditions)
+    off_texts = OFF_CONDITION_TEXTS.render_all(conditions_version, off_conditions)
+
     # Çalıştırma koşulları
     if on_conditions:
         message += f"🔄 Çalıştırma Koşulları: \n"
-        for condition in on_conditions:
-            # Koşulun aktif olup olmadığını kontrol et
-            if not condition.get("state", True):
-                active_emoji = "⚪"  # Koşul pasif ise gri daire göster
-            else:
-                # Koşulun sağlanıp sağlanmadığını kontrol et
-                sensor_type = condition["type"]
-                sensor_value = sensor_data[sensor_type]
-                condition_value = condition["value"]
-                operator = condition["operator"]
-                
-                is_satisfied = False
-                if operator == ">":
-                    is_satisfied = sensor_value > condition_value
-                elif operator == "<":
-                    is_satisfied = sensor_value < condition_value
-                elif operator == "=":
-                    is_satisfied = sensor_value == condition_value
-                elif operator == ">=":
-                    is_satisfied = sensor_value >= condition_value
-                elif operator == "<=":
-                    is_satisfied = sensor_value <= condition_value
-                
-                active_emoji = "✅" if is_satisfied else "❌"
-            
-            message += f"{active_emoji} {format_condition(condition)}\n"
+        message += format_condition_lines(on_texts, on_flags)
     else:
         message += "🔄 Çalıştırma Koşulu Bulunmuyor\n"
     
@@ -271,147 +360,249 @@ def dashboard_message(temperature: float, humidity: float, light: float, power:
     # Kapatma koşulları
     if off_conditions:
         message += f"⏹️ Durdurma Koşulları: \n"
-        for condition in off_conditions:
-            # Koşulun aktif olup olmadığını kontrol et
-            if not condition.get("state", True):
-                active_emoji = "⚪"  # Koşul pasif ise gri daire göster
-            else:
-                # Koşulun sağlanıp sağlanmadığını kontrol et
-                sensor_type = condition["type"]
-                sensor_value = sensor_data[sensor_type]
-                condition_value = condition["value"]
-                operator = condition["operator"]
-                
-                is_satisfied = False
-                if operator == ">":
-                    is_satisfied = sensor_value > condition_value
-                elif operator == "<":
-                    is_satisfied = sensor_value < condition_value
-                elif operator == "=":
-                    is_satisfied = sensor_value == condition_value
-                elif operator == ">=":
-                    is_satisfied = sensor_value >= condition_value
-                elif operator == "<=":
-                    is_satisfied = sensor_value <= condition_value
-                
-                active_emoji = "✅" if is_satisfied else "❌"
-            
-            message += f"{active_emoji} {format_condition(condition)}\n"
+        message += format_condition_lines(off_texts, off_flags)
     else:
         message += "⏹️ Durdurma Koşulu Bulunmuyor\n"
     
     return message
 
+# Pasif koşul gri daire, sağlanan koşul onay, sağlanmayan çarpı ile gösterilir
+CONDITION_FLAG_EMOJIS = {None: "⚪", True: "✅", False: "❌"}
+
+def format_condition_lines(texts, flags):
+    """format_condition ile render edilmiş koşul metinlerini durum emojileriyle satır satır birleştir."""
+    return "".join(f"{CONDITION_FLAG_EMOJIS[is_satisfied]} {text}\n" for text, is_satisfied in zip(texts, flags))
+
+def dashboard_text(sensor_data):
+    """Sensör verisi sözlüğünden dashboard mesajını oluştur."""
+    return f"📅 Tarih/Saat: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n" + dashboard_content(sensor_data)
+
+def dashboard_render_key(sensor_data):
+    """Dashboard içeriğinin önbellek anahtarı; sürümler bilinmiyorsa None."""
+    snapshot = sensor_data.get("snapshot")
+    conditions_version = sensor_data.get("conditions_version")
+    if snapshot is None or conditions_version is None:
+        return None
+    return conditions_version, snapshot.version, sensor_data["power"]
+
+def dashboard_content(sensor_data):
+    """Sensör verisi sözlüğünden dashboard içeriğini (tarih/saat hariç) oluştur.
+
+    Koşul deposu ve sensör görüntüsü değişmedikçe önbellekteki içerik döner.
+    """
+    return DASHBOARD_BODY_CACHE.get(dashboard_render_key(sensor_data), lambda: dashboard_body(
+        sensor_data["temperature"], 
+        sensor_data["humidity"], 
+        sensor_data["light"], 
+        sensor_data["power"], 
+        sensor_data["on_conditions"], 
+        sensor_data["off_conditions"],
+        sensor_data.get("conditions_version")
+    ))
+
+# Dashboard butonları değişmez; klavye bir kez oluşturulup her mesajda kullanılır
+DASHBOARD_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("Çalıştırma Koşulu Ekle", callback_data="add_on_condition"),
+        InlineKeyboardButton("Durdurma Koşulu Ekle", callback_data="add_off_condition")            
+    ],
+    [
+        InlineKeyboardButton("Koşulları Düzenle", callback_data="manage_conditions")
+    ],
+    [
+        InlineKeyboardButton("Güç Durumunu Değiştir ⚡", callback_data="toggle_power")
+    ],
+    [
+        InlineKeyboardButton("Yenile 🔄", callback_data="refresh")
+    ]
+])
+
 def get_dashboard_keyboard():
-    """Dashboard için butonları oluştur."""
-    keyboard = [
-        [
-            InlineKeyboardButton("Çalıştırma Koşulu Ekle", callback_data="add_on_condition"),
-            InlineKeyboardButton("Durdurma Koşulu Ekle", callback_data="add_off_condition")            
-        ],
-        [
-            InlineKeyboardButton("Koşulları Düzenle", callback_data="manage_conditions")
-        ],
-        [
-            InlineKeyboardButton("Güç Durumunu Değiştir ⚡", callback_data="toggle_power")
-        ],
-        [
-            InlineKeyboardButton("Yenile 🔄", callback_data="refresh")
-        ]
+    """Dashboard için butonları döndür."""
+    return DASHBOARD_KEYBOARD
+
+def management_page_count(on_count, off_count):
+    """Koşul yönetimi ekranının sayfa sayısı (koşul yoksa da bir sayfa)."""
+    return max(1, -(-(on_count + off_count) // MANAGEMENT_PAGE_SIZE))
+
+def condition_management_row(condition, condition_type, page):
+    """Koşul yönetimi ekranında bir koşulun satırını oluştur: durum değiştir ve sil butonları."""
+    handle = CONDITION_STORE.handle(condition["id"])
+    texts = ON_CONDITION_TEXTS if condition_type == "on" else OFF_CONDITION_TEXTS
+    # Koşulun aktif olup olmadığını gösteren emoji
+    state_emoji = "✅" if condition.get("state", True) else "❌"
+    return [
+        InlineKeyboardButton(
+            f"{state_emoji} {texts.get(condition)}",
+            callback_data=f"{MANAGE_TOGGLE}:{page}:{handle}"
+        ),
+        InlineKeyboardButton(
+            f"Sil 🗑️", 
+            callback_data=f"{MANAGE_DELETE}:{page}:{handle}"
+        )
     ]
-    return InlineKeyboardMarkup(keyboard)
 
-def get_condition_management_keyboard():
-    """Koşul yönetimi için butonları oluştur."""
-    on_conditions, off_conditions = load_conditions()
+def build_condition_management_page(page, on_conditions, off_conditions):
+    """Koşul yönetimi klavyesinin sadece istenen sayfasını oluştur.
+
+    Çalıştırma ve durdurma koşulları art arda tek bir liste gibi sayfalanır.
+    """
+    pages = management_page_count(len(on_conditions), len(off_conditions))
+    start = page * MANAGEMENT_PAGE_SIZE
+    end = start + MANAGEMENT_PAGE_SIZE
+    on_page = on_conditions[start:end]
+    off_page = off_conditions[max(0, start - len(on_conditions)):max(0, end - len(on_conditions))]
     keyboard = []
     
     # Çalıştırma koşulları
-    if on_conditions:
+    if on_page:
         keyboard.append([InlineKeyboardButton("--- Çalıştırma Koşulları ---", callback_data="do_nothing")])
-        for condition in on_conditions:
-            condition_id = condition["id"]
-            # Koşulun aktif olup olmadığını gösteren emoji ve durum butonu
-            state_emoji = "✅" if condition.get("state", True) else "❌"
-            state_text = "Pasif Yap" if condition.get("state", True) else "Aktif Yap"
-            
-            # Her koşul için iki buton: Durum değiştir ve Sil
-            keyboard.append([
-                InlineKeyboardButton(
-                    f"{state_emoji} {format_condition(condition)}",
-                    callback_data=f"toggle_on_condition:{condition_id}"
-                ),
-                InlineKeyboardButton(
-                    f"Sil 🗑️", 
-                    callback_data=f"delete_on_condition:{condition_id}"
-                )
-            ])
+        keyboard.extend(condition_management_row(condition, "on", page) for condition in on_page)
     
     # Kapatma koşulları
-    if off_conditions:
+    if off_page:
         keyboard.append([InlineKeyboardButton("--- Durdurma Koşulları ---", callback_data="do_nothing")])
-        for condition in off_conditions:
-            condition_id = condition["id"]
-            # Koşulun aktif olup olmadığını gösteren emoji ve durum butonu
-            state_emoji = "✅" if condition.get("state", True) else "❌"
-            state_text = "Pasif Yap" if condition.get("state", True) else "Aktif Yap"
-            
-            # Her koşul için iki buton: Durum değiştir ve Sil
-            keyboard.append([
-                InlineKeyboardButton(
-                    f"{state_emoji} {format_condition(condition)}",
-                    callback_data=f"toggle_off_condition:{condition_id}"
-                ),
-                InlineKeyboardButton(
-                    f"Sil 🗑️", 
-                    callback_data=f"delete_off_condition:{condition_id}"
-                )
-            ])
+        keyboard.extend(condition_management_row(condition, "off", page) for condition in off_page)
+    
+    # Sayfa butonları
+    if pages > 1:
+        navigation = []
+        if page > 0:
+            navigation.append(InlineKeyboardButton("◀️ Önceki", callback_data=f"{MANAGE_PAGE}:{page - 1}"))
+        navigation.append(InlineKeyboardButton(f"{page + 1}/{pages}", callback_data="do_nothing"))
+        if page < pages - 1:
+            navigation.append(InlineKeyboardButton("Sonraki ▶️", callback_data=f"{MANAGE_PAGE}:{page + 1}"))
+        keyboard.append(navigation)
     
     # Geri butonu
     keyboard.append([InlineKeyboardButton("◀️ Geri", callback_data="back_to_dashboard")])
     
     return InlineKeyboardMarkup(keyboard)
 
-def get_sensor_data():
-    """Sensör verilerini al."""
+def get_condition_management_keyboard(page=0):
+    """Koşul yönetimi için verilen sayfanın butonlarını oluştur (koşullar değişmedikçe önbellekten).
+
+    Sayfa aralık dışındaysa (ör. son sayfadaki koşul silindiyse) en yakın sayfa gösterilir.
+    """
+    version, on_conditions, off_conditions = CONDITION_STORE.get_versioned()
+    page = min(max(page, 0), management_page_count(len(on_conditions), len(off_conditions)) - 1)
+    return MANAGEMENT_PAGE_CACHE.get(
+        (version, page),
+        lambda: build_condition_management_page(page, on_conditions, off_conditions)
+    )
+
+def parse_page(text):
+    """Callback verisindeki sayfa numarasını çöz; bozuksa ilk sayfa (0)."""
+    return int(text) if text.isdecimal() else 0
+
+def condition_management_page_of(condition_id):
+    """Koşulun yönetim ekranında bulunduğu sayfa; bulunamazsa 0."""
+    location = CONDITION_STORE.locate(condition_id)
+    if location is None:
+        return 0
+    _, condition_type, index, _ = location
+    if condition_type == "off":
+        index += len(CONDITION_STORE.get()[0])
+    return index // MANAGEMENT_PAGE_SIZE
+
+def show_condition_management(query, page=0):
+    """Mesajı koşul yönetimi ekranının verilen sayfasıyla düzenle.
+
+    Mesaj otomatik yenilenen dashboard'lardan çıkarılır; böylece dashboard
+    tick'i sayfayı dashboard'a geri çevirmez.
+    """
+    chat_id = query.message.chat_id
+    message_id = query.message.message_id
+    reply_markup = get_condition_management_keyboard(page)
+    with DASHBOARD_LOCK:
+        if ACTIVE_DASHBOARDS.get(chat_id) == message_id:
+            del ACTIVE_DASHBOARDS[chat_id]
+            DASHBOARD_CONTENT.pop(chat_id, None)
+        OUTBOX.edit(chat_id, message_id, MANAGEMENT_TEXT, reply_markup)
+
+def show_dashboard(query, sensor_data):
+    """Mesajı dashboard ekranıyla düzenle ve otomatik yenileme için takibe al."""
+    chat_id = query.message.chat_id
+    message_id = query.message.message_id
+    content = dashboard_content(sensor_data)
+    text = f"📅 Tarih/Saat: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n" + content
+    with DASHBOARD_LOCK:
+        OUTBOX.edit(chat_id, message_id, text, get_dashboard_keyboard(), on_error=functools.partial(drop_dashboard, message_id=message_id))
+        ACTIVE_DASHBOARDS[chat_id] = message_id
+        DASHBOARD_CONTENT[chat_id] = content
+
+def handle_condition_action(update: Update, context: CallbackContext, action, condition_id, page):
+    """Koşul yönetimi ekranındaki durum değiştirme/silme işlemini uygula ve sayfayı yenile.
+
+    Kullanıcıya gösterilecek bildirim metnini döndürür.
+    """
+    query = update.callback_query
+    location = CONDITION_STORE.locate(condition_id) if condition_id else None
+    if location is None:
+        # Koşul bu arada silinmiş olabilir; ekranı güncel listeyle yenile
+        show_condition_management(query, page)
+        return "Koşul bulunamadı, liste güncellendi."
+    
+    _, condition_type, _, _ = location
+    if action == MANAGE_TOGGLE:
+        changed = toggle_condition(update, context, condition_id, condition_type)
+        answer = "Koşulun durumu değiştirildi!"
+    else:
+        changed = delete_condition(update, context, condition_id, condition_type)
+        answer = "Koşul silindi!"
+    
+    if not changed:
+        return None
+    
+    # Koşul yönetimi ekranını güncelle
+    show_condition_management(query, page)
+    return answer
+
+def request_sensor_refresh():
+    """Taze sensör okumasını GPIO executor'ına gönder (zaten bekleyen varsa tekrar gönderme)."""
+    global sensor_refresh
+    if sensor_refresh is None or sensor_refresh.done():
+        sensor_refresh = GPIO_EXECUTOR.submit(SENSOR_SAMPLER.sample)
+
+def get_sensor_data(max_staleness=None, block=True):
+    """Sensör verilerini örnekleyicinin son görüntüsünden al.
+
+    block=False ise görüntü eski olsa bile beklenmez; eldeki görüntü
+    kullanılır ve taze okuma arka planda istenir.
+    """
     try:
-        # LDR'den ışık değerini al
-        try:
-            light = ldr.get_lux()
-        except Exception as e:
-            logger.error(f"LDR okuma hatası: {e}")
-            light = 0.0
+        if block:
+            # Görüntü çok eskiyse örnekleyici taze okuma yapar, değilse bellekten döner
+            snapshot = SENSOR_SAMPLER.get_snapshot(max_staleness)
+        else:
+            snapshot = SENSOR_SAMPLER.get_snapshot(float("inf"))
+            limit = SENSOR_MAX_STALENESS if max_staleness is None else max_staleness
+            if SENSOR_SAMPLER.age(snapshot) > limit:
+                request_sensor_refresh()
         
-        # DHT11'den sıcaklık ve nem değerlerini al
-        try:
-            result = dhteleven.get_temperature_and_humidity()
-            if result is None:
-                temperature, humidity = 0.0, 0.0
-            else:
-                temperature, humidity = result
-                # -1 değerlerini 0'a çevir
-                if temperature < 0:
-                    temperature = 0.0
-                if humidity < 0:
-                    humidity = 0.0
-        except Exception as e:
-            logger.error(f"DHT11 okuma hatası: {e}")
-            temperature, humidity = 0.0, 0.0
+        temperature = snapshot.temperature
+        humidity = snapshot.humidity
+        # -1 değerlerini 0'a çevir
+        if temperature < 0:
+            temperature = 0.0
+        if humidity < 0:
+            humidity = 0.0
         
         sensor_data = {
             "temperature": temperature,
             "humidity": humidity,
-            "light": light
+            "light": snapshot.light,
+            "snapshot": snapshot
         }
         
         # Motor durumunu kontrol et
-        sensor_data["power"] = dc_motor.durum_kontrol()
+        sensor_data["power"] = MOTOR.state()
         
-        # Koşul listelerini ekle
-        on_conditions, off_conditions = load_conditions()
+        # Koşul listelerini ve sürümünü ekle
+        version, on_conditions, off_conditions = CONDITION_STORE.get_versioned()
         sensor_data["on_conditions"] = on_conditions
         sensor_data["off_conditions"] = off_conditions
+        sensor_data["conditions_version"] = version
         
         return sensor_data
     except Exception as e:
@@ -423,7 +614,8 @@ def get_sensor_data():
             "light": 0.0,
             "power": False,
             "on_conditions": [],
-            "off_conditions": []
+            "off_conditions": [],
+            "conditions_version": 0
         }
 
 def format_condition(condition):
@@ -474,14 +666,11 @@ def start_add_condition(update: Update, context: CallbackContext, condition_type
         update.callback_query.answer()
         
         # Mesajı gönder
-        context.bot.send_message(
-            chat_id=chat_id,
-            text="Hangi sensör için koşul eklemek istiyorsunuz?",
-            reply_markup=reply_markup
-        )
+        OUTBOX.send(chat_id, "Hangi sensör için koşul eklemek istiyorsunuz?", reply_markup)
     else:
         # Normal mesaj için
-        update.effective_message.reply_text(
+        reply(
+            update,
             "Hangi sensör için koşul eklemek istiyorsunuz?",
             reply_markup=reply_markup
         )
@@ -502,7 +691,7 @@ def handle_sensor_selection(update: Update, context: CallbackContext):
             break
     
     if not sensor_id:
-        update.message.reply_text("Geçersiz sensör türü. Lütfen tekrar deneyin.")
+        reply(update, "Geçersiz sensör türü. Lütfen tekrar deneyin.")
         return SELECTING_SENSOR
     
     # Seçilen sensörü geçici koşula kaydet
@@ -516,7 +705,8 @@ def handle_sensor_selection(update: Update, context: CallbackContext):
     reply_markup = ReplyKeyboardMarkup(keyboard, one_time_keyboard=True)
     
     # Operatör sorma mesajını gönder
-    update.message.reply_text(
+    reply(
+        update,
         f"Hangi operatörü kullanmak istiyorsunuz?",
         reply_markup=reply_markup
     )
@@ -529,7 +719,7 @@ def handle_operator_selection(update: Update, context: CallbackContext):
     text = update.message.text.split()[0]  # İlk kelimeyi al (operatörü)
     
     if text not in OPERATORS:
-        update.message.reply_text("Geçersiz operatör. Lütfen tekrar deneyin.")
+        reply(update, "Geçersiz operatör. Lütfen tekrar deneyin.")
         return SELECTING_OPERATOR
     
     # Seçilen operatörü geçici koşula kaydet
@@ -540,7 +730,8 @@ def handle_operator_selection(update: Update, context: CallbackContext):
     unit = UNITS[sensor_type]
     
     # Değer girmesi için kullanıcıya sor
-    update.message.reply_text(
+    reply(
+        update,
         f"Karşılaştırma değerini girin ({unit}):",
         reply_markup=ReplyKeyboardRemove()
     )
@@ -555,7 +746,7 @@ def handle_value_entry(update: Update, context: CallbackContext):
     try:
         value = float(text)
     except ValueError:
-        update.message.reply_text("Lütfen geçerli bir sayı girin.")
+        reply(update, "Lütfen geçerli bir sayı girin.")
         return ENTERING_VALUE
     
     # Girilen değeri geçici koşula kaydet
@@ -569,7 +760,8 @@ def handle_value_entry(update: Update, context: CallbackContext):
     reply_markup = ReplyKeyboardMarkup(keyboard, one_time_keyboard=True)
     
     # Mantıksal bağlaç sorma mesajını gönder
-    update.message.reply_text(
+    reply(
+        update,
         "Bu koşulu başka bir koşulla bağlamak istiyor musunuz?",
         reply_markup=reply_markup
     )
@@ -589,7 +781,7 @@ def handle_logical_selection(update: Update, context: CallbackContext):
             break
     
     if not logical_id:
-        update.message.reply_text("Geçersiz seçim. Lütfen tekrar deneyin.")
+        reply(update, "Geçersiz seçim. Lütfen tekrar deneyin.")
         return SELECTING_LOGICAL
     
     # Mantıksal bağlacı geçici koşula kaydet (NONE değilse)
@@ -600,18 +792,12 @@ def handle_logical_selection(update: Update, context: CallbackContext):
     condition_type = USER_STATES[chat_id]["condition_type"]
     new_condition = USER_STATES[chat_id]["temp_condition"]
     
-    on_conditions, off_conditions = load_conditions()
-    
-    if condition_type == "on":
-        on_conditions.append(new_condition)
-    else:  # "off"
-        off_conditions.append(new_condition)
-    
-    # Koşulları kaydet
-    save_conditions(on_conditions, off_conditions)
+    # Koşulu ekle ve kaydet
+    CONDITION_STORE.add_condition(condition_type, new_condition)
     
     # Klavyeyi kaldır
-    update.message.reply_text(
+    reply(
+        update,
         f"Koşul başarıyla eklendi: {format_condition(new_condition)}",
         reply_markup=ReplyKeyboardRemove()
     )
@@ -625,10 +811,7 @@ def handle_logical_selection(update: Update, context: CallbackContext):
         USER_STATES.pop(chat_id, None)
         
         # Dashboard'ı göster
-        context.dispatcher.bot.send_message(
-            chat_id=chat_id,
-            text="Koşul ekleme işlemi tamamlandı. Dashboard'ı görüntülemek için /dashboard komutunu kullanabilirsiniz."
-        )
+        OUTBOX.send(chat_id, "Koşul ekleme işlemi tamamlandı. Dashboard'ı görüntülemek için /dashboard komutunu kullanabilirsiniz.")
         return ConversationHandler.END
 
 def cancel_condition(update: Update, context: CallbackContext):
@@ -639,7 +822,8 @@ def cancel_condition(update: Update, context: CallbackContext):
     USER_STATES.pop(chat_id, None)
     
     # Klavyeyi kaldır
-    update.message.reply_text(
+    reply(
+        update,
         "Koşul ekleme işlemi iptal edildi.",
         reply_markup=ReplyKeyboardRemove()
     )
@@ -648,37 +832,11 @@ def cancel_condition(update: Update, context: CallbackContext):
 
 def delete_condition(update: Update, context: CallbackContext, condition_id, condition_type):
     """Belirtilen koşulu sil."""
-    on_conditions, off_conditions = load_conditions()
-    
-    if condition_type == "on":
-        on_conditions = [c for c in on_conditions if c["id"] != condition_id]
-    else:  # "off"
-        off_conditions = [c for c in off_conditions if c["id"] != condition_id]
-    
-    # Koşulları kaydet
-    save_conditions(on_conditions, off_conditions)
-    
-    return True
+    return CONDITION_STORE.delete_condition(condition_type, condition_id)
 
 def toggle_condition(update: Update, context: CallbackContext, condition_id, condition_type):
     """Belirtilen koşulun durumunu değiştir (aktif/pasif)."""
-    on_conditions, off_conditions = load_conditions()
-    
-    if condition_type == "on":
-        for condition in on_conditions:
-            if condition["id"] == condition_id:
-                condition["state"] = not condition.get("state", True)
-                break
-    else:  # "off"
-        for condition in off_conditions:
-            if condition["id"] == condition_id:
-                condition["state"] = not condition.get("state", True)
-                break
-    
-    # Koşulları kaydet
-    save_conditions(on_conditions, off_conditions)
-    
-    return True
+    return CONDITION_STORE.toggle_condition(condition_type, condition_id)
 
 def handle_message(update: Update, context: CallbackContext) -> None:
     """Gelen mesajları işle ve şifre kontrolü yap."""
@@ -695,191 +853,128 @@ def handle_message(update: Update, context: CallbackContext) -> None:
     
     # Kullanıcı zaten doğrulanmışsa, mesajı normal işle
     if is_user_verified(user_id):
-        update.message.reply_text(f"Mesajınız alındı: {text}")
+        reply(update, f"Mesajınız alındı: {text}")
         return
     
     # Kullanıcı doğrulanmamışsa, şifre kontrolü yap
     if text == CORRECT_PASSWORD:
         verify_user(user_id, username)
-        update.message.reply_text(
+        reply(
+            update,
             f"Şifre doğru! Hoş geldiniz @{username}.\n Kontrol merkezini açmak için /dashboard yazınız."
         )
     else:
-        update.message.reply_text(
+        reply(
+            update,
             "Yanlış şifre. Lütfen tekrar deneyin."
         )
 
 def handle_callback_query(update: Update, context: CallbackContext):
-    """Callback query'leri işle."""
+    """Callback query'leri işle.
+
+    Telegram her callback query için tek bir yanıt kabul eder; dallar
+    gösterilecek bildirim metnini döndürür ve sorgu burada bir kez yanıtlanır.
+    """
+    query = update.callback_query
+    answer = None
+    try:
+        answer = dispatch_callback_query(update, context)
+    finally:
+        try:
+            query.answer(answer)
+        except TelegramError as e:
+            logger.warning(f"Callback yanıtlanamadı: {e}")
+
+def dispatch_callback_query(update: Update, context: CallbackContext):
+    """Callback query'yi ilgili dala yönlendir; bildirim metnini (ya da None) döndür."""
     query = update.callback_query
-    query.answer()
     
     if query.data == "dashboard":
         # Dashboard'u göster
-        sensor_data = get_sensor_data()
-        query.message.edit_text(
-            text=dashboard_message(
-                sensor_data["temperature"], 
-                sensor_data["humidity"], 
-                sensor_data["light"], 
-                sensor_data["power"], 
-                sensor_data["on_conditions"], 
-                sensor_data["off_conditions"]
-            ),
-            reply_markup=get_dashboard_keyboard()
-        )
+        show_dashboard(query, get_sensor_data(block=False))
         return
     
     if query.data == "manage_conditions":
-        # Koşul yönetimi ekranını göster
-        query.message.edit_text(
-            text="Koşul Yönetimi\n\nAşağıda mevcut koşulları görebilir, durumlarını değiştirebilir veya silebilirsiniz:",
-            reply_markup=get_condition_management_keyboard()
-        )
-        return
-    
-    if query.data == "back_to_dashboard":
-        # Dashboard'a geri dön
-        sensor_data = get_sensor_data()
-        query.message.edit_text(
-            text=dashboard_message(
-                sensor_data["temperature"], 
-                sensor_data["humidity"], 
-                sensor_data["light"], 
-                sensor_data["power"], 
-                sensor_data["on_conditions"], 
-                sensor_data["off_conditions"]
-            ),
-            reply_markup=get_dashboard_keyboard()
-        )
+        # Koşul yönetimi ekranını ilk sayfasıyla göster
+        show_condition_management(query, 0)
         return
     
-    if query.data.startswith("toggle_on_condition:"):
-        # Çalıştırma koşulu durumunu değiştir
-        condition_id = query.data.split(":")[1]
-        if toggle_condition(update, context, condition_id, "on"):
-            query.answer("Koşulun durumu değiştirildi!")
-            # Koşul yönetimi ekranını güncelle
-            query.message.edit_text(
-                text="Koşul Yönetimi\n\nAşağıda mevcut koşulları görebilir, durumlarını değiştirebilir veya silebilirsiniz:",
-                reply_markup=get_condition_management_keyboard()
-            )
+    if query.data.startswith(f"{MANAGE_PAGE}:"):
+        # Koşul yönetimi ekranında sayfa değiştir
+        show_condition_management(query, parse_page(query.data.split(":", 1)[1]))
         return
     
-    if query.data.startswith("toggle_off_condition:"):
-        # Durdurma koşulu durumunu değiştir
-        condition_id = query.data.split(":")[1]
-        if toggle_condition(update, context, condition_id, "off"):
-            query.answer("Koşulun durumu değiştirildi!")
-            # Koşul yönetimi ekranını güncelle
-            query.message.edit_text(
-                text="Koşul Yönetimi\n\nAşağıda mevcut koşulları görebilir, durumlarını değiştirebilir veya silebilirsiniz:",
-                reply_markup=get_condition_management_keyboard()
-            )
+    if query.data == "back_to_dashboard":
+        # Dashboard'a geri dön
+        show_dashboard(query, get_sensor_data(block=False))
         return
     
-    if query.data.startswith("delete_on_condition:"):
-        # Çalıştırma koşulunu sil
-        condition_id = query.data.split(":")[1]
-        if delete_condition(update, context, condition_id, "on"):
-            query.answer("Koşul silindi!")
-            # Koşul yönetimi ekranını güncelle
-            query.message.edit_text(
-                text="Koşul Yönetimi\n\nAşağıda mevcut koşulları görebilir, durumlarını değiştirebilir veya silebilirsiniz:",
-                reply_markup=get_condition_management_keyboard()
-            )
-        return
+    if query.data.startswith((f"{MANAGE_TOGGLE}:", f"{MANAGE_DELETE}:")):
+        # Koşulun durumunu değiştir ya da sil: mt/md:<sayfa>:<kısa kimlik>
+        action, page, handle = (query.data.split(":", 2) + ["", ""])[:3]
+        return handle_condition_action(update, context, action, CONDITION_STORE.resolve(handle), parse_page(page))
     
-    if query.data.startswith("delete_off_condition:"):
-        # Durdurma koşulunu sil
-        condition_id = query.data.split(":")[1]
-        if delete_condition(update, context, condition_id, "off"):
-            query.answer("Koşul silindi!")
-            # Koşul yönetimi ekranını güncelle
-            query.message.edit_text(
-                text="Koşul Yönetimi\n\nAşağıda mevcut koşulları görebilir, durumlarını değiştirebilir veya silebilirsiniz:",
-                reply_markup=get_condition_management_keyboard()
-            )
-        return
+    action = query.data.split(":", 1)[0]
+    if action in LEGACY_CONDITION_ACTIONS:
+        # Eski biçimli butonlar: koşulun bulunduğu sayfa gösterilir
+        condition_id = query.data.split(":", 1)[1]
+        return handle_condition_action(update, context, LEGACY_CONDITION_ACTIONS[action], condition_id, condition_management_page_of(condition_id))
     
     if query.data == "toggle_power":
         # Sensör verilerini al
-        sensor_data = get_sensor_data()
+        sensor_data = get_sensor_data(block=False)
         
         try:
             # Güç durumunu tersine çevir ve motoru çalıştır/durdur
             if sensor_data["power"]:
-                if dc_motor.durdur():  # Başarılı olduğunda True döner
-                    sensor_data["power"] = False
-                    query.answer("Motor manuel olarak durduruldu.")
-                else:
-                    query.answer("Motor durdurulurken bir hata oluştu!")
-                    return
+                if not MOTOR.request(False):  # Worker çalışmıyorsa False döner
+                    return "Motor durdurulurken bir hata oluştu!"
+                sensor_data["power"] = False
+                answer = "Motor manuel olarak durduruldu."
             else:
-                if dc_motor.basla():  # Başarılı olduğunda True döner
-                    sensor_data["power"] = True
-                    query.answer("Motor manuel olarak çalıştırıldı.")
-                else:
-                    query.answer("Motor çalıştırılırken bir hata oluştu!")
-                    return
+                if not MOTOR.request(True):  # Worker çalışmıyorsa False döner
+                    return "Motor çalıştırılırken bir hata oluştu!"
+                sensor_data["power"] = True
+                answer = "Motor manuel olarak çalıştırıldı."
             
             # Mesajı güncelle
-            query.message.edit_text(
-                text=dashboard_message(
-                    sensor_data["temperature"], 
-                    sensor_data["humidity"], 
-                    sensor_data["light"], 
-                    sensor_data["power"], 
-                    sensor_data["on_conditions"], 
-                    sensor_data["off_conditions"]
-                ),
-                reply_markup=get_dashboard_keyboard()
-            )
+            show_dashboard(query, sensor_data)
+            return answer
         except Exception as e:
             logger.error(f"Güç durumu değiştirme hatası: {e}")
-            query.answer("Bir hata oluştu! Lütfen tekrar deneyin.")
-            return
+            return "Bir hata oluştu! Lütfen tekrar deneyin."
     
     if query.data == "refresh":
         # Dashboard'u yenile
-        sensor_data = get_sensor_data()
-        query.message.edit_text(
-            text=dashboard_message(
-                sensor_data["temperature"], 
-                sensor_data["humidity"], 
-                sensor_data["light"], 
-                sensor_data["power"], 
-                sensor_data["on_conditions"], 
-                sensor_data["off_conditions"]
-            ),
-            reply_markup=get_dashboard_keyboard()
-        )
-        query.answer("Dashboard yenilendi!")
-        return
+        show_dashboard(query, get_sensor_data(block=False))
+        return "Dashboard yenilendi!"
+    
+    return None
 
-def update_motor_status():
+def update_motor_status(sensor_data=None):
     """Sensör verilerine göre motor durumunu güncelle."""
     try:
-        # Sensör verilerini al
-        sensor_data = get_sensor_data()
+        # Sensör verileri verilmemişse al
+        if sensor_data is None:
+            sensor_data = get_sensor_data()
         
         # Koşulları değerlendirerek motor durumunu belirle
         should_run = evaluate_conditions(sensor_data)
         
         # Mevcut motor durumunu kontrol et
-        current_status = dc_motor.durum_kontrol()
+        current_status = MOTOR.state()
         
         # Motor durumunu güncelle
         if should_run and not current_status:
             # Motor çalışmalı ama çalışmıyor
-            if dc_motor.basla():
+            if MOTOR.request(True):
                 logger.info("Motor koşullar sağlandığı için çalıştırıldı")
                 sensor_data["power"] = True  # Güç durumunu hemen güncelle
             else:
                 logger.error("Motor çalıştırılamadı")
         elif not should_run and current_status:
             # Motor çalışmamalı ama çalışıyor
-            if dc_motor.durdur():
+            if MOTOR.request(False):
                 logger.info("Motor koşullar sağlanmadığı için durduruldu")
                 sensor_data["power"] = False  # Güç durumunu hemen güncelle
             else:
@@ -894,88 +989,403 @@ def update_motor_status():
         logger.error(f"Motor durumu güncelleme hatası: {e}")
         return False
 
-def auto_refresh_dashboard(context: CallbackContext) -> None:
-    """Dashboard'u otomatik olarak yenile."""
-    # Job context'inden chat_id'yi al
-    chat_id = context.job.context
-    
-    # Eğer bu chat_id için aktif bir dashboard yoksa işlemi iptal et
-    if chat_id not in ACTIVE_DASHBOARDS:
-        return
-    
-    # Mesaj ID'sini al
-    message_id = ACTIVE_DASHBOARDS[chat_id]
-    
-    # Motor durumunu güncelle
-    update_motor_status()
-    
-    # Sensör verilerini al
-    sensor_data = get_sensor_data()
+def control_step():
+    """Kontrol döngüsünün bir adımı: kuralları periyot başına bir kez değerlendir."""
+    global control_stale
+    # Kontrol döngüsü donanım okumasını beklemez; örnekleyicinin son görüntüsünü kullanır
+    sensor_data = get_sensor_data(max_staleness=float("inf"))
+    
+    # Verisi eskimiş sensörlere bağlı koşullar son sonuçlarını korur; hiçbir
+    # koşul sağlanmazsa motor mevcut durumunda kalır
+    snapshot = sensor_data.get("snapshot")
+    if snapshot is not None:
+        stale = SENSOR_SAMPLER.stale_fields(CONTROL_MAX_SENSOR_AGE, snapshot)
+    else:
+        stale = frozenset(sensor_sampler.FIELD_TIMES)
+    if stale != control_stale:
+        if stale:
+            logger.warning(f"Sensör verisi eski ya da yok: {', '.join(sorted(stale))}; bu sensörlere bağlı koşullar son sonuçlarını koruyor.")
+        else:
+            logger.info("Tüm sensör verileri güncel.")
+        control_stale = stale
+    sensor_data["stale"] = stale
     
     try:
-        # Mesajı güncelle
-        context.bot.edit_message_text(
-            chat_id=chat_id,
-            message_id=message_id,
-            text=dashboard_message(
-                sensor_data["temperature"], 
-                sensor_data["humidity"], 
-                sensor_data["light"], 
-                sensor_data["power"], 
-                sensor_data["on_conditions"], 
-                sensor_data["off_conditions"]
-            ),
-            reply_markup=get_dashboard_keyboard()
-        )
-        logger.info(f"Chat ID {chat_id} için dashboard otomatik olarak yenilendi.")
+        update_motor_status(sensor_data)
+    finally:
+        # Sensör verisi eksik ya da eski olsa da her adım geçmişe bayraklarıyla
+        # eklenir; kesintiler sessiz boşluk değil işaretli kayıt olarak görünür
+        record_sample(sensor_data)
+
+def record_sample(sensor_data):
+    """Okumayı, motor durumunu ve okuma kalitesi bayraklarını geçmişe ekle."""
+    snapshot = sensor_data.get("snapshot")
+    if snapshot is not None:
+        flags = history.snapshot_flags(snapshot, SENSOR_MAX_STALENESS, HISTORY_NOISY_SPREAD, time.monotonic())
+    else:
+        # Sensör verisi alınamadı; değerler varsayılan
+        flags = history.FLAG_NO_CLIMATE | history.FLAG_LIGHT_STALE
+    HISTORY.append(
+        time.time(),
+        sensor_data["temperature"],
+        sensor_data["humidity"],
+        sensor_data["light"],
+        sensor_data["power"],
+        flags
+    )
+
+# Kontrol döngüsünün son adımındaki eski sensörler (değiştiğinde loglanır)
+control_stale = frozenset()
+
+# Dashboard'lardan bağımsız, sabit periyotlu kontrol döngüsü
+CONTROL_LOOP = control_loop.ControlLoop(control_step, period=CONTROL_PERIOD)
+
+def next_dashboard_interval(sensor_data, changed):
+    """Bir sonraki dashboard yenilemesine kadar beklenecek süreyi hesapla.
+
+    Bir koşulun eşiği yakınsa ya da içerik değiştiyse en kısa aralığa dönülür;
+    içerik değişmedikçe aralık DASHBOARD_MAX_INTERVAL'e kadar ikiye katlanır.
+    """
+    if changed or get_condition_plan(sensor_data).near_threshold(sensor_data, NEAR_THRESHOLD_BANDS):
+        return DASHBOARD_REFRESH_INTERVAL
+    return min(dashboard_interval * 2, DASHBOARD_MAX_INTERVAL)
+
+def drop_dashboard(chat_id, error=None, message_id=None):
+    """Dashboard'u takipten çıkar (mesaj silinmiş, bot engellenmiş vb.).
+
+    message_id verilirse sadece takip edilen mesaj o mesajsa çıkarılır.
+    """
+    with DASHBOARD_LOCK:
+        if message_id is not None and ACTIVE_DASHBOARDS.get(chat_id) != message_id:
+            return
+        ACTIVE_DASHBOARDS.pop(chat_id, None)
+        DASHBOARD_CONTENT.pop(chat_id, None)
+
+def refresh_dashboards():
+    """Tüm açık dashboard'ları tek örnek ve tek render ile yenile.
+
+    İçeriği değişmeyen dashboard'lar düzenlenmez; düzenlemeler OUTBOX ile hız
+    sınırına uyularak gönderilir. Sonraki yenileme aralığını döndürür.
+    """
+    # Açık dashboard yoksa hiçbir iş yapma
+    if not ACTIVE_DASHBOARDS:
+        return DASHBOARD_REFRESH_INTERVAL
+    
+    # Sensör verilerini bir kez al (kurallar kontrol döngüsünde değerlendirilir)
+    sensor_data = get_sensor_data(block=False)
+    
+    # İçeriği bir kez oluştur; tarih/saat satırı sadece gönderilecekse eklenir
+    content = dashboard_content(sensor_data)
+    text = None
+    reply_markup = None
+    
+    # Aynı mesajı içeriği değişmiş dashboard'lara gönder; aynı mesajın henüz
+    # gönderilmemiş eski düzenlemesi kuyrukta yenisiyle değiştirilir
+    edited = 0
+    for chat_id, message_id in list(ACTIVE_DASHBOARDS.items()):
+        with DASHBOARD_LOCK:
+            # Mesaj bu arada başka bir ekrana geçmiş olabilir (ör. koşul
+            # yönetimi); o mesaja dashboard düzenlemesi gönderilmez
+            if ACTIVE_DASHBOARDS.get(chat_id) != message_id or DASHBOARD_CONTENT.get(chat_id) == content:
+                continue
+            if text is None:
+                text = f"📅 Tarih/Saat: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n" + content
+                reply_markup = get_dashboard_keyboard()
+            # Hız sınırı (429) hataları kuyrukta beklenip tekrar denenir; sadece
+            # kalıcı hatalarda dashboard takipten çıkarılır
+            OUTBOX.edit(chat_id, message_id, text, reply_markup, on_error=functools.partial(drop_dashboard, message_id=message_id))
+            DASHBOARD_CONTENT[chat_id] = content
+        edited += 1
+    
+    interval = next_dashboard_interval(sensor_data, edited > 0)
+    logger.info(f"{edited}/{len(ACTIVE_DASHBOARDS)} dashboard yenilemesi kuyruğa alındı, sonraki yenileme {interval} saniye sonra.")
+    return interval
+
+def dashboard_tick(context: CallbackContext) -> None:
+    """Dashboard'ları yenile ve bir sonraki yenilemeyi uyarlanmış aralıkla planla."""
+    global dashboard_interval
+    try:
+        dashboard_interval = refresh_dashboards()
     except Exception as e:
-        # Hata durumunda job'ı kaldır ve hata mesajını logla
         logger.error(f"Dashboard yenileme hatası: {e}")
-        ACTIVE_DASHBOARDS.pop(chat_id, None)
-        jobs = context.job_queue.get_jobs_by_name(f"refresh_{chat_id}")
-        if jobs:
-            for job in jobs:
-                job.schedule_removal()
+        dashboard_interval = DASHBOARD_REFRESH_INTERVAL
+    context.job_queue.run_once(dashboard_tick, dashboard_interval, name=DASHBOARD_TICK_JOB)
+
+def track_dashboard(chat_id, content, message):
+    """Gönderilen dashboard mesajını otomatik yenileme için takibe al."""
+    with DASHBOARD_LOCK:
+        ACTIVE_DASHBOARDS[chat_id] = message.message_id
+        DASHBOARD_CONTENT[chat_id] = content
 
 def dashboard(update: Update, context: CallbackContext) -> None:
     """Dashboard mesajı ve butonlarını göster."""
     # Sensör verilerini al
-    sensor_data = get_sensor_data()
-    
-    # Mesajı gönder
-    message = update.message.reply_text(
-        dashboard_message(
-            sensor_data["temperature"], 
-            sensor_data["humidity"], 
-            sensor_data["light"], 
-            sensor_data["power"], 
-            sensor_data["on_conditions"], 
-            sensor_data["off_conditions"]
-        ), 
-        reply_markup=get_dashboard_keyboard()
-    )
+    sensor_data = get_sensor_data(block=False)
     
-    # Aktif dashboard'ları takip et
+    # Mesajı gönder; gönderilince otomatik yenileme için takibe alınır
     chat_id = update.effective_chat.id
-    ACTIVE_DASHBOARDS[chat_id] = message.message_id
-    
-    # Otomatik yenileme için job ekle
-    # Eğer daha önce job eklenmişse kaldır
-    existing_jobs = context.job_queue.get_jobs_by_name(f"refresh_{chat_id}")
-    if existing_jobs:
-        for job in existing_jobs:
-            job.schedule_removal()
-    
-    # 5 saniyede bir yenileme job'ını ekle (10 saniyeden 5 saniyeye düşürüldü)
-    context.job_queue.run_repeating(
-        auto_refresh_dashboard, 
-        interval=5,  # 10 saniyeden 5 saniyeye düşürüldü
-        first=5,     # İlk yenileme de 5 saniyede yapılsın
-        context=chat_id,
-        name=f"refresh_{chat_id}"
+    reply(
+        update,
+        dashboard_text(sensor_data),
+        reply_markup=get_dashboard_keyboard(),
+        on_sent=functools.partial(track_dashboard, chat_id, dashboard_content(sensor_data))
+    )
+    
+    # Otomatik yenileme main() içinde başlatılan global dashboard_tick job'ı ile yapılır
+    
+    reply(
+        update,
+        f"Dashboard değerler değiştikçe otomatik olarak yenilenecektir "
+        f"(en sık {DASHBOARD_REFRESH_INTERVAL}, en seyrek {DASHBOARD_MAX_INTERVAL} saniyede bir)."
     )
+
+def parse_duration(text):
+    """"30m", "6h", "7d" gibi süreleri saniyeye çevir; geçersizse None döndür."""
+    text = text.strip().lower()
+    unit = DURATION_UNITS.get(text[-1:])
+    if unit is None:
+        return None
+    try:
+        amount = float(text[:-1])
+    except ValueError:
+        return None
+    return amount * unit if amount > 0 else None
+
+def format_stat(stat, unit):
+    """Özet istatistiğini "min / ort / maks" olarak formatla."""
+    if stat is None:
+        return "veri yok"
+    return f"min {stat.min:.1f}{unit} / ort {stat.mean:.1f}{unit} / maks {stat.max:.1f}{unit}"
+
+def history_message(window_text, resolution, buckets, summary):
+    """Geçmiş özet mesajını oluştur.
+
+    summary tam aralığın özetidir (History.summary); buckets sadece
+    listelenen seyrekleştirilmiş seri için kullanılır.
+    """
+    if not summary["samples"]:
+        return f"📈 Son {window_text} için kayıtlı veri bulunmuyor."
+
+    label = {60: "dakikalık", 3600: "saatlik", 86400: "günlük"}.get(resolution, f"{' '.join(part for part in format_duration(resolution).split() if not part.startswith('0'))} aralıklı")
+    message = f"📈 Son {window_text} ({label} özet, {len(buckets)} nokta)\n\n"
+    message += f"🌡️ Sıcaklık: {format_stat(summary['temperature'], UNITS['temperature'])}\n"
+    message += f"💧 Nem: {format_stat(summary['humidity'], UNITS['humidity'])}\n"
+    message += f"💡 Işık: {format_stat(summary['light'], ' lux')}\n"
+    message += f"🔌 Motor çalışma oranı: %{summary['power'] * 100:.0f}\n\n"
+
+    # Kovaların ortalama değerleri, en fazla HISTORY_MAX_POINTS satır
+    time_format = "%d.%m %H:%M" if resolution < 86400 else "%d.%m.%Y"
+    for bucket in buckets[-HISTORY_MAX_POINTS:]:
+        line = datetime.fromtimestamp(bucket.start).strftime(time_format)
+        if bucket.temperature is not None:
+            line += f"  {bucket.temperature.mean:.1f}°C  {bucket.humidity.mean:.0f}%"
+        if bucket.light is not None:
+            line += f"  {bucket.light.mean:.0f} lux"
+        line += f"  {'🟢' if bucket.power >= 0.5 else '⚫'}"
+        message += line + "\n"
+    return message
+
+def history_command(update: Update, context: CallbackContext) -> None:
+    """Sensör geçmişinin özetini göster: /history [süre], ör. /history 7d"""
+    if not is_user_verified(update.effective_user.id):
+        reply(update, "Lütfen önce şifreyi girerek doğrulama yapın.")
+        return
+
+    window_text = context.args[0] if context.args else HISTORY_DEFAULT_WINDOW
+    window = parse_duration(window_text)
+    if window is None:
+        reply(update, "Geçersiz süre. Örnek kullanım: /history 30m, /history 6h, /history 7d")
+        return
+
+    started = time.perf_counter()
+    end = time.time()
+    resolution, buckets = HISTORY.query(end - window, end, HISTORY_MAX_POINTS)
+    summary = HISTORY.summary(end - window, end)
+    message = history_message(window_text, resolution, buckets, summary)
+    logger.info(f"/history {window_text}: {len(buckets)} kova, {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    reply(update, message)
+
+def format_duration(seconds):
+    """Süreyi "3g 4s 12dk" biçiminde formatla."""
+    minutes = int(seconds // 60)
+    days, minutes = divmod(minutes, 1440)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f"{days}g {hours}s {minutes}dk"
+    if hours:
+        return f"{hours}s {minutes}dk"
+    return f"{minutes}dk"
+
+def parse_rule_spec(text):
+    """Aday koşul setini çözümle; {"on": [...], "off": [...]} döndür.
+
+    Biçim: "on: sıcaklık > 25 ve nem < 60; off: ışık < 100". Bölümler ";"
+    ile ayrılır; verilmeyen bölüm sözlükte yer almaz. Geçersizse ValueError.
+    """
+    spec = {}
+    for section in text.split(";"):
+        if not section.strip():
+            continue
+        name, separator, body = section.partition(":")
+        condition_type = RULE_SPEC_SECTIONS.get(name.strip().lower())
+        if not separator or condition_type is None:
+            raise ValueError(f"Bölüm \"on:\" ya da \"off:\" ile başlamalı: {section.strip()}")
+
+        conditions = []
+        position = 0
+        body = body.strip()
+        while position < len(body):
+            match = RULE_SPEC_CONDITION.match(body, position)
+            if match is None:
+                raise ValueError(f"Koşul anlaşılamadı: {body[position:]}")
+            sensor, operator, value, join = match.groups()
+            # Türkçe büyük I/İ harfleri lower() ile doğru küçülmez
+            sensor_type = RULE_SPEC_SENSORS.get(sensor.replace("I", "ı").replace("İ", "i").lower())
+            if sensor_type is None:
+                raise ValueError(f"Bilinmeyen sensör: {sensor}")
+            condition = {
+                "id": str(uuid.uuid4()),
+                "type": sensor_type,
+                "operator": operator,
+                "value": float(value.replace(",", ".")),
+                "state": True
+            }
+            if join is not None:
+                if join.lower() not in RULE_SPEC_JOINS:
+                    raise ValueError(f"Bilinmeyen bağlaç: {join}")
+                condition["logical"] = RULE_SPEC_JOINS[join.lower()]
+            conditions.append(condition)
+            position = match.end()
+
+        if not conditions:
+            raise ValueError(f"\"{name.strip()}:\" bölümünde koşul yok.")
+        if "logical" in conditions[-1]:
+            raise ValueError("Son koşuldan sonra bağlaç olmamalı.")
+        spec[condition_type] = conditions
+    return spec
+
+def backtest_summary(result):
+    """Geri test sonucunu mesaj satırları olarak formatla."""
+    message = f"🔁 Durum değişimi: {result.toggles} (▶️ {result.starts} çalıştırma, ⏹️ {result.stops} durdurma)\n"
+    message += f"📊 Çalışma oranı: %{result.duty_cycle * 100:.1f}\n"
+    message += f"✅ Açık: {format_duration(result.time_on)}\n"
+    message += f"❌ Kapalı: {format_duration(result.time_off)}\n"
+    return message
+
+def backtest_command(update: Update, context: CallbackContext) -> None:
+    """Koşulları kayıtlı geçmiş üzerinde yeniden oynat: /backtest [süre] [aday koşullar]
+
+    Aday koşullar verilirse (ör. /backtest 7d on: sıcaklık > 25; off: sıcaklık < 22)
+    kaydedilmeden denenir ve mevcut koşullarla karşılaştırılır; verilmeyen
+    bölüm için mevcut koşullar kullanılır.
+    """
+    if not is_user_verified(update.effective_user.id):
+        reply(update, "Lütfen önce şifreyi girerek doğrulama yapın.")
+        return
+    if backtest.numpy is None:
+        reply(update, "Geri test için NumPy kurulu olmalı.")
+        return
+
+    args = list(context.args or [])
+    window_text = BACKTEST_DEFAULT_WINDOW
+    if args and parse_duration(args[0]) is not None:
+        window_text = args.pop(0)
+    elif args and ":" not in args[0]:
+        reply(update, "Geçersiz süre. Örnek kullanım: /backtest 1d, /backtest 7d, /backtest 30d")
+        return
+    window = parse_duration(window_text)
+
+    try:
+        candidate = parse_rule_spec(" ".join(args))
+    except ValueError as e:
+        reply(
+            update,
+            f"Aday koşullar anlaşılamadı: {e}\n"
+            "Örnek: /backtest 7d on: sıcaklık > 25 ve nem < 60; off: sıcaklık < 22"
+        )
+        return
+
+    started = time.perf_counter()
+    end = time.time()
+    records = HISTORY.range_numpy(end - window, end)
+    on_conditions, off_conditions = load_conditions()
+    # Kontrol periyodunun birkaç katından uzun boşluklar (bot kapalıyken) sayılmaz
+    result = backtest.backtest(records, on_conditions, off_conditions, max_gap=3 * CONTROL_PERIOD)
+    candidate_result = None
+    if candidate:
+        candidate_result = backtest.backtest(
+            records,
+            candidate.get("on", on_conditions),
+            candidate.get("off", off_conditions),
+            max_gap=3 * CONTROL_PERIOD
+        )
+    logger.info(f"/backtest {window_text}: {result.samples} örnek, {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    if not result.samples:
+        reply(update, f"🧪 Son {window_text} için kayıtlı veri bulunmuyor.")
+        return
+
+    message = f"🧪 Geri test: son {window_text} ({result.samples} örnek)\n\n"
+    if candidate_result is not None:
+        message += "Aday koşullar (kaydedilmedi):\n"
+        for condition_type, title in (("on", "🔄 Çalıştırma"), ("off", "⏹️ Durdurma")):
+            if condition_type in candidate:
+                conditions = " ".join(format_condition(condition) for condition in candidate[condition_type])
+                message += f"{title}: {conditions}\n"
+        message += "\n" + backtest_summary(candidate_result) + "\nMevcut koşullarla:\n"
+    message += backtest_summary(result)
+    message += f"\nKayıtlı geçmişte gerçekleşen durum değişimi: {result.recorded_toggles}"
+    reply(update, message)
+
+def start_webhook(updater):
+    """Webhook modunu başlat; yapılandırılmamışsa ya da kurulamazsa None döndür."""
+    if not WEBHOOK_URL:
+        return None
+    
+    try:
+        server = webhook.WebhookServer(
+            updater.update_queue,
+            updater.bot,
+            listen=WEBHOOK_LISTEN,
+            port=WEBHOOK_PORT,
+            path=WEBHOOK_PATH,
+            secret_token=WEBHOOK_SECRET
+        )
+    except OSError as e:
+        logger.error(f"Webhook sunucusu başlatılamadı, polling kullanılacak: {e}")
+        return None
     
-    update.message.reply_text("Dashboard her 5 saniyede bir otomatik olarak yenilenecektir.")
+    # Telegram'ı yönlendirmeden önce sunucu istekleri kabul etmeye hazır olsun
+    server.start()
+    try:
+        # Dispatcher başlarken bot bilgisine ihtiyaç duyar; API'ye erişilemiyorsa
+        # burada hata verip polling'e dönmek daha güvenli
+        updater.bot.get_me()
+        updater.bot.set_webhook(
+            url=WEBHOOK_URL.rstrip("/") + server.path,
+            api_kwargs={"secret_token": WEBHOOK_SECRET}
+        )
+    except Exception as e:
+        logger.error(f"Webhook ayarlanamadı, polling kullanılacak: {e}")
+        server.stop()
+        return None
+    
+    # Polling olmadan dispatcher'ı ve job queue'yu başlat. Updater'ın kendi
+    # durumu değiştirilmez; kapanışta updater.stop() çalışan dispatcher'ı ve
+    # job queue'yu durdurur
+    updater.job_queue.start()
+    threading.Thread(target=updater.dispatcher.start, name="dispatcher", daemon=True).start()
+    return server
+
+def wait_for_stop_signal(stop_signals=(signal.SIGINT, signal.SIGTERM, signal.SIGABRT)):
+    """Webhook modunda updater.idle() yerine: durdurma sinyali gelene kadar bekle."""
+    stopped = threading.Event()
+    for sig in stop_signals:
+        signal.signal(sig, lambda signum, frame: stopped.set())
+    # Sinyaller ana thread'de, bekleme aralarında işlenir
+    while not stopped.wait(1):
+        pass
 
 def main() -> None:
     """Bot'u başlat."""
@@ -989,8 +1399,21 @@ def main() -> None:
     motor_status = dc_motor.durum_kontrol()
     logger.info(f"Başlangıçta motor durumu: {'AÇIK' if motor_status else 'KAPALI'}")
     
-    # Updater oluştur ve token'ı geçir
-    updater = Updater(token)
+    # Geçmişi ve özetleri diskteki kayıtlardan yeniden kur
+    HISTORY.load()
+    
+    # Motor sürücüsünü, sensör örnekleyicisini ve kontrol döngüsünü başlat
+    MOTOR.start()
+    SENSOR_SAMPLER.start()
+    CONTROL_LOOP.start()
+    
+    # Updater oluştur ve token'ı geçir; run_async handler'lar en fazla
+    # HANDLER_WORKERS thread'de çalışır
+    updater = Updater(token, workers=HANDLER_WORKERS)
+    
+    # Giden düzenleme ve yanıtların kuyruğunu başlat
+    OUTBOX.bot = updater.bot
+    OUTBOX.start()
 
     # Dispatcher al
     dispatcher = updater.dispatcher
@@ -1014,28 +1437,66 @@ def main() -> None:
         name="condition_conversation"
     )
 
+    # Handler'lar süreleri ölçülerek ve (açıksa) dispatcher thread'ini
+    # bekletmeden worker havuzunda çalıştırılır. Conversation handler'ın
+    # adımları sıralı kalmalı, bu yüzden eş zamanlı çalıştırılmaz.
+    timed = latency.timed(HANDLER_LATENCY)
+    run_async = CONCURRENT_HANDLERS
+    
     # Komut işleyicileri ekle
-    dispatcher.add_handler(CommandHandler("start", start))
-    dispatcher.add_handler(CommandHandler("dashboard", dashboard))
+    dispatcher.add_handler(CommandHandler("start", timed(start), run_async=run_async))
+    dispatcher.add_handler(CommandHandler("dashboard", timed(dashboard), run_async=run_async))
+    dispatcher.add_handler(CommandHandler("history", timed(history_command), run_async=run_async))
+    dispatcher.add_handler(CommandHandler("backtest", timed(backtest_command), run_async=run_async))
     
     # Koşul ekleme conversation handler'ını ekle
     dispatcher.add_handler(condition_conv_handler)
     
     # Diğer butonlar için callback handler'ı ekle
-    dispatcher.add_handler(CallbackQueryHandler(handle_callback_query))
+    dispatcher.add_handler(CallbackQueryHandler(timed(handle_callback_query), run_async=run_async))
     
     # Mesaj işleyicisi ekle (en sonda olmalı)
-    dispatcher.add_handler(MessageHandler(Filters.text & ~Filters.command, handle_message))
+    dispatcher.add_handler(MessageHandler(Filters.text & ~Filters.command, timed(handle_message), run_async=run_async))
 
-    # Bot'u başlat
-    updater.start_polling()
-    logger.info("Bot başlatıldı. Durdurmak için Ctrl+C tuşlarına basın.")
+    # Tüm açık dashboard'ları yenileyen tek global job'ı ekle; her çalıştığında
+    # bir sonrakini uyarlanmış aralıkla kendisi planlar
+    updater.job_queue.run_once(
+        dashboard_tick,
+        DASHBOARD_REFRESH_INTERVAL,
+        name=DASHBOARD_TICK_JOB
+    )
+
+    # Bot'u başlat: webhook yapılandırılmışsa webhook, değilse polling
+    webhook_server = start_webhook(updater)
+    if webhook_server is None:
+        updater.start_polling()
+    logger.info(
+        f"Bot {'webhook' if webhook_server else 'polling'} modunda başlatıldı. "
+        "Durdurmak için Ctrl+C tuşlarına basın."
+    )
 
     # Bot'u sonlandırılana kadar çalışır durumda tut
-    updater.idle()
-    
-    # Program sonlandığında GPIO pinlerini temizle
-    dc_motor.cleanup()
+    if webhook_server is None:
+        updater.idle()
+    else:
+        wait_for_stop_signal()
+        logger.info("Durdurma sinyali alındı, webhook sunucusu kapatılıyor...")
+        webhook_server.stop()
+        updater.stop()
+    
+    # Gönderim kuyruğunu, kontrol döngüsünü ve sensör örnekleyicisini durdur, geçmişi diske yaz
+    OUTBOX.stop()
+    logger.info(f"Gönderim kuyruğu istatistikleri: {OUTBOX.stats()}")
+    logger.info(f"Handler gecikmeleri: {HANDLER_LATENCY.summary()}")
+    CONTROL_LOOP.stop()
+    logger.info(f"Kontrol döngüsü istatistikleri: {CONTROL_LOOP.stats()}")
+    SENSOR_SAMPLER.stop()
+    HISTORY.flush()
+    
+    # Bekleyen okuma ve motor komutlarını bitir, sonra GPIO pinlerini temizle
+    GPIO_EXECUTOR.shutdown(wait=True)
+    MOTOR.stop()
+    dc_motor.temizle()
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ControlLoop:
+    """Sabit periyotla, açık dashboard'lardan bağımsız çalışan kontrol döngüsü.
+
+    Her adımın başlangıcı bir önceki adımın bitişine göre değil, sabit
+    periyotlu zaman çizelgesine (deadline) göre planlanır; böylece sapma
+    birikmez. Bir adım kendi periyodunu aşarsa kaçırılan slotlar telafi
+    edilmeye çalışılmaz, atlanır ve taşma olarak sayılır.
+    """
+
+    def __init__(self, step, period=5.0, name="control-loop"):
+        self._step = step
+        self.period = period
+        self.name = name
+
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped_slots = 0
+        self.max_jitter = 0.0
+        self.total_jitter = 0.0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Kontrol döngüsü thread'ini başlat."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Kontrol döngüsü thread'ini durdur."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self):
+        """Zamanlama istatistiklerini döndür (saniye cinsinden)."""
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped_slots": self.skipped_slots,
+            "max_jitter": self.max_jitter,
+            "mean_jitter": self.total_jitter / self.ticks if self.ticks else 0.0,
+            "last_duration": self.last_duration,
+            "max_duration": self.max_duration
+        }
+
+    def _run(self):
+        deadline = time.monotonic()
+        while True:
+            delay = deadline - time.monotonic()
+            if delay > 0 and self._stop_event.wait(delay):
+                return
+            if self._stop_event.is_set():
+                return
+
+            started = time.monotonic()
+            jitter = started - deadline
+            self.total_jitter += jitter
+            if jitter > self.max_jitter:
+                self.max_jitter = jitter
+
+            try:
+                self._step()
+            except Exception as e:
+                logger.error(f"Kontrol adımı hatası: {e}")
+
+            finished = time.monotonic()
+            self.ticks += 1
+            self.last_duration = finished - started
+            if self.last_duration > self.max_duration:
+                self.max_duration = self.last_duration
+
+            deadline += self.period
+            if finished > deadline:
+                # Adım periyodu aştı: kaçırılan slotları atla, sıradaki slottan devam et
+                missed = int((finished - deadline) // self.period) + 1
+                deadline += missed * self.period
+                self.overruns += 1
+                self.skipped_slots += missed
+                logger.warning(
+                    f"Kontrol adımı periyodu aştı ({self.last_duration:.3f} s > {self.period} s), "
+                    f"{missed} slot atlandı."
+                )
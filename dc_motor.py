@@ -25,6 +25,9 @@ motor_running = False
 def basla():
     """Motoru ileri yönde çalıştır."""
     global motor_running
+    # Motor zaten ileri yönde çalışıyorsa durdurup beklemeye gerek yok
+    if motor_running:
+        return True
     try:
         # Önce motoru durdur
         durdur()
@@ -1,6 +1,9 @@
 import time
+from array import array
 import RPi
 
+from . import decoder
+
 
 class DHT11Result:
     'DHT11 sensor result returned by DHT11.read() method'
@@ -25,10 +28,30 @@ class DHT11Result:
 class DHT11:
     'DHT11 sensor reader class for Raspberry'
 
+    # capture modes
+    # CAPTURE_POLL: store every sample and decode from sample counts
+    # CAPTURE_EDGE: store only transition timestamps and decode from pulse widths
+    CAPTURE_POLL = 'poll'
+    CAPTURE_EDGE = 'edge'
+
+    # response (2) + 40 bits (2 each) + trailing pull down, with some margin
+    MAX_EDGES = 100
+
+    # no transition for this long means the sensor finished sending
+    EDGE_TIMEOUT_US = 200
+
+    # a data pull up shorter than this is 0 (26-28 us), longer is 1 (70 us)
+    BIT_THRESHOLD_US = 50
+
     __pin = 0
 
-    def __init__(self, pin):
+    def __init__(self, pin, capture_mode=CAPTURE_POLL):
         self.__pin = pin
+        self.__capture_mode = capture_mode
+        # preallocated transition timestamp buffer (ns), reused on every read
+        self.__edges = array('Q', bytes(8 * DHT11.MAX_EDGES))
+        # polled samples, one byte per sample, reused on every read
+        self.__samples = bytearray()
 
     def read(self):
         RPi.GPIO.setup(self.__pin, RPi.GPIO.OUT)
@@ -42,21 +65,21 @@ class DHT11:
         # change to input using pull up
         RPi.GPIO.setup(self.__pin, RPi.GPIO.IN, RPi.GPIO.PUD_UP)
 
-        # collect data into an array
-        data = self.__collect_input()
-
-        # parse lengths of all data pull up periods
-        pull_up_lengths = self.__parse_data_pull_up_lengths(data)
-
-        # if bit count mismatch, return error (4 byte data + 1 byte checksum)
-        if len(pull_up_lengths) != 40:
-            return DHT11Result(DHT11Result.ERR_MISSING_DATA, 0, 0)
-
-        # calculate bits from lengths of the pull up periods
-        bits = self.__calculate_bits(pull_up_lengths)
-
-        # we have the bits, calculate bytes
-        the_bytes = self.__bits_to_bytes(bits)
+        if self.__capture_mode == DHT11.CAPTURE_EDGE:
+            # collect transition timestamps and decode from pulse widths
+            first_level, edge_count = self.__collect_edges()
+            the_bytes = self.__edges_to_bytes(first_level, edge_count)
+            if the_bytes is None:
+                return DHT11Result(DHT11Result.ERR_MISSING_DATA, 0, 0)
+        else:
+            # collect the samples into a compact byte buffer
+            data = self.__collect_input()
+
+            # run-length decode (4 byte data + 1 byte checksum), vectorized
+            # when NumPy is installed
+            the_bytes = decoder.decode_frame(data)
+            if the_bytes is None:
+                return DHT11Result(DHT11Result.ERR_MISSING_DATA, 0, 0)
 
         # calculate checksum and check
         checksum = self.__calculate_checksum(the_bytes)
@@ -88,7 +111,8 @@ class DHT11:
         max_unchanged_count = 100
 
         last = -1
-        data = []
+        data = self.__samples
+        del data[:]
         while True:
             current = RPi.GPIO.input(self.__pin)
             data.append(current)
@@ -102,100 +126,58 @@ class DHT11:
 
         return data
 
-    def __parse_data_pull_up_lengths(self, data):
-        STATE_INIT_PULL_DOWN = 1
-        STATE_INIT_PULL_UP = 2
-        STATE_DATA_FIRST_PULL_DOWN = 3
-        STATE_DATA_PULL_UP = 4
-        STATE_DATA_PULL_DOWN = 5
-
-        state = STATE_INIT_PULL_DOWN
-
-        lengths = [] # will contain the lengths of data pull up periods
-        current_length = 0 # will contain the length of the previous period
-
-        for i in range(len(data)):
-
-            current = data[i]
-            current_length += 1
-
-            if state == STATE_INIT_PULL_DOWN:
-                if current == RPi.GPIO.LOW:
-                    # ok, we got the initial pull down
-                    state = STATE_INIT_PULL_UP
-                    continue
-                else:
-                    continue
-            if state == STATE_INIT_PULL_UP:
-                if current == RPi.GPIO.HIGH:
-                    # ok, we got the initial pull up
-                    state = STATE_DATA_FIRST_PULL_DOWN
-                    continue
-                else:
-                    continue
-            if state == STATE_DATA_FIRST_PULL_DOWN:
-                if current == RPi.GPIO.LOW:
-                    # we have the initial pull down, the next will be the data pull up
-                    state = STATE_DATA_PULL_UP
-                    continue
-                else:
-                    continue
-            if state == STATE_DATA_PULL_UP:
-                if current == RPi.GPIO.HIGH:
-                    # data pulled up, the length of this pull up will determine whether it is 0 or 1
-                    current_length = 0
-                    state = STATE_DATA_PULL_DOWN
-                    continue
-                else:
-                    continue
-            if state == STATE_DATA_PULL_DOWN:
-                if current == RPi.GPIO.LOW:
-                    # pulled down, we store the length of the previous pull up period
-                    lengths.append(current_length)
-                    state = STATE_DATA_PULL_UP
-                    continue
-                else:
-                    continue
-
-        return lengths
-
-    def __calculate_bits(self, pull_up_lengths):
-        # find shortest and longest period
-        shortest_pull_up = 1000
-        longest_pull_up = 0
-
-        for i in range(0, len(pull_up_lengths)):
-            length = pull_up_lengths[i]
-            if length < shortest_pull_up:
-                shortest_pull_up = length
-            if length > longest_pull_up:
-                longest_pull_up = length
-
-        # use the halfway to determine whether the period it is long or short
-        halfway = shortest_pull_up + (longest_pull_up - shortest_pull_up) / 2
-        bits = []
-
-        for i in range(0, len(pull_up_lengths)):
-            bit = False
-            if pull_up_lengths[i] > halfway:
-                bit = True
-            bits.append(bit)
-
-        return bits
-
-    def __bits_to_bytes(self, bits):
-        the_bytes = []
-        byte = 0
-
-        for i in range(0, len(bits)):
-            byte = byte << 1
-            if (bits[i]):
-                byte = byte | 1
-            else:
-                byte = byte | 0
-            if ((i + 1) % 8 == 0):
-                the_bytes.append(byte)
-                byte = 0
+    def __collect_edges(self):
+        # record only the timestamps of level transitions, the levels
+        # themselves alternate so the first level is enough to restore them
+        edges = self.__edges
+        max_edges = len(edges)
+        pin = self.__pin
+        read = RPi.GPIO.input
+        clock = time.perf_counter_ns
+        timeout_ns = DHT11.EDGE_TIMEOUT_US * 1000
+
+        last = read(pin)
+        first_level = last
+        last_time = clock()
+        count = 0
+        while count < max_edges:
+            current = read(pin)
+            now = clock()
+            if current != last:
+                edges[count] = now
+                count += 1
+                last = current
+                last_time = now
+            elif now - last_time > timeout_ns:
+                break
+
+        return first_level, count
+
+    def __edges_to_bytes(self, first_level, edge_count):
+        # levels alternate, so edge j is rising when j has the parity below
+        first_rise = 0 if first_level == RPi.GPIO.LOW else 1
+
+        # the data bits are the last 40 complete pull ups (a rising edge
+        # followed by a falling edge); the pull up after the last bit is
+        # the line release and never ends before the timeout
+        last_rise = edge_count - 2
+        if (last_rise - first_rise) % 2:
+            last_rise -= 1
+        first_bit_rise = last_rise - 2 * 39
+
+        # we need the 80 us response pull up before the data bits
+        if first_bit_rise < first_rise + 2:
+            return None
+
+        edges = self.__edges
+        threshold_ns = DHT11.BIT_THRESHOLD_US * 1000
+        the_bytes = bytearray(5)
+        for i in range(40):
+            rise = first_bit_rise + 2 * i
+            byte_index = i >> 3
+            the_bytes[byte_index] <<= 1
+            if edges[rise + 1] - edges[rise] > threshold_ns:
+                the_bytes[byte_index] |= 1
 
         return the_bytes
 
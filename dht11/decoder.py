@@ -0,0 +1,188 @@
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+LOW = 0
+HIGH = 1
+
+# data pull ups in a frame (4 byte data + 1 byte checksum)
+BIT_COUNT = 40
+
+# bytes to search for to find the end of a run of the given level
+RUN_END = {LOW: b'\x01', HIGH: b'\x00'}
+
+# number of runs before the first data pull up:
+# initial pull down, initial pull up, first data pull down
+PREAMBLE_RUNS = 3
+
+
+def decode(samples):
+    '''Decode a polled DHT11 frame in a single run-length pass.
+
+    samples is a bytes-like sequence of 0/1 levels. Returns a bytearray with
+    the 5 frame bytes (checksum not verified) or None if bits are missing.
+    '''
+    if not isinstance(samples, (bytes, bytearray)):
+        samples = bytes(samples)
+
+    # the frame starts at the first pull down
+    position = samples.find(b'\x00')
+    if position < 0:
+        return None
+
+    lengths = array('H', bytes(2 * BIT_COUNT))
+    shortest = 0xFFFF
+    longest = 0
+    count = 0
+    level = LOW
+    run_index = 0
+    end = len(samples)
+
+    # every find() call jumps over a whole run in C
+    while True:
+        run_end = samples.find(RUN_END[level], position)
+        if run_end < 0:
+            # the last run never ended, it is the line release
+            break
+
+        if level == HIGH and run_index >= PREAMBLE_RUNS:
+            if count == BIT_COUNT:
+                return None
+            length = run_end - position
+            lengths[count] = length
+            count += 1
+            if length < shortest:
+                shortest = length
+            if length > longest:
+                longest = length
+
+        position = run_end
+        level ^= 1
+        run_index += 1
+        if position >= end:
+            break
+
+    if count != BIT_COUNT:
+        return None
+
+    return _pack(lengths, shortest, longest)
+
+
+def decode_numpy(samples):
+    '''Vectorized variant of decode(), available when NumPy is installed.'''
+    levels = numpy.frombuffer(samples, dtype=numpy.uint8)
+
+    lows = numpy.flatnonzero(levels == LOW)
+    if lows.size == 0:
+        return None
+    levels = levels[lows[0]:]
+
+    # run boundaries: index of the first sample of every run after the first
+    starts = numpy.flatnonzero(numpy.diff(levels)) + 1
+    # only runs that ended count; the first run is the initial pull down
+    run_lengths = numpy.diff(starts)
+    run_levels = levels[starts[:-1]]
+
+    # skip initial pull up and first data pull down, keep pull ups
+    data = run_lengths[PREAMBLE_RUNS - 1:][run_levels[PREAMBLE_RUNS - 1:] == HIGH]
+    if data.size != BIT_COUNT:
+        return None
+
+    shortest = int(data.min())
+    longest = int(data.max())
+    halfway = shortest + (longest - shortest) / 2
+    bits = (data > halfway).astype(numpy.uint8)
+    return bytearray(numpy.packbits(bits).tobytes())
+
+
+# decoder used by DHT11.read(): the vectorized one when NumPy is importable
+decode_frame = decode_numpy if numpy is not None else decode
+
+
+def _pack(lengths, shortest, longest):
+    # use the halfway to determine whether the period is long or short
+    halfway = shortest + (longest - shortest) / 2
+    the_bytes = bytearray(5)
+    for i in range(BIT_COUNT):
+        byte_index = i >> 3
+        the_bytes[byte_index] <<= 1
+        if lengths[i] > halfway:
+            the_bytes[byte_index] |= 1
+    return the_bytes
+
+
+def decode_legacy(samples):
+    '''Reference three-pass decoder the reader used before decode().
+
+    Kept only to compare speed and accuracy in benchmarks.
+    '''
+    STATE_INIT_PULL_DOWN = 1
+    STATE_INIT_PULL_UP = 2
+    STATE_DATA_FIRST_PULL_DOWN = 3
+    STATE_DATA_PULL_UP = 4
+    STATE_DATA_PULL_DOWN = 5
+
+    state = STATE_INIT_PULL_DOWN
+
+    lengths = []  # will contain the lengths of data pull up periods
+    current_length = 0  # will contain the length of the previous period
+
+    for i in range(len(samples)):
+
+        current = samples[i]
+        current_length += 1
+
+        if state == STATE_INIT_PULL_DOWN:
+            if current == LOW:
+                state = STATE_INIT_PULL_UP
+            continue
+        if state == STATE_INIT_PULL_UP:
+            if current == HIGH:
+                state = STATE_DATA_FIRST_PULL_DOWN
+            continue
+        if state == STATE_DATA_FIRST_PULL_DOWN:
+            if current == LOW:
+                state = STATE_DATA_PULL_UP
+            continue
+        if state == STATE_DATA_PULL_UP:
+            if current == HIGH:
+                current_length = 0
+                state = STATE_DATA_PULL_DOWN
+            continue
+        if state == STATE_DATA_PULL_DOWN:
+            if current == LOW:
+                lengths.append(current_length)
+                state = STATE_DATA_PULL_UP
+            continue
+
+    if len(lengths) != BIT_COUNT:
+        return None
+
+    # find shortest and longest period
+    shortest_pull_up = 1000
+    longest_pull_up = 0
+    for length in lengths:
+        if length < shortest_pull_up:
+            shortest_pull_up = length
+        if length > longest_pull_up:
+            longest_pull_up = length
+
+    halfway = shortest_pull_up + (longest_pull_up - shortest_pull_up) / 2
+    bits = []
+    for length in lengths:
+        bits.append(length > halfway)
+
+    the_bytes = []
+    byte = 0
+    for i in range(0, len(bits)):
+        byte = byte << 1
+        if bits[i]:
+            byte = byte | 1
+        if (i + 1) % 8 == 0:
+            the_bytes.append(byte)
+            byte = 0
+
+    return the_bytes
@@ -1,5 +1,6 @@
 import RPi.GPIO as GPIO
 import dht11
+import threading
 import time
 
 # GPIO ayarları sadece 1 kez yapılsın
@@ -7,33 +8,61 @@ GPIO.setwarnings(False)
 GPIO.setmode(GPIO.BOARD)
 
 # DHT11 sensör nesnesi (PIN 8 kullanılıyor - BOARD modunda)
-instance = dht11.DHT11(pin=8)
+# Kenar zaman damgası modu: örnek sayısı yerine mikrosaniye cinsinden darbe genişliği
+instance = dht11.DHT11(pin=8, capture_mode=dht11.DHT11.CAPTURE_EDGE)
 
 # Önceki geçerli değerler (başlangıçta -1)
 prev_temperature = 23.5
 prev_humidity = 55
 
+# DHT11 iki ölçüm arasında en az bu kadar süre ister (saniye)
+MIN_READ_INTERVAL = 1.1
+
+# Son fiziksel okuma denemesi ve son geçerli okuma zamanı (time.monotonic())
+last_read_time = None
+last_valid_time = None
+
+# Aynı anda sadece bir thread sensöre erişsin
+read_lock = threading.Lock()
+
+def read_sensor():
+    """
+    (sıcaklık, nem, yaş) döndürür. Yaş, değerlerin alındığı geçerli ölçümden
+    bu yana geçen süredir (hiç geçerli ölçüm yoksa None).
+    Sensör henüz yeni ölçüm yapamıyorsa veya başka bir thread okuyorsa
+    beklemeden önceki değerleri döndürür; sadece yeni ölçüm mümkünse okur.
+    """
+    global prev_temperature, prev_humidity, last_read_time, last_valid_time
+
+    now = time.monotonic()
+    if last_read_time is None or now - last_read_time >= MIN_READ_INTERVAL:
+        # Kilit alınamıyorsa başka bir thread zaten okuyor, bekleme
+        if read_lock.acquire(blocking=False):
+            try:
+                # Kilidi alana kadar başka bir thread okumuş olabilir
+                if last_read_time is None or time.monotonic() - last_read_time >= MIN_READ_INTERVAL:
+                    last_read_time = time.monotonic()
+                    result = instance.read()
+                    if result.is_valid():
+                        prev_temperature = result.temperature
+                        prev_humidity = result.humidity
+                        last_valid_time = time.monotonic()
+            except Exception as e:
+                print(f"DHT11 okuma hatası: {e}")
+            finally:
+                read_lock.release()
+
+    age = None if last_valid_time is None else time.monotonic() - last_valid_time
+    return prev_temperature, prev_humidity, age
+
 def get_temperature_and_humidity():
     """
     DHT11 sensöründen sıcaklık ve nem ölçümünü döndürür.
-    Eğer ölçüm geçersizse bir önceki geçerli değeri döndürür.
+    Eğer ölçüm geçersizse veya yeni ölçüm henüz mümkün değilse
+    bir önceki geçerli değeri döndürür. Hiçbir zaman beklemez.
     """
-    global prev_temperature, prev_humidity
-
-    try:
-        result = instance.read()
-        time.sleep(1.1)  # sensörün veri yenilemesi için yeterli süre
-
-        if result.is_valid():
-            prev_temperature = result.temperature
-            prev_humidity = result.humidity
-            return prev_temperature, prev_humidity
-        else:
-            return prev_temperature, prev_humidity
-
-    except Exception as e:
-        print(f"DHT11 okuma hatası: {e}")
-        return prev_temperature, prev_humidity
+    temperature, humidity, _ = read_sensor()
+    return temperature, humidity
 
 def cleanup():
     GPIO.cleanup()
@@ -0,0 +1,606 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import csv
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+# Sabit genişlikli kayıt: zaman damgası (time.time()), sıcaklık, nem, ışık,
+# motor gücü ve okuma kalitesi bayrakları; 24 bayta hizalı
+RECORD = struct.Struct("<dfffBBxx")
+TIMESTAMP = struct.Struct("<d")  # Kaydın ilk alanı
+
+# RECORD'un NumPy karşılığı; dosya dilimleri kopyalanmadan dizi olarak okunur
+if numpy is not None:
+    RECORD_DTYPE = numpy.dtype([
+        ("timestamp", "<f8"),
+        ("temperature", "<f4"),
+        ("humidity", "<f4"),
+        ("light", "<f4"),
+        ("power", "u1"),
+        ("flags", "u1"),
+        ("padding", "V2")
+    ])
+else:
+    RECORD_DTYPE = None
+
+# Zaman indeksinde her kaç kayıtta bir giriş tutulacağı
+INDEX_STRIDE = 512
+
+# Okuma kalitesi bayrakları
+FLAG_CLIMATE_STALE = 1   # Sıcaklık/nem verisi eski
+FLAG_LIGHT_STALE = 2     # Işık verisi eski
+FLAG_LIGHT_NOISY = 4     # Işık örnekleri arasında sapma yüksek
+FLAG_NO_CLIMATE = 8      # DHT11'den hiç geçerli ölçüm alınmadı
+
+# Özet çözünürlükleri: (kova süresi saniye, tutulan kova sayısı)
+RESOLUTIONS = (
+    (60, 24 * 60),        # 1 dakika, son 1 gün
+    (3600, 90 * 24),      # 1 saat, son 90 gün
+    (86400, 10 * 366)     # 1 gün, son ~10 yıl
+)
+
+# Özetlenen ölçümler
+FIELDS = ("temperature", "humidity", "light")
+
+# Bir ölçümün kova içindeki özeti
+Stat = namedtuple("Stat", ["min", "max", "mean", "count"])
+
+# Bir özet kovası: başlangıç zamanı, çözünürlük, örnek sayısı, ölçüm özetleri
+# (Stat ya da veri yoksa None) ve motorun açık olduğu örneklerin oranı
+Bucket = namedtuple("Bucket", ["start", "resolution", "samples", "temperature", "humidity", "light", "power"])
+
+
+def snapshot_flags(snapshot, max_age, noisy_spread, now):
+    """Sensör görüntüsünden okuma kalitesi bayraklarını hesapla."""
+    flags = 0
+    if snapshot.temperature_time is None:
+        flags |= FLAG_NO_CLIMATE
+    elif now - snapshot.temperature_time > max_age:
+        flags |= FLAG_CLIMATE_STALE
+    if snapshot.light_time is None or now - snapshot.light_time > max_age:
+        flags |= FLAG_LIGHT_STALE
+    if snapshot.light_spread is not None and snapshot.light_spread > noisy_spread:
+        flags |= FLAG_LIGHT_NOISY
+    return flags
+
+
+class Rollup:
+    """Tek çözünürlükte min/maks/ortalama/sayı özetlerini tutan halka tampon.
+
+    Kova numarası int(zaman // çözünürlük), konumu numara % kapasite'dir.
+    Konumdaki kova eski bir zamana aitse yeni örnek gelince sıfırlanır; bu
+    yüzden bellek sabittir ve güncelleme O(1)'dir.
+    """
+
+    def __init__(self, resolution, capacity):
+        self.resolution = resolution
+        self.capacity = capacity
+        self.numbers = array('q', [-1]) * capacity  # Konumdaki kovanın numarası
+        self.samples = array('I', bytes(4 * capacity))
+        self.power_on = array('I', bytes(4 * capacity))
+        self.counts = [array('I', bytes(4 * capacity)) for _ in FIELDS]
+        self.mins = [array('f', bytes(4 * capacity)) for _ in FIELDS]
+        self.maxs = [array('f', bytes(4 * capacity)) for _ in FIELDS]
+        self.sums = [array('d', bytes(8 * capacity)) for _ in FIELDS]
+
+    def add(self, timestamp, values, power):
+        """Örneği kovasına ekle; values içindeki None değerler atlanır."""
+        number = int(timestamp // self.resolution)
+        i = number % self.capacity
+        if self.numbers[i] != number:
+            if number < self.numbers[i]:
+                # Kovası çoktan ezilmiş kadar eski örnek
+                return
+            self.numbers[i] = number
+            self.samples[i] = 0
+            self.power_on[i] = 0
+            for counts in self.counts:
+                counts[i] = 0
+
+        self.samples[i] += 1
+        if power:
+            self.power_on[i] += 1
+        for f, value in enumerate(values):
+            if value is None:
+                continue
+            counts = self.counts[f]
+            if counts[i] == 0:
+                self.mins[f][i] = value
+                self.maxs[f][i] = value
+                self.sums[f][i] = value
+            else:
+                if value < self.mins[f][i]:
+                    self.mins[f][i] = value
+                if value > self.maxs[f][i]:
+                    self.maxs[f][i] = value
+                self.sums[f][i] += value
+            counts[i] += 1
+
+    def covers(self, start, now):
+        """start zamanı bu çözünürlükte hâlâ tutuluyor mu."""
+        return int(start // self.resolution) > int(now // self.resolution) - self.capacity
+
+    def buckets(self, start, end):
+        """[start, end] aralığına düşen dolu kovaları eskiden yeniye döndür."""
+        return self.numbered_buckets(int(start // self.resolution), int(end // self.resolution))
+
+    def numbered_buckets(self, first, last):
+        """Numarası first..last (dahil) olan dolu kovaları eskiden yeniye döndür."""
+        first = max(first, last - self.capacity + 1)
+        for number in range(first, last + 1):
+            i = number % self.capacity
+            if self.numbers[i] != number or not self.samples[i]:
+                continue
+            stats = []
+            for f in range(len(FIELDS)):
+                count = self.counts[f][i]
+                if count:
+                    stats.append(Stat(self.mins[f][i], self.maxs[f][i], self.sums[f][i] / count, count))
+                else:
+                    stats.append(None)
+            yield Bucket(
+                number * self.resolution, self.resolution, self.samples[i],
+                *stats, self.power_on[i] / self.samples[i]
+            )
+
+
+def merge_stats(stats):
+    """Stat listesini tek bir Stat'ta birleştir (veri yoksa None)."""
+    stats = [stat for stat in stats if stat is not None]
+    if not stats:
+        return None
+    count = sum(stat.count for stat in stats)
+    return Stat(
+        min(stat.min for stat in stats),
+        max(stat.max for stat in stats),
+        sum(stat.mean * stat.count for stat in stats) / count,
+        count
+    )
+
+
+def records_bucket(records, start, resolution):
+    """Ham kayıtları (History.records) tek bir kovada özetle; kayıt yoksa None."""
+    samples = 0
+    power_on = 0
+    mins = [None] * len(FIELDS)
+    maxs = [None] * len(FIELDS)
+    sums = [0.0] * len(FIELDS)
+    counts = [0] * len(FIELDS)
+    for timestamp, temperature, humidity, light, power, flags in records:
+        samples += 1
+        if power:
+            power_on += 1
+        values = (None, None, light) if flags & FLAG_NO_CLIMATE else (temperature, humidity, light)
+        for f, value in enumerate(values):
+            if value is None:
+                continue
+            if counts[f] == 0 or value < mins[f]:
+                mins[f] = value
+            if counts[f] == 0 or value > maxs[f]:
+                maxs[f] = value
+            sums[f] += value
+            counts[f] += 1
+    if not samples:
+        return None
+    stats = [
+        Stat(mins[f], maxs[f], sums[f] / counts[f], counts[f]) if counts[f] else None
+        for f in range(len(FIELDS))
+    ]
+    return Bucket(start, resolution, samples, *stats, power_on / samples)
+
+
+def merge_buckets(buckets, start, resolution):
+    """Ardışık kovaları start'ta başlayan tek bir kovada birleştir."""
+    samples = sum(bucket.samples for bucket in buckets)
+    return Bucket(
+        start, resolution, samples,
+        *(merge_stats([getattr(bucket, field) for bucket in buckets]) for field in FIELDS),
+        sum(bucket.power * bucket.samples for bucket in buckets) / samples
+    )
+
+
+def summarize(buckets):
+    """Kovaları tüm aralığı kapsayan tek bir özet sözlüğünde birleştir."""
+    samples = sum(bucket.samples for bucket in buckets)
+    summary = {field: merge_stats([getattr(bucket, field) for bucket in buckets]) for field in FIELDS}
+    summary["samples"] = samples
+    summary["power"] = (
+        sum(bucket.power * bucket.samples for bucket in buckets) / samples if samples else None
+    )
+    return summary
+
+
+class HistoryBuffer:
+    """Son okumaları sabit boyutlu dizilerde tutan halka tampon.
+
+    Bellek kullanımı kapasiteyle sabittir; dolunca en eski kayıtların
+    üzerine yazılır.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.temperatures = array('f', bytes(4 * capacity))
+        self.humidities = array('f', bytes(4 * capacity))
+        self.lights = array('f', bytes(4 * capacity))
+        self.powers = array('B', bytes(capacity))
+        self.flags = array('B', bytes(capacity))
+
+        self.head = 0   # Bir sonraki kaydın yazılacağı konum
+        self.count = 0  # Tampondaki kayıt sayısı
+
+    def append(self, timestamp, temperature, humidity, light, power, flags):
+        i = self.head
+        self.timestamps[i] = timestamp
+        self.temperatures[i] = temperature
+        self.humidities[i] = humidity
+        self.lights[i] = light
+        self.powers[i] = 1 if power else 0
+        self.flags[i] = flags
+        self.head = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def record(self, i):
+        """Konumdaki kaydı demet olarak döndür."""
+        return (
+            self.timestamps[i], self.temperatures[i], self.humidities[i],
+            self.lights[i], self.powers[i], self.flags[i]
+        )
+
+    def last(self, n):
+        """En yeni n kaydı eskiden yeniye doğru döndür."""
+        n = min(n, self.count)
+        start = (self.head - n) % self.capacity
+        for k in range(n):
+            yield self.record((start + k) % self.capacity)
+
+    def pack(self, n, buffer):
+        """En yeni n kaydı sabit genişlikli kayıtlar olarak buffer'a yaz."""
+        n = min(n, self.count)
+        start = (self.head - n) % self.capacity
+        for k in range(n):
+            RECORD.pack_into(buffer, k * RECORD.size, *self.record((start + k) % self.capacity))
+        return n * RECORD.size
+
+
+class HistoryFile:
+    """Kayıtları sona ekleyen, boyutu sınırlı ikili dosya.
+
+    Dosya max_bytes / 2 boyutuna ulaşınca path + ".1" olarak döndürülür
+    (eskisinin üzerine yazılır); böylece toplam boyut max_bytes'ı geçmez.
+    """
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.rotated_path = f"{path}.1"
+        self.segment_bytes = max(RECORD.size, (max_bytes // 2) // RECORD.size * RECORD.size)
+
+    def append(self, data):
+        if not data:
+            return
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            size = 0
+
+        # Yarım kalmış kayıt olmasın diye dosya kayıt sınırında tutulur
+        if size % RECORD.size:
+            logger.warning("Geçmiş dosyası kayıt sınırında değil, son yarım kayıt atılıyor.")
+            with open(self.path, 'r+b') as file:
+                file.truncate(size - size % RECORD.size)
+            size -= size % RECORD.size
+
+        if size + len(data) > self.segment_bytes:
+            os.replace(self.path, self.rotated_path)
+
+        with open(self.path, 'ab') as file:
+            file.write(data)
+
+
+class MappedSegment:
+    """Bir geçmiş dosyasının salt okunur bellek eşlemesi ve seyrek zaman indeksi.
+
+    Kayıtlar zaman sırasıyla eklendiği için index[k], (k * INDEX_STRIDE).
+    kaydın zamanıdır; bir zaman önce indekste, sonra tek bloğun içinde ikili
+    aramayla bulunur. Dosya büyüdükçe eşleme yenilenir ve indeks sadece yeni
+    kayıtlar için uzatılır. Okunan sayfaları işletim sistemi yönetir; dosya
+    belleğe kopyalanmaz.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.map = None
+        self.count = 0
+        self.index = array('d')
+        self._inode = None
+
+    def refresh(self):
+        """Dosya değiştiyse eşlemeyi ve indeksi güncelle."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.map = None
+            self.count = 0
+            self.index = array('d')
+            self._inode = None
+            return
+
+        count = stat.st_size // RECORD.size
+        if stat.st_ino == self._inode and count == self.count:
+            return
+        if stat.st_ino != self._inode or count < self.count:
+            # Dosya döndürülmüş ya da kısaltılmış: indeksi baştan kur
+            self.index = array('d')
+        self._inode = stat.st_ino
+        self.count = count
+
+        # Eski eşleme, ondan alınmış dilimler bırakılınca kapanır
+        self.map = None
+        if count:
+            with open(self.path, 'rb') as file:
+                self.map = mmap.mmap(file.fileno(), count * RECORD.size, access=mmap.ACCESS_READ)
+        for i in range(len(self.index) * INDEX_STRIDE, count, INDEX_STRIDE):
+            self.index.append(self.timestamp(i))
+
+    def timestamp(self, i):
+        """i. kaydın zamanı."""
+        return TIMESTAMP.unpack_from(self.map, i * RECORD.size)[0]
+
+    def bisect(self, timestamp, right=False):
+        """Zamanı timestamp'ten küçük (right ise küçük veya eşit) olmayan ilk kaydın sırası."""
+        if right:
+            block = bisect_right(self.index, timestamp)
+        else:
+            block = bisect_left(self.index, timestamp)
+        low = max(0, (block - 1) * INDEX_STRIDE)
+        high = min(self.count, block * INDEX_STRIDE)
+        while low < high:
+            middle = (low + high) // 2
+            value = self.timestamp(middle)
+            if value < timestamp or (right and value == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def slice(self, start, end):
+        """[start, end] aralığındaki kayıtları kopyasız memoryview olarak döndür."""
+        if not self.count:
+            return memoryview(b"")
+        first = self.bisect(start)
+        last = self.bisect(end, right=True)
+        return memoryview(self.map)[first * RECORD.size:max(first, last) * RECORD.size]
+
+
+class History:
+    """Sensör geçmişi: bellekte halka tampon, diskte toplu yazılan ikili dosya."""
+
+    def __init__(self, path, capacity=4096, flush_every=60, max_bytes=64 * 1024 * 1024):
+        self.buffer = HistoryBuffer(capacity)
+        self.file = HistoryFile(path, max_bytes)
+        # Toplu yazma en fazla tampon kapasitesi kadar kayıt biriktirebilir
+        self.flush_every = max(1, min(flush_every, capacity))
+        self.unflushed = 0
+        self.rollups = tuple(Rollup(resolution, capacity) for resolution, capacity in RESOLUTIONS)
+
+        # Eskiden yeniye: döndürülmüş dosya, güncel dosya
+        self.segments = (MappedSegment(self.file.rotated_path), MappedSegment(self.file.path))
+
+        self._lock = threading.Lock()
+        self._pack_buffer = bytearray(RECORD.size * self.flush_every)
+
+    def load(self):
+        """Diskteki kayıtların üzerinden akarak özetleri ve son kayıtların tamponunu kur."""
+        loaded = 0
+        with self._lock:
+            views = self._views_locked(float("-inf"), float("inf"))
+            total = sum(len(view) for view in views) // RECORD.size
+            # Tampona sadece sığacak kadar son kayıt girer
+            skip = total - self.buffer.capacity
+
+            for view in views:
+                for record in RECORD.iter_unpack(view):
+                    self._roll(*record)
+                    if loaded >= skip:
+                        self.buffer.append(*record)
+                    loaded += 1
+        logger.info(f"Geçmiş dosyasından {loaded} kayıt yüklendi.")
+        return loaded
+
+    def _views_locked(self, start, end):
+        # Diske yazılmış kayıtlar eşlemeden okunur; sorgu için diske yazılmaz,
+        # henüz yazılmamış son kayıtlar bellekteki tampondan eklenir
+        views = []
+        for segment in self.segments:
+            segment.refresh()
+            view = segment.slice(start, end)
+            if len(view):
+                views.append(view)
+        tail = self._tail_locked(start, end)
+        if tail is not None:
+            views.append(tail)
+        return views
+
+    def _tail_locked(self, start, end):
+        """Diske yazılmamış kayıtlardan [start, end] aralığında kalanların kopyası (yoksa None)."""
+        records = [record for record in self.buffer.last(self.unflushed) if start <= record[0] <= end]
+        if not records:
+            return None
+        data = bytearray(RECORD.size * len(records))
+        for k, record in enumerate(records):
+            RECORD.pack_into(data, k * RECORD.size, *record)
+        return memoryview(data)
+
+    def range(self, start, end):
+        """[start, end] aralığındaki ham kayıtları kopyasız memoryview listesi olarak döndür."""
+        with self._lock:
+            return self._views_locked(start, end)
+
+    def records(self, start, end):
+        """[start, end] aralığındaki kayıtları demet olarak tek tek üret."""
+        for view in self.range(start, end):
+            yield from RECORD.iter_unpack(view)
+
+    def range_numpy(self, start, end):
+        """[start, end] aralığını RECORD_DTYPE tipinde NumPy dizisi olarak döndür.
+
+        Aralık tek dosyadaysa dizi dosya eşlemesinin üzerinde, kopyasız oluşturulur.
+        """
+        if numpy is None:
+            raise RuntimeError("Bu işlem için NumPy gerekli.")
+        arrays = [numpy.frombuffer(view, dtype=RECORD_DTYPE) for view in self.range(start, end)]
+        if not arrays:
+            return numpy.empty(0, dtype=RECORD_DTYPE)
+        if len(arrays) == 1:
+            return arrays[0]
+        return numpy.concatenate(arrays)
+
+    def export_csv(self, file, start=float("-inf"), end=float("inf")):
+        """Aralıktaki kayıtları CSV olarak akışla yaz; yazılan satır sayısını döndür."""
+        writer = csv.writer(file)
+        writer.writerow(("timestamp", "temperature", "humidity", "light", "power", "flags"))
+        rows = 0
+        for record in self.records(start, end):
+            writer.writerow(record)
+            rows += 1
+        return rows
+
+    def append(self, timestamp, temperature, humidity, light, power, flags=0):
+        """Yeni bir okuma ekle; yeterince kayıt biriktiyse diske yaz."""
+        with self._lock:
+            self.buffer.append(timestamp, temperature, humidity, light, power, flags)
+            self._roll(timestamp, temperature, humidity, light, power, flags)
+            self.unflushed += 1
+            if self.unflushed >= self.flush_every:
+                self._flush_locked()
+
+    def flush(self):
+        """Diske yazılmamış kayıtları yaz."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self.unflushed:
+            return
+        size = self.buffer.pack(self.unflushed, self._pack_buffer)
+        try:
+            self.file.append(memoryview(self._pack_buffer)[:size])
+            self.unflushed = 0
+        except OSError as e:
+            # Kayıtlar tamponda kalır, bir sonraki toplu yazmada tekrar denenir
+            logger.error(f"Geçmiş dosyasına yazılamadı: {e}")
+            self.unflushed = min(self.unflushed, self.flush_every - 1)
+
+    def last(self, n):
+        """Bellekteki en yeni n kaydı döndür."""
+        with self._lock:
+            return list(self.buffer.last(n))
+
+    def _roll(self, timestamp, temperature, humidity, light, power, flags):
+        # DHT11'den hiç ölçüm yokken gelen sıcaklık/nem değerleri özetlere girmez
+        if flags & FLAG_NO_CLIMATE:
+            values = (None, None, light)
+        else:
+            values = (temperature, humidity, light)
+        for rollup in self.rollups:
+            rollup.add(timestamp, values, power)
+
+    def choose_rollup(self, start, end, max_points, now=None):
+        """Aralığı kapsayan ve aralıkta en az max_points kovası olan en kaba
+        çözünürlüğü seç; hiçbirinde o kadar kova yoksa kapsayan en ince
+        çözünürlük kullanılır (hiçbiri kapsamıyorsa en kaba çözünürlük).
+
+        Böylece kısa aralıklar da bütçeye yakın sayıda noktayla gösterilir,
+        okunan kova sayısı ise gerekenden fazla olmaz.
+        """
+        if now is None:
+            now = end
+        covering = [rollup for rollup in self.rollups if rollup.covers(start, now)]
+        if not covering:
+            return self.rollups[-1]
+        for rollup in reversed(covering):
+            if math.ceil((end - start) / rollup.resolution) >= max_points:
+                return rollup
+        return covering[0]
+
+    def summary(self, start, end, now=None):
+        """[start, end] aralığının tam özetini döndür (summarize biçiminde).
+
+        Aralığın içinde tamamen kalan kovalar aralığı kapsayan en ince
+        çözünürlükten alınır; kenarlardaki kısmi kovaların yerine o kısımların
+        ham kayıtları kullanılır. Böylece özet aralığın dışındaki örnekleri
+        içermez.
+        """
+        if now is None:
+            now = end
+        with self._lock:
+            rollup = next((rollup for rollup in self.rollups if rollup.covers(start, now)), self.rollups[-1])
+            resolution = rollup.resolution
+            # Aralığın içinde tamamen kalan ilk ve son kova numaraları
+            first = math.ceil(start / resolution)
+            last = math.floor(end / resolution) - 1
+            if first > last:
+                edges = ((start, end),)
+                buckets = []
+            else:
+                edges = ((start, first * resolution), ((last + 1) * resolution, end))
+                buckets = list(rollup.numbered_buckets(first, last))
+
+            for edge_start, edge_end in edges:
+                records = (
+                    record
+                    for view in self._views_locked(edge_start, edge_end)
+                    for record in RECORD.iter_unpack(view)
+                    # Kova sınırındaki kayıt zaten tam kovada sayılır
+                    if record[0] < edge_end or edge_end == end
+                )
+                bucket = records_bucket(records, edge_start, resolution)
+                if bucket is not None:
+                    buckets.append(bucket)
+        return summarize(buckets)
+
+    def query(self, start, end, max_points=60):
+        """[start, end] aralığını (çözünürlük, kova listesi) olarak döndür.
+
+        Seçilen çözünürlüğün ardışık kovaları, en fazla max_points nokta
+        (kısmi kenar yüzünden bir fazlası) kalacak şekilde birleştirilir;
+        dönen çözünürlük birleştirilmiş kovalarınkidir. Okunan kova sayısı
+        saklama süresine değil, istenen aralığa ve nokta bütçesine bağlıdır.
+        """
+        with self._lock:
+            rollup = self.choose_rollup(start, end, max_points)
+            buckets = list(rollup.buckets(start, end))
+        step = max(1, math.ceil((end - start) / rollup.resolution / max_points))
+        if step == 1:
+            return rollup.resolution, buckets
+        resolution = rollup.resolution * step
+        groups = {}
+        for bucket in buckets:
+            groups.setdefault(int(bucket.start // resolution), []).append(bucket)
+        return resolution, [merge_buckets(group, number * resolution, resolution) for number, group in groups.items()]
+
+
+if __name__ == "__main__":
+    # Kullanım: python history.py [süre_saniye] > gecmis.csv
+    history = History("history.bin")
+    window = float(sys.argv[1]) if len(sys.argv) > 1 else float("inf")
+    rows = history.export_csv(sys.stdout, time.time() - window)
+    print(f"{rows} kayıt dışa aktarıldı.", file=sys.stderr)
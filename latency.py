@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import functools
+import math
+import threading
+import time
+from array import array
+
+
+class LatencyStats:
+    """Son ölçülen süreleri sabit boyutlu halka tamponda tutan istatistik.
+
+    record() O(1)'dir; yüzdelikler sadece istendiğinde sıralanarak hesaplanır.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.samples = array('d', bytes(8 * capacity))
+        self.head = 0
+        self.count = 0  # Toplam ölçüm sayısı (tampondan taşanlar dahil)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self.samples[self.head] = seconds
+            self.head = (self.head + 1) % self.capacity
+            self.count += 1
+
+    def percentiles(self, *ranks):
+        """Tampondaki ölçümlerin istenen yüzdeliklerini (saniye) döndür."""
+        with self._lock:
+            values = sorted(self.samples[:min(self.count, self.capacity)])
+        if not values:
+            return [None] * len(ranks)
+        return [values[min(len(values) - 1, max(0, math.ceil(rank / 100 * len(values)) - 1))] for rank in ranks]
+
+    def summary(self):
+        """p50/p99/maks (milisaniye) ve ölçüm sayısı."""
+        p50, p99, p100 = self.percentiles(50, 99, 100)
+        if p50 is None:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "p50_ms": round(p50 * 1000, 2),
+            "p99_ms": round(p99 * 1000, 2),
+            "max_ms": round(p100 * 1000, 2)
+        }
+
+
+def timed(stats):
+    """Fonksiyonun her çağrısının süresini stats'a kaydeden dekoratör."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stats.record(time.perf_counter() - started)
+        return wrapper
+    return decorator
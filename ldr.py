@@ -1,4 +1,7 @@
+import math
+import threading
 import time
+from array import array
 import RPi.GPIO as GPIO
 
 GPIO.setwarnings(False)
@@ -6,22 +9,50 @@ GPIO.setwarnings(False)
 LDR_PIN = 5
 GPIO_MODE_SET = False
 
+# Ölçüm modları
+MODE_LOOP = "loop"  # Döngü sayacı ile (CPU hızına bağlı)
+MODE_EDGE = "edge"  # GPIO kenar algılama ve nanosaniye saat ile
+# Kenar modu MIN_RC_NS/MAX_RC_NS kalibre edildikten sonra seçilmeli (bkz. README)
+MEASURE_MODE = MODE_LOOP
+
+# Kondansatörün boşaltılması için beklenen süre (saniye)
+DISCHARGE_TIME = 0.1
+
 # Senin ölçtüğün değerlere göre kalibrasyon
 MIN_RAW = 5       # Çok aydınlıkta ölçülen minimum değer
 MAX_RAW = 1000    # Tam karanlıkta ölçülen maksimum değer
 
+# Çoklu örnekleme (burst) ayarları
+BURST_SAMPLES = 7             # Bir okumadaki en fazla örnek sayısı
+BURST_BUDGET = 0.25           # Bir okuma için en fazla süre (saniye)
+BURST_DISCHARGE_TIME = 0.02   # Burst içindeki örnekler arası boşaltma süresi
+TRIM_RATIO = 0.2              # Her iki uçtan atılacak örnek oranı
+
+# Kenar modu kalibrasyonu (nanosaniye cinsinden RC dolma süresi). Bu değerler
+# yer tutucudur; devreye göre "python ldr.py" çıktısından ölçülüp girilmelidir
+MIN_RC_NS = 10_000       # Çok aydınlıkta ölçülen minimum süre
+MAX_RC_NS = 2_000_000    # Tam karanlıkta ölçülen maksimum süre (zaman aşımı)
+
 def gpio_init():
     global GPIO_MODE_SET
     if not GPIO_MODE_SET:
         GPIO.setmode(GPIO.BOARD)
         GPIO_MODE_SET = True
 
-def rc_time(pin):
-    reading = 0
+# Burst örnekleri için önceden ayrılmış tampon ve onu koruyan kilit
+burst_buffer = array('f', bytes(4 * BURST_SAMPLES))
+burst_lock = threading.Lock()
 
+def discharge(pin, duration=None):
+    """Kondansatörü boşalt."""
     GPIO.setup(pin, GPIO.OUT)
     GPIO.output(pin, GPIO.LOW)
-    time.sleep(0.1)
+    time.sleep(DISCHARGE_TIME if duration is None else duration)
+
+def rc_time(pin, discharge_time=None):
+    reading = 0
+
+    discharge(pin, discharge_time)
 
     GPIO.setup(pin, GPIO.IN)
     while GPIO.input(pin) == GPIO.LOW:
@@ -30,28 +61,122 @@ def rc_time(pin):
             break
     return reading
 
+def rc_time_ns(pin, timeout_ns=MAX_RC_NS, discharge_time=None):
+    """
+    Kondansatörün dolma süresini nanosaniye cinsinden ölçer.
+    Döngü yerine yükselen kenar algılamasını bekler; bekleme sırasında CPU
+    kullanılmaz. Zaman aşımında timeout_ns döner.
+    """
+    discharge(pin, discharge_time)
+
+    edge_time = []
+    edge = threading.Event()
+
+    def on_edge(channel):
+        if not edge_time:
+            edge_time.append(time.perf_counter_ns())
+        edge.set()
+
+    start = time.perf_counter_ns()
+    GPIO.setup(pin, GPIO.IN)
+    GPIO.add_event_detect(pin, GPIO.RISING, callback=on_edge)
+    try:
+        # Pin kenar algılama kurulmadan önce HIGH olmuş olabilir (çok aydınlık);
+        # kurulduktan sonra LOW görülürse sonraki yükselen kenar kaçırılmaz
+        if GPIO.input(pin) == GPIO.HIGH and not edge_time:
+            return min(time.perf_counter_ns() - start, timeout_ns)
+
+        if edge.wait(timeout_ns / 1e9):
+            return min(edge_time[0] - start, timeout_ns)
+
+        # Zaman aşımı; pin yine de HIGH ise kenar sınırda gerçekleşmiştir
+        if GPIO.input(pin) == GPIO.HIGH:
+            return min(time.perf_counter_ns() - start, timeout_ns)
+        return timeout_ns
+    finally:
+        GPIO.remove_event_detect(pin)
+
+def normalize(raw, min_raw, max_raw):
+    """Ham değeri 0–1000 arası göreli lux değerine çevir."""
+    # Sınırlandır: ölçüm aralığı dışında kalan değerleri kes
+    raw = max(min_raw, min(raw, max_raw))
+
+    # Normalize et: (max_raw - raw) doğrudan orantı sağlar
+    lux = (max_raw - raw) / (max_raw - min_raw) * 1000
+    return float(int(lux))
+
 def get_lux():
     """
     Ölçülen RC zamanını normalize ederek 0–1000 arası göreli bir lux değeri döndürür.
     Işık arttıkça değer artar.
     """
     gpio_init()
-    raw = rc_time(LDR_PIN)
+    if MEASURE_MODE == MODE_EDGE:
+        return normalize(rc_time_ns(LDR_PIN), MIN_RC_NS, MAX_RC_NS)
+    return normalize(rc_time(LDR_PIN), MIN_RAW, MAX_RAW)
 
-    # Sınırlandır: ölçüm aralığı dışında kalan değerleri kes
-    raw = max(MIN_RAW, min(raw, MAX_RAW))
+def read_lux(discharge_time=None):
+    """Tek bir örnek al ve lux değerine çevir."""
+    if MEASURE_MODE == MODE_EDGE:
+        return normalize(rc_time_ns(LDR_PIN, discharge_time=discharge_time), MIN_RC_NS, MAX_RC_NS)
+    return normalize(rc_time(LDR_PIN, discharge_time), MIN_RAW, MAX_RAW)
+
+def get_lux_filtered(samples=BURST_SAMPLES, budget=BURST_BUDGET):
+    """
+    Süre bütçesi içinde birden fazla örnek alır, uçlardaki örnekleri atarak
+    ortalamasını alır (trimmed mean). (lux, sapma) döndürür; sapma, kalan
+    örneklerin lux cinsinden standart sapmasıdır ve okuma kalitesini gösterir.
+    """
+    gpio_init()
+    samples = max(1, min(samples, BURST_SAMPLES))
+
+    # Bir örneğin en kötü durumdaki maliyeti: boşaltma + tam karanlıkta dolma
+    if MEASURE_MODE == MODE_EDGE:
+        sample_cost = BURST_DISCHARGE_TIME + MAX_RC_NS / 1e9
+    else:
+        sample_cost = BURST_DISCHARGE_TIME
+
+    with burst_lock:
+        buffer = burst_buffer
+        deadline = time.monotonic() + budget
+        count = 0
+        while count < samples:
+            # İlk örnek her zaman alınır, sonrakiler bütçeye sığarsa
+            if count and time.monotonic() + sample_cost > deadline:
+                break
+            value = read_lux(BURST_DISCHARGE_TIME)
+
+            # Sıralı ekleme (insertion sort): tampon her zaman sıralı kalır
+            i = count
+            while i > 0 and buffer[i - 1] > value:
+                buffer[i] = buffer[i - 1]
+                i -= 1
+            buffer[i] = value
+            count += 1
+
+        # Uçlardaki örnekleri at, kalanların ortalamasını ve sapmasını al
+        trim = int(count * TRIM_RATIO)
+        first, last = trim, count - trim
+        kept = last - first
+        total = 0.0
+        for i in range(first, last):
+            total += buffer[i]
+        mean = total / kept
+        variance = 0.0
+        for i in range(first, last):
+            variance += (buffer[i] - mean) ** 2
+        spread = math.sqrt(variance / kept)
 
-    # Normalize et: (MAX_RAW - raw) doğrudan orantı sağlar
-    lux = (MAX_RAW - raw) / (MAX_RAW - MIN_RAW) * 1000
-    lux = float(int(lux))
-    return lux
+    return float(int(mean)), spread
 
 # Test döngüsü (doğrudan çalıştırıldığında)
 if __name__ == "__main__":
     try:
         while True:
-            lux = get_lux()
-            print(f"Tahmini ışık şiddeti: {lux:.2f}")
+            lux, spread = get_lux_filtered()
+            print(f"Tahmini ışık şiddeti: {lux:.2f} (±{spread:.2f})")
+            # Kalibrasyon için ham değerler (MIN_RAW/MAX_RAW ve MIN_RC_NS/MAX_RC_NS)
+            print(f"Döngü sayısı: {rc_time(LDR_PIN)}  RC süresi: {rc_time_ns(LDR_PIN) / 1000:.1f} µs")
             time.sleep(1)
     except KeyboardInterrupt:
         print("Program sonlandırıldı.")
@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+
+from telegram.error import BadRequest, NetworkError, RetryAfter, Unauthorized
+
+logger = logging.getLogger(__name__)
+
+# Telegram'ın önerdiği sınırlar: tüm sohbetlere toplam ~30 mesaj/saniye,
+# aynı sohbete ~1 mesaj/saniye (kısa patlamalara izin verilir)
+GLOBAL_RATE = 30.0
+GLOBAL_BURST = 30
+CHAT_RATE = 1.0
+CHAT_BURST = 3
+
+# Ağ hatalarında bir isteğin en fazla kaç kez deneneceği
+MAX_ATTEMPTS = 3
+
+
+class TokenBucket:
+    """Saniyede rate jeton dolan, en fazla capacity jeton tutan kova."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _fill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        """Bir jeton için beklenmesi gereken süre (0 ise hemen alınabilir)."""
+        self._fill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._fill(now)
+        self.tokens -= 1
+
+
+class Outbox:
+    """Bot API'ye giden istekleri hız sınırlarına uyarak gönderen kuyruk.
+
+    İstekler tek bir worker thread'inden, genel ve sohbet başına jeton
+    kovalarına göre gönderilir. Aynı mesaja bekleyen birden fazla düzenleme
+    varsa sadece en yenisi gönderilir. Telegram RetryAfter (429) döndürürse
+    tüm gönderimler istenen süre kadar durdurulur ve istek yeniden denenir;
+    sadece kalıcı hatalar (mesaj silinmiş, bot engellenmiş vb.) on_error ile
+    bildirilir. Gönderilen isteğin sonucu (ör. yeni mesaj) on_sent ile alınabilir.
+    """
+
+    def __init__(self, bot=None, global_rate=GLOBAL_RATE, global_burst=GLOBAL_BURST,
+                 chat_rate=CHAT_RATE, chat_burst=CHAT_BURST):
+        self.bot = bot
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.chat_buckets = {}
+
+        # Sohbet başına sıradaki istek anahtarları; düzenlemelerin anahtarı
+        # ("edit", chat_id, message_id), diğerlerininki benzersizdir
+        self.queues = {}
+        self.requests = {}  # anahtar: (fonksiyon, args, kwargs, on_error, on_sent, deneme sayısı)
+        self.ready = OrderedDict()  # Bekleyen isteği olan sohbetler (sıra adil olsun diye)
+        self.paused_until = 0.0
+
+        self.sent_count = 0
+        self.coalesced_count = 0
+        self.retry_after_count = 0
+        self.failed_count = 0
+
+        self._ids = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        """Worker thread'ini başlat."""
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Worker thread'ini durdur; bekleyen istekler gönderilmez."""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self):
+        """Gönderim istatistikleri."""
+        with self._condition:
+            return {
+                "pending": len(self.requests),
+                "sent": self.sent_count,
+                "coalesced": self.coalesced_count,
+                "retry_after": self.retry_after_count,
+                "failed": self.failed_count
+            }
+
+    def edit(self, chat_id, message_id, text, reply_markup=None, on_error=None):
+        """Mesaj düzenlemesini kuyruğa al; aynı mesajın bekleyen düzenlemesinin yerine geçer."""
+        self._put(
+            ("edit", chat_id, message_id), chat_id, self.bot.edit_message_text,
+            (), {"chat_id": chat_id, "message_id": message_id, "text": text, "reply_markup": reply_markup},
+            on_error
+        )
+
+    def send(self, chat_id, text, reply_markup=None, on_error=None, on_sent=None):
+        """Yeni mesaj gönderimini kuyruğa al; on_sent gönderilen mesajla çağrılır."""
+        self._put(
+            ("call", next(self._ids)), chat_id, self.bot.send_message,
+            (), {"chat_id": chat_id, "text": text, "reply_markup": reply_markup},
+            on_error, on_sent
+        )
+
+    def call(self, chat_id, function, *args, on_error=None, on_sent=None, **kwargs):
+        """Sohbete ait herhangi bir Bot API çağrısını kuyruğa al."""
+        self._put(("call", next(self._ids)), chat_id, function, args, kwargs, on_error, on_sent)
+
+    def _put(self, key, chat_id, function, args, kwargs, on_error, on_sent=None):
+        with self._condition:
+            if key in self.requests:
+                # Henüz gönderilmemiş eski düzenlemeyi yenisiyle değiştir
+                self.coalesced_count += 1
+            else:
+                self.queues.setdefault(chat_id, deque()).append(key)
+                self.ready[chat_id] = None
+            self.requests[key] = (function, args, kwargs, on_error, on_sent, 0)
+            self._condition.notify()
+
+    def _chat_bucket(self, chat_id):
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self.chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    def _next_locked(self, now):
+        """Gönderilebilecek ilk isteği ya da (None, beklenecek süre) döndür."""
+        if now < self.paused_until:
+            return None, self.paused_until - now
+        wait = self.global_bucket.wait_time(now)
+        if wait:
+            return None, wait
+
+        wait = None
+        for chat_id in self.ready:
+            chat_wait = self._chat_bucket(chat_id).wait_time(now)
+            if chat_wait == 0:
+                break
+            wait = chat_wait if wait is None else min(wait, chat_wait)
+        else:
+            return None, wait
+
+        key = self.queues[chat_id].popleft()
+        if not self.queues[chat_id]:
+            del self.queues[chat_id]
+            del self.ready[chat_id]
+        else:
+            # Sıradaki sohbetlere öncelik ver
+            self.ready.move_to_end(chat_id)
+        self.global_bucket.take(now)
+        self._chat_bucket(chat_id).take(now)
+        return (key, chat_id, self.requests.pop(key)), 0.0
+
+    def _requeue_locked(self, key, chat_id, request):
+        """Gönderilemeyen isteği sohbetin sırasının başına geri koy."""
+        if key in self.requests:
+            # Bu arada daha yeni bir düzenleme gelmiş, eskisine gerek yok
+            return
+        self.requests[key] = request
+        self.queues.setdefault(chat_id, deque()).appendleft(key)
+        self.ready[chat_id] = None
+        self.ready.move_to_end(chat_id, last=False)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if not self._running:
+                        return
+                    item, wait = self._next_locked(time.monotonic())
+                    if item is not None:
+                        break
+                    self._condition.wait(wait)
+            self._send(*item)
+
+    def _send(self, key, chat_id, request):
+        function, args, kwargs, on_error, on_sent, attempts = request
+        try:
+            result = function(*args, **kwargs)
+            with self._condition:
+                self.sent_count += 1
+        except RetryAfter as e:
+            # Flood kontrolü: tüm gönderimleri durdur, isteği kaybetmeden tekrar dene
+            logger.warning(f"Telegram hız sınırı: {e.retry_after} saniye bekleniyor.")
+            with self._condition:
+                self.retry_after_count += 1
+                self.paused_until = max(self.paused_until, time.monotonic() + e.retry_after)
+                self._requeue_locked(key, chat_id, request)
+        except BadRequest as e:
+            if "not modified" in str(e).lower():
+                # Mesaj zaten aynı içerikte; hata değil
+                return
+            self._fail(chat_id, on_error, e)
+        except Unauthorized as e:
+            self._fail(chat_id, on_error, e)
+        except NetworkError as e:
+            if attempts + 1 >= MAX_ATTEMPTS:
+                self._fail(chat_id, on_error, e)
+                return
+            logger.warning(f"Chat ID {chat_id} için gönderim hatası, tekrar denenecek: {e}")
+            with self._condition:
+                self._requeue_locked(key, chat_id, (function, args, kwargs, on_error, on_sent, attempts + 1))
+        except Exception as e:
+            self._fail(chat_id, on_error, e)
+        else:
+            if on_sent is not None:
+                try:
+                    on_sent(result)
+                except Exception as e:
+                    logger.error(f"Gönderim sonrası işleyici hatası: {e}")
+
+    def _fail(self, chat_id, on_error, error):
+        with self._condition:
+            self.failed_count += 1
+        logger.error(f"Chat ID {chat_id} için gönderim başarısız: {error}")
+        if on_error is not None:
+            try:
+                on_error(chat_id, error)
+            except Exception as e:
+                logger.error(f"Gönderim hata işleyicisi hatası: {e}")
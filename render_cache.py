@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import threading
+
+
+class VersionedValue:
+    """Sürüm anahtarı değişmedikçe aynı değeri döndüren tek girişli önbellek.
+
+    Anahtar None ise değer her seferinde yeniden oluşturulur ve saklanmaz
+    (ör. sürümü bilinmeyen veriler için).
+    """
+
+    def __init__(self):
+        self._key = None
+        self._value = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        """key için saklanan değeri döndür; yoksa build() ile oluşturup sakla."""
+        if key is not None:
+            with self._lock:
+                if self._key == key:
+                    self.hits += 1
+                    return self._value
+
+        value = build()
+        with self._lock:
+            self.misses += 1
+            if key is not None:
+                self._key = key
+                self._value = value
+        return value
+
+
+class FragmentCache:
+    """Liste elemanlarının render edilmiş parçalarını kararlı bir anahtara göre tutan önbellek.
+
+    Anahtar key(nesne) ile hesaplanır (ör. koşul kimliği). Koşul deposu
+    değişmeyen koşul sözlüklerini yeni listelere aynen taşır, değişenler için
+    yeni sözlük oluşturur; girişte nesnenin kendisi de tutulduğundan aynı
+    anahtarlı değişmiş bir nesne yeniden render edilir. Böylece sürüm
+    değiştiğinde sadece yeni (ya da değişmiş) elemanlar render edilir;
+    listeden çıkan elemanların parçaları unutulur. Giriş sayısı max_entries
+    ile sınırlıdır, sınır aşılınca en eski girişler eklemede atılır.
+    """
+
+    def __init__(self, render, key, max_entries=4096):
+        self.render = render
+        self.key = key
+        self.max_entries = max_entries
+        self._version = None
+        self._fragments = ()
+        self._entries = {}  # anahtar: (nesne, parça), eklenme sırasıyla
+        self._lock = threading.Lock()
+
+        self.rendered = 0  # Toplam render edilen parça sayısı
+
+    def _fragment_locked(self, key, obj):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is obj:
+            return entry[1]
+        fragment = self.render(obj)
+        self.rendered += 1
+        # Aynı anahtarın eski girişi en yeni olarak yeniden eklenir
+        self._entries.pop(key, None)
+        self._entries[key] = (obj, fragment)
+        return fragment
+
+    def get(self, obj):
+        """Tek bir nesnenin parçasını döndür (ör. sadece görünen sayfadaki koşullar için)."""
+        with self._lock:
+            fragment = self._fragment_locked(self.key(obj), obj)
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            return fragment
+
+    def render_all(self, version, objects):
+        """Nesnelerin parçalarını sırayla (demet olarak) döndür."""
+        with self._lock:
+            if version is not None and version == self._version:
+                return self._fragments
+
+            keys = [self.key(obj) for obj in objects]
+            fragments = tuple(self._fragment_locked(key, obj) for key, obj in zip(keys, objects))
+
+            if version is not None:
+                self._version = version
+                self._fragments = fragments
+                # Sadece listede kalan elemanların girişleri tutulur
+                self._entries = {key: self._entries[key] for key in keys}
+            return fragments
@@ -2,17 +2,43 @@
 # -*- coding: utf-8 -*-
 
 import os
-import json
 import sys
 
+import stores
+
 # Dosya isimleri
 VERIFIED_USERS_FILE = "verified_users.json"
 CONDITIONS_FILE = "conditions.json"
 
+# Depoların değişiklik günlükleri (stores.journal_path ile aynı adlandırma)
+JOURNAL_FILES = [stores.journal_path(VERIFIED_USERS_FILE), stores.journal_path(CONDITIONS_FILE)]
+
+def last_journal_seq(path):
+    """Günlükteki en büyük sıra numarası (günlük yoksa 0)."""
+    return max((entry.get("seq", 0) for entry in stores.Journal(path).read()), default=0)
+
 def reset_all():
     """Tüm bot verilerini sıfırla."""
     print("Bot sıfırlama işlemi başlatılıyor...")
     
+    # Koşul günlüğünün son sıra numarası; yeni anlık görüntü bu numarayla
+    # yazılır, böylece eski günlük kayıtları hiçbir zaman yeniden oynatılmaz
+    try:
+        journal_seq = last_journal_seq(stores.journal_path(CONDITIONS_FILE))
+    except Exception as e:
+        print(f"❌ {stores.journal_path(CONDITIONS_FILE)} okunurken hata: {e}")
+        journal_seq = 0
+    
+    # Önce değişiklik günlüklerini sil: anlık görüntüler yazılırken çalışan bot
+    # dosya değişikliğini görüp eski günlüğü yeni görüntünün üzerine oynatmasın
+    for journal_file in JOURNAL_FILES:
+        try:
+            if os.path.exists(journal_file):
+                os.remove(journal_file)
+                print(f"✅ {journal_file} dosyası silindi.")
+        except Exception as e:
+            print(f"❌ {journal_file} dosyası silinirken hata: {e}")
+    
     # Onaylanmış kullanıcıları sıfırla
     try:
         if os.path.exists(VERIFIED_USERS_FILE):
@@ -23,18 +49,15 @@ def reset_all():
     except Exception as e:
         print(f"❌ {VERIFIED_USERS_FILE} dosyası silinirken hata: {e}")
     
-    # Koşulları sıfırla
+    # Koşulları tamamen silmek yerine boş liste olarak kaydet
     try:
-        if os.path.exists(CONDITIONS_FILE):
-            # Koşulları tamamen silmek yerine boş liste olarak kaydet
-            with open(CONDITIONS_FILE, 'w') as file:
-                json.dump({"on_conditions": [], "off_conditions": []}, file, indent=4)
-            print(f"✅ {CONDITIONS_FILE} dosyası sıfırlandı.")
-        else:
-            # Dosya yoksa yeni oluştur
-            with open(CONDITIONS_FILE, 'w') as file:
-                json.dump({"on_conditions": [], "off_conditions": []}, file, indent=4)
-            print(f"✅ {CONDITIONS_FILE} dosyası oluşturuldu.")
+        existed = os.path.exists(CONDITIONS_FILE)
+        stores.atomic_write_json(CONDITIONS_FILE, {
+            "on_conditions": [],
+            "off_conditions": [],
+            "journal_seq": journal_seq
+        }, indent=4)
+        print(f"✅ {CONDITIONS_FILE} dosyası {'sıfırlandı' if existed else 'oluşturuldu'}.")
     except Exception as e:
         print(f"❌ {CONDITIONS_FILE} dosyası sıfırlanırken hata: {e}")
     
@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import heapq
+import operator
+import threading
+from bisect import bisect_left, bisect_right
+
+# Koşul operatörlerinin karşılık geldiği karşılaştırma fonksiyonları
+OPERATOR_FUNCTIONS = {
+    ">": operator.gt,
+    "<": operator.lt,
+    "=": operator.eq,
+    ">=": operator.ge,
+    "<=": operator.le
+}
+
+# Zincirdeki bağlaç kodları
+JOIN_AND = 0
+JOIN_OR = 1
+JOIN_SKIP = 2  # Bilinmeyen bağlaç: sonucu değiştirmez
+
+JOIN_CODES = {
+    "AND": JOIN_AND,
+    "OR": JOIN_OR
+}
+
+
+def _never(sensor_value, value):
+    return False
+
+
+def check_single_condition(condition, sensor_data):
+    """Tek bir koşulu değerlendir."""
+    # Koşul pasifse False döndür
+    if not condition.get('state', True):
+        return False
+
+    function = OPERATOR_FUNCTIONS.get(condition['operator'], _never)
+    return function(sensor_data[condition['type']], condition['value'])
+
+
+class CompiledChain:
+    """Bir koşul zincirinin düz, slot tabanlı derlenmiş hali.
+
+    Her koşul i için sensors[i], functions[i], values[i] ve active[i] tutulur.
+    joins[i], i. koşulu zincire bağlayan bağlaçtır (i >= 1). Zincir,
+    bağlacı "NONE" olan ilk koşulda biter; length zincire giren koşul sayısıdır.
+    """
+
+    __slots__ = ("sensors", "functions", "values", "active", "joins", "length")
+
+    def __init__(self, conditions):
+        self.sensors = tuple(condition["type"] for condition in conditions)
+        self.functions = tuple(OPERATOR_FUNCTIONS.get(condition["operator"], _never) for condition in conditions)
+        self.values = tuple(condition["value"] for condition in conditions)
+        self.active = tuple(bool(condition.get("state", True)) for condition in conditions)
+
+        joins = [JOIN_SKIP]
+        length = len(conditions)
+        for i in range(1, len(conditions)):
+            logical = conditions[i - 1].get("logical", "NONE")
+            if logical == "NONE":
+                length = i
+                break
+            joins.append(JOIN_CODES.get(logical, JOIN_SKIP))
+        self.joins = tuple(joins)
+        self.length = length
+
+    def evaluate(self, sensor_data):
+        """(zincir sonucu, koşul bayrakları) döndür.
+
+        Bayraklar her koşul için True/False, pasif koşullar için None'dır.
+        """
+        flags = [None] * len(self.sensors)
+        for i, sensor in enumerate(self.sensors):
+            if self.active[i]:
+                flags[i] = self.functions[i](sensor_data[sensor], self.values[i])
+        return self.fold(flags), flags
+
+    def fold(self, flags):
+        """Koşul bayraklarını bağlaçlarla soldan sağa birleştir."""
+        if not self.length:
+            return False
+
+        result = flags[0] is True
+        joins = self.joins
+        for i in range(1, self.length):
+            join = joins[i]
+            if join == JOIN_AND:
+                result = result and flags[i] is True
+            elif join == JOIN_OR:
+                result = result or flags[i] is True
+        return result
+
+
+class CompiledPlan:
+    """Çalıştırma ve durdurma zincirlerinin derlenmiş hali."""
+
+    __slots__ = ("version", "on_chain", "off_chain", "_indexes")
+
+    def __init__(self, version, on_conditions, off_conditions):
+        self.version = version
+        self.on_chain = CompiledChain(on_conditions)
+        self.off_chain = CompiledChain(off_conditions)
+        self._indexes = None
+
+    def near_threshold(self, sensor_data, bands):
+        """Aktif bir koşulun eşiği sensör değerine bands[sensor] kadar yakın mı."""
+        if self._indexes is None:
+            # Eşik indeksleri ilk ihtiyaçta kurulur
+            self._indexes = (ThresholdIndex(self.on_chain), ThresholdIndex(self.off_chain))
+        for index in self._indexes:
+            for sensor in index.sensors():
+                band = bands.get(sensor)
+                if band is None:
+                    continue
+                value = sensor_data[sensor]
+                if index.between(sensor, value - band, value + band):
+                    return True
+        return False
+
+
+class ThresholdIndex:
+    """Her sensör için koşul eşiklerinin sıralı indeksi.
+
+    Tüm operatörler eşik değerinde basamak yapan fonksiyonlardır; bu yüzden
+    sensör değeri önceki değerden yenisine geçerken sonucu değişebilecek
+    koşullar sadece eşiği [min, max] aralığında kalanlardır. Bu koşullar
+    bisect ile O(log n + k) sürede bulunur.
+    """
+
+    def __init__(self, chain):
+        by_sensor = {}
+        for i, sensor in enumerate(chain.sensors):
+            if chain.active[i]:
+                by_sensor.setdefault(sensor, []).append((chain.values[i], i))
+
+        self.thresholds = {}
+        self.indices = {}
+        for sensor, pairs in by_sensor.items():
+            pairs.sort()
+            self.thresholds[sensor] = [value for value, _ in pairs]
+            self.indices[sensor] = [index for _, index in pairs]
+
+    def sensors(self):
+        return self.thresholds.keys()
+
+    def all(self, sensor):
+        """Sensöre bağlı tüm koşulların indeksleri."""
+        return self.indices[sensor]
+
+    def between(self, sensor, previous, current):
+        """Sonucu previous -> current geçişinde değişebilecek koşulların indeksleri."""
+        low, high = (previous, current) if previous <= current else (current, previous)
+        thresholds = self.thresholds[sensor]
+        return self.indices[sensor][bisect_left(thresholds, low):bisect_right(thresholds, high)]
+
+
+class IncrementalChain:
+    """Sensöre göre indekslenmiş, artımlı değerlendirilen koşul zinciri.
+
+    Her koşulun son sonucu saklanır. Yeni bir örnekte sadece değeri değişen
+    sensörlerin, eşiği eski ve yeni değer arasında kalan koşulları yeniden
+    kontrol edilir (ThresholdIndex).
+
+    Zincir sonucu da artımlı tutulur: soldan sağa birleştirmede sonucu
+    geçmişten bağımsız olarak belirleyen "sıfırlama" konumları vardır
+    (ilk koşul, sağlanmayan AND koşulu, sağlanan OR koşulu). Sonuç, son
+    sıfırlama konumundaki koşulun sonucudur; bu konumlar bir yığında
+    (heap) tutulur, böylece bir koşul değiştiğinde O(log n) iş yapılır.
+    """
+
+    def __init__(self, chain):
+        self.chain = chain
+        self.index = ThresholdIndex(chain)
+        self.flags = [None] * len(chain.sensors)
+        self.last_values = {}
+
+        self.is_reset = [self._is_reset(i) for i in range(chain.length)]
+        self.resets = [-i for i in range(chain.length) if self.is_reset[i]]
+        heapq.heapify(self.resets)
+        self.result = self._result()
+
+    def _is_reset(self, i):
+        if i == 0:
+            return True
+        join = self.chain.joins[i]
+        satisfied = self.flags[i] is True
+        return (join == JOIN_AND and not satisfied) or (join == JOIN_OR and satisfied)
+
+    def _result(self):
+        resets = self.resets
+        # Artık sıfırlama olmayan (eskimiş) kayıtları at
+        while resets and not self.is_reset[-resets[0]]:
+            heapq.heappop(resets)
+        if not resets:
+            return False
+        return self.flags[-resets[0]] is True
+
+    def _flip(self, i):
+        if i >= self.chain.length:
+            return
+        is_reset = self._is_reset(i)
+        if is_reset != self.is_reset[i]:
+            self.is_reset[i] = is_reset
+            if is_reset:
+                heapq.heappush(self.resets, -i)
+
+    def update(self, sensor_data, stale=()):
+        """Yeni örneği uygula; (zincir sonucu, koşul bayrakları) döndür.
+
+        stale içindeki sensörlerin değerleri kullanılmaz; bu sensörlere bağlı
+        koşullar son sonuçlarını korur (hiç değerlendirilmemişlerse sağlanmamış
+        sayılır). Dönen bayrak listesi evaluator'a aittir, sadece okunmalıdır.
+        """
+        flipped = False
+        last_values = self.last_values
+        flags = self.flags
+        functions = self.chain.functions
+        values = self.chain.values
+
+        for sensor in self.index.sensors():
+            if sensor in stale:
+                continue
+            value = sensor_data[sensor]
+            if sensor in last_values:
+                previous = last_values[sensor]
+                if previous == value:
+                    continue
+                candidates = self.index.between(sensor, previous, value)
+            else:
+                candidates = self.index.all(sensor)
+            last_values[sensor] = value
+
+            for i in candidates:
+                satisfied = functions[i](value, values[i])
+                if satisfied != flags[i]:
+                    flags[i] = satisfied
+                    self._flip(i)
+                    flipped = True
+
+        if flipped:
+            # Yığın, eskimiş kayıtlarla büyümesin
+            if len(self.resets) > 2 * self.chain.length + 16:
+                self.resets = [-i for i in range(self.chain.length) if self.is_reset[i]]
+                heapq.heapify(self.resets)
+            self.result = self._result()
+        return self.result, flags
+
+
+class IncrementalPlan:
+    """Çalıştırma ve durdurma zincirlerinin artımlı değerlendiricileri."""
+
+    def __init__(self, plan):
+        self.version = plan.version
+        self.on_chain = IncrementalChain(plan.on_chain)
+        self.off_chain = IncrementalChain(plan.off_chain)
+        self._lock = threading.Lock()
+
+    def update(self, sensor_data, stale=()):
+        """(durmalı mı, çalışmalı mı) döndür; stale, IncrementalChain.update'teki gibidir."""
+        with self._lock:
+            should_stop, _ = self.off_chain.update(sensor_data, stale)
+            should_run, _ = self.on_chain.update(sensor_data, stale)
+        return should_stop, should_run
+
+
+# Son derlenen plan; koşul deposu sürümü değişmedikçe yeniden kullanılır
+_cached_plan = None
+
+# Kontrol döngüsünün artımlı planı; sürüm değişince yeniden kurulur
+_incremental_plan = None
+
+
+def get_plan(version, on_conditions, off_conditions):
+    """Koşul deposu sürümü için derlenmiş planı döndür (gerekirse derle)."""
+    global _cached_plan
+    plan = _cached_plan
+    if version is not None and plan is not None and plan.version == version:
+        return plan
+
+    plan = CompiledPlan(version, on_conditions, off_conditions)
+    if version is not None:
+        _cached_plan = plan
+    return plan
+
+
+def get_incremental_plan(version, on_conditions, off_conditions):
+    """Koşul deposu sürümü için artımlı planı döndür (gerekirse kur)."""
+    global _incremental_plan
+    plan = _incremental_plan
+    if version is not None and plan is not None and plan.version == version:
+        return plan
+
+    plan = IncrementalPlan(get_plan(version, on_conditions, off_conditions))
+    if version is not None:
+        _incremental_plan = plan
+    return plan
+
+
+def evaluate_condition_chain(conditions, sensor_data):
+    """Koşulları ve mantıksal bağlaçları değerlendir (önbelleksiz)."""
+    return CompiledChain(conditions).evaluate(sensor_data)[0]
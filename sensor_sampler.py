@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+import threading
+import time
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# Sensör değerlerinin değişmez (immutable) anlık görüntüsü.
+# light_spread ışık okumasının standart sapmasıdır (bilinmiyorsa None).
+# *_time alanları son başarılı okumanın time.monotonic() değeridir (yoksa None),
+# timestamp ise örneğin alındığı duvar saati zamanıdır (time.time()).
+SensorSnapshot = namedtuple("SensorSnapshot", [
+    "temperature",
+    "humidity",
+    "light",
+    "light_spread",
+    "temperature_time",
+    "humidity_time",
+    "light_time",
+    "timestamp",
+    "version",
+])
+
+# Ölçüm alanları ve son başarılı okumalarının zaman damgası alanları
+FIELD_TIMES = {
+    "temperature": "temperature_time",
+    "humidity": "humidity_time",
+    "light": "light_time",
+}
+
+# Henüz hiç okuma yapılmamışken kullanılan boş görüntü
+EMPTY_SNAPSHOT = SensorSnapshot(0.0, 0.0, 0.0, None, None, None, None, None, 0)
+
+
+class SensorSampler:
+    """Sensörlere tek başına sahip olan ve onları kendi takviminde okuyan örnekleyici.
+
+    Okunan değerler değişmez bir SensorSnapshot olarak yayınlanır; okuyucular
+    kilit beklemeden son görüntüyü bellekten alır.
+    """
+
+    def __init__(self, read_light, read_climate, interval=5.0, max_staleness=15.0):
+        # read_light() -> lux veya (lux, sapma)
+        # read_climate() -> (sıcaklık, nem) veya (sıcaklık, nem, yaş);
+        # yaş verilirse zaman damgası değerin gerçek ölçüm anına göre ayarlanır,
+        # None ise (hiç geçerli ölçüm yok) zaman damgası güncellenmez
+        self._read_light = read_light
+        self._read_climate = read_climate
+        self.interval = interval
+        self.max_staleness = max_staleness
+
+        self._snapshot = EMPTY_SNAPSHOT
+        self._last_attempt = None  # Son okuma denemesi (time.monotonic())
+        self._read_lock = threading.Lock()  # Donanıma aynı anda tek okuma
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Arka plan örnekleme thread'ini başlat."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="sensor-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Arka plan örnekleme thread'ini durdur."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Sensör örnekleme hatası: {e}")
+            self._stop_event.wait(self.interval)
+
+    def sample(self):
+        """Sensörleri şimdi oku ve yeni bir görüntü yayınla."""
+        with self._read_lock:
+            return self._sample_locked()
+
+    def _sample_locked(self):
+        self._last_attempt = time.monotonic()
+        previous = self._snapshot
+        temperature, humidity, light = previous.temperature, previous.humidity, previous.light
+        light_spread = previous.light_spread
+        temperature_time, humidity_time, light_time = (
+            previous.temperature_time, previous.humidity_time, previous.light_time
+        )
+
+        # Okuma başarısız olursa önceki değer ve zaman damgası korunur,
+        # böylece görüntünün yaşı gerçeği yansıtır.
+        try:
+            result = self._read_light()
+            if isinstance(result, tuple):
+                light, light_spread = result
+            else:
+                light, light_spread = result, None
+            light_time = time.monotonic()
+        except Exception as e:
+            logger.error(f"LDR okuma hatası: {e}")
+
+        try:
+            result = self._read_climate()
+            if result is not None:
+                temperature, humidity = result[0], result[1]
+                age = result[2] if len(result) > 2 else 0.0
+                if age is not None:
+                    temperature_time = humidity_time = time.monotonic() - age
+        except Exception as e:
+            logger.error(f"DHT11 okuma hatası: {e}")
+
+        snapshot = SensorSnapshot(
+            temperature, humidity, light, light_spread,
+            temperature_time, humidity_time, light_time,
+            time.time(), previous.version + 1
+        )
+        # Referans ataması atomiktir; okuyucular kilit almaz
+        self._snapshot = snapshot
+        return snapshot
+
+    def age(self, snapshot=None):
+        """Görüntüdeki en eski alanın yaşını saniye cinsinden döndür."""
+        if snapshot is None:
+            snapshot = self._snapshot
+        times = (snapshot.temperature_time, snapshot.humidity_time, snapshot.light_time)
+        if None in times:
+            return float("inf")
+        return time.monotonic() - min(times)
+
+    def stale_fields(self, max_age, snapshot=None):
+        """Son başarılı okuması max_age saniyeden eski ya da hiç okunmamış alanların kümesi."""
+        if snapshot is None:
+            snapshot = self._snapshot
+        now = time.monotonic()
+        return frozenset(
+            field for field, time_field in FIELD_TIMES.items()
+            if getattr(snapshot, time_field) is None or now - getattr(snapshot, time_field) > max_age
+        )
+
+    def get_snapshot(self, max_staleness=None):
+        """Son görüntüyü döndür; izin verilen yaşı aşmışsa önce taze okuma yap."""
+        limit = self.max_staleness if max_staleness is None else max_staleness
+        snapshot = self._snapshot
+        if self.age(snapshot) <= limit:
+            return snapshot
+
+        with self._read_lock:
+            # Kilidi beklerken başka bir thread okumuş olabilir
+            snapshot = self._snapshot
+            if self.age(snapshot) <= limit:
+                return snapshot
+            # Sensör veri vermiyorsa her çağrıda donanımı tekrar tekrar okuma
+            if self._last_attempt is not None and time.monotonic() - self._last_attempt < min(limit, self.interval):
+                return snapshot
+            return self._sample_locked()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import abc
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def file_signature(path):
+    """Dosyanın değişip değişmediğini anlamak için ucuz imza (stat) döndür."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def atomic_write_json(path, data, **kwargs):
+    """JSON'u geçici dosyaya yazıp yerine taşı; yarım yazılmış dosya kalmaz."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as file:
+        json.dump(data, file, **kwargs)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def journal_path(path):
+    """Depo dosyasının değişiklik günlüğünün yolu."""
+    return f"{path}.journal"
+
+
+class Journal:
+    """Sadece sona eklenen, satır başına bir JSON kaydı tutan değişiklik günlüğü.
+
+    Küçük değişiklikler tüm dosyayı yeniden yazmak yerine tek satır olarak
+    eklenir. Çökme sırasında yarım kalan son satır okunurken atılır.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = 0  # Günlükteki kayıt sayısı
+
+    def read(self):
+        """Günlükteki kayıtları sırayla döndür; yarım kalmış son satırı kes."""
+        entries = []
+        valid_bytes = 0
+        try:
+            with open(self.path, 'rb') as file:
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        break
+                    valid_bytes += len(line)
+                size = file.seek(0, os.SEEK_END)
+        except FileNotFoundError:
+            self.entries = 0
+            return entries
+
+        if size != valid_bytes:
+            # Sonraki eklemeler bozuk satıra yapışmasın diye dosyayı son sağlam satırda kes
+            logger.warning(f"{self.path} günlüğünün sonunda yarım kayıt var, atılıyor.")
+            with open(self.path, 'r+b') as file:
+                file.truncate(valid_bytes)
+        self.entries = len(entries)
+        return entries
+
+    def append(self, entry):
+        """Kaydı günlüğe ekle ve diske indiğinden emin ol."""
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(line)
+            file.flush()
+            os.fsync(file.fileno())
+        self.entries += 1
+
+    def clear(self):
+        """Günlüğü sil (anlık görüntü yazıldıktan sonra)."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.entries = 0
+
+
+class WatchedFile(abc.ABC):
+    """Bellekteki kopyası dosyayla stat imzası üzerinden eşitlenen depo tabanı.
+
+    Durum, atomik olarak yazılan bir anlık görüntü (path) ve onun üzerine
+    eklenen değişiklik günlüğünden (path + ".journal") oluşur. Günlük
+    compact_every kayda ulaşınca anlık görüntü yeniden yazılır ve günlük
+    silinir (sıkıştırma). Alt sınıflar _load ve _compact'ı tanımlar.
+    """
+
+    def __init__(self, path, check_interval=1.0, compact_every=100):
+        self.path = path
+        self.check_interval = check_interval
+        self.compact_every = compact_every
+        self.version = 0
+        self.journal = Journal(journal_path(path))
+
+        self._lock = threading.RLock()
+        self._signature = None
+        self._last_check = None
+
+    @abc.abstractmethod
+    def _load(self):
+        """Anlık görüntüyü ve günlüğü okuyup bellekteki kopyayı yeniden kur."""
+
+    @abc.abstractmethod
+    def _compact(self):
+        """Bellekteki kopyayı anlık görüntü olarak yaz ve günlüğü temizle."""
+
+    def _signature_now(self):
+        return file_signature(self.path), file_signature(self.journal.path)
+
+    def refresh(self, force=False):
+        """Dosya veya günlük dışarıdan değiştiyse yeniden yükle."""
+        now = time.monotonic()
+        if not force and self._last_check is not None and now - self._last_check < self.check_interval:
+            return
+        with self._lock:
+            self._last_check = now
+            if self.version == 0 or self._signature_now() != self._signature:
+                self._load()
+
+
+class VerifiedUserStore(WatchedFile):
+    """Doğrulanmış kullanıcıları bellekte bir küme olarak tutan depo.
+
+    Sorgular diske gitmez; yeni kullanıcı günlüğe tek satır olarak eklenir.
+    reset_bot.py dosyaları silerse stat kontrolüyle fark edilir.
+    """
+
+    def __init__(self, path, check_interval=1.0, compact_every=100):
+        super().__init__(path, check_interval, compact_every)
+        self._users = frozenset()
+
+    def _load(self):
+        users = []
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as file:
+                    users = json.load(file)
+            except json.JSONDecodeError:
+                logger.error("Doğrulanmış kullanıcılar dosyası bozuk. Yeni bir liste oluşturuluyor.")
+
+        # Kullanıcı eklemek tekrarlansa da sonucu değişmez; günlük olduğu gibi oynatılır
+        users = set(users)
+        for entry in self.journal.read():
+            if entry.get("op") == "add":
+                users.add(entry["user"])
+
+        self._users = frozenset(users)
+        self.version += 1
+        if self.journal.entries >= self.compact_every:
+            self._compact()
+        self._signature = self._signature_now()
+
+    def _compact(self):
+        atomic_write_json(self.path, sorted(self._users))
+        self.journal.clear()
+
+    def get(self):
+        """Doğrulanmış kullanıcı ID'lerinin kümesini döndür."""
+        self.refresh()
+        return self._users
+
+    def contains(self, user_id):
+        """Kullanıcı doğrulanmış mı (O(1))."""
+        self.refresh()
+        return user_id in self._users
+
+    def add(self, user_id):
+        """Kullanıcıyı ekle; yeni eklendiyse True döndür."""
+        self.refresh()
+        with self._lock:
+            if user_id in self._users:
+                return False
+            self.journal.append({"op": "add", "user": user_id})
+            self._users = self._users | {user_id}
+            self.version += 1
+            if self.journal.entries >= self.compact_every:
+                self._compact()
+            self._signature = self._signature_now()
+            return True
+
+    def replace(self, users):
+        """Tüm kullanıcı listesini değiştir ve kaydet."""
+        with self._lock:
+            self._users = frozenset(users)
+            self.version += 1
+            self._compact()
+            self._signature = self._signature_now()
+
+
+# Koşul kimliklerinin callback verisinde kullanılan kısa hali (uuid'nin ilk karakterleri)
+HANDLE_LENGTH = 8
+
+
+def apply_condition_change(entry, on_conditions, off_conditions, position=None):
+    """Günlük kaydını koşul listelerine uygula; liste değiştiyse True döndür.
+
+    Listeler yerinde değiştirilir, içindeki sözlükler değiştirilmez.
+    position koşulun listedeki muhtemel sırasıdır; doğruysa liste taranmaz.
+    """
+    target = on_conditions if entry["type"] == "on" else off_conditions
+    op = entry["op"]
+    if op == "add":
+        target.append(dict(entry["condition"]))
+        return True
+
+    if position is None or position >= len(target) or target[position]["id"] != entry["id"]:
+        position = next((index for index, condition in enumerate(target) if condition["id"] == entry["id"]), None)
+        if position is None:
+            return False
+
+    if op == "delete":
+        del target[position]
+    elif op == "toggle":
+        condition = dict(target[position])
+        condition["state"] = not condition.get("state", True)
+        target[position] = condition
+    else:
+        return False
+    return True
+
+
+class ConditionStore(WatchedFile):
+    """Koşulları bellekte tutan, süreç genelinde tek koşul deposu.
+
+    Dosya bir kez yüklenir, okumalar bellekten yapılır. Ekleme, silme ve
+    aktif/pasif değişiklikleri günlüğe sıra numarasıyla eklenir; anlık
+    görüntü hangi sıra numarasına kadar olan değişiklikleri içerdiğini
+    "journal_seq" alanında saklar. Açılışta anlık görüntünün üzerine
+    günlüğün sadece daha yeni kayıtları oynatılır; böylece sıkıştırma
+    sırasında çökülse bile değişiklik iki kez uygulanmaz.
+
+    Her değişiklikte version artar; bot dışından (ör. reset_bot.py) yapılan
+    değişiklikler en fazla check_interval saniyede bir yapılan stat
+    kontrolüyle yakalanır. Listeler değiştirilmez, her değişiklikte yenileri
+    oluşturulur; bu yüzden get() ile alınan demetler güvenle okunabilir.
+    """
+
+    def __init__(self, path, check_interval=1.0, compact_every=100):
+        super().__init__(path, check_interval, compact_every)
+        self._on_conditions = ()
+        self._off_conditions = ()
+        self._positions = {}  # id: (tür, listedeki sıra)
+        self._handles = {}  # kısa kimlik: koşul kimliği (birden fazla koşulla çakışıyorsa None)
+        self._seq = 0  # Uygulanan son günlük kaydının sıra numarası
+
+    def _load(self):
+        on_conditions, off_conditions = [], []
+        seq = 0
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as file:
+                    conditions = json.load(file)
+                    on_conditions = conditions.get("on_conditions", [])
+                    off_conditions = conditions.get("off_conditions", [])
+                    seq = conditions.get("journal_seq", 0)
+            except json.JSONDecodeError:
+                logger.error("Koşullar dosyası bozuk. Yeni bir liste oluşturuluyor.")
+
+        # Anlık görüntüye henüz girmemiş değişiklikleri oynat
+        for entry in self.journal.read():
+            if entry.get("seq", 0) > seq:
+                apply_condition_change(entry, on_conditions, off_conditions)
+                seq = entry["seq"]
+
+        self._seq = seq
+        self._set(on_conditions, off_conditions)
+        if self.journal.entries >= self.compact_every:
+            self._compact()
+        self._signature = self._signature_now()
+
+    def _compact(self):
+        atomic_write_json(self.path, {
+            "on_conditions": list(self._on_conditions),
+            "off_conditions": list(self._off_conditions),
+            "journal_seq": self._seq
+        }, indent=4)
+        self.journal.clear()
+
+    def _set(self, on_conditions, off_conditions):
+        self._on_conditions = tuple(on_conditions)
+        self._off_conditions = tuple(off_conditions)
+
+        # Kimlikten koşula ve kısa kimlikten kimliğe O(1) erişim için dizinler
+        positions = {}
+        handles = {}
+        for condition_type, conditions in (("on", self._on_conditions), ("off", self._off_conditions)):
+            for index, condition in enumerate(conditions):
+                positions[condition["id"]] = (condition_type, index)
+                prefix = condition["id"][:HANDLE_LENGTH]
+                handles[prefix] = None if prefix in handles else condition["id"]
+        self._positions = positions
+        self._handles = handles
+        self.version += 1
+
+    def get(self):
+        """(çalıştırma, durdurma) koşul demetlerini döndür."""
+        _, on_conditions, off_conditions = self.get_versioned()
+        return on_conditions, off_conditions
+
+    def get_versioned(self):
+        """(version, çalıştırma, durdurma) üçlüsünü tutarlı biçimde döndür."""
+        self.refresh()
+        with self._lock:
+            return self.version, self._on_conditions, self._off_conditions
+
+    def locate(self, condition_id):
+        """Koşulu kimliğiyle bul: (version, tür, sıra, koşul) ya da bulunamazsa None.
+
+        Listeler taranmaz; dizin her değişiklikte güncellenir.
+        """
+        self.refresh()
+        with self._lock:
+            position = self._positions.get(condition_id)
+            if position is None:
+                return None
+            condition_type, index = position
+            conditions = self._on_conditions if condition_type == "on" else self._off_conditions
+            return self.version, condition_type, index, conditions[index]
+
+    def handle(self, condition_id):
+        """Callback verisi için koşulun kısa kimliğini döndür.
+
+        Kısa kimlik kimliğin ilk HANDLE_LENGTH karakteridir; başka bir koşulla
+        çakışıyorsa kimliğin tamamı kullanılır.
+        """
+        with self._lock:
+            prefix = condition_id[:HANDLE_LENGTH]
+            return prefix if self._handles.get(prefix) == condition_id else condition_id
+
+    def resolve(self, handle):
+        """Kısa kimliği (ya da tam kimliği) koşul kimliğine çevir; bulunamazsa None."""
+        self.refresh()
+        with self._lock:
+            if handle in self._positions:
+                return handle
+            return self._handles.get(handle)
+
+    def replace(self, on_conditions, off_conditions):
+        """Tüm koşulları verilen listelerle değiştir ve anlık görüntüyü yaz."""
+        with self._lock:
+            self._set(on_conditions, off_conditions)
+            self._compact()
+            self._signature = self._signature_now()
+
+    def _change(self, entry):
+        """Değişikliği bellekte uygula, uygulandıysa günlüğe ekle."""
+        self.refresh()
+        with self._lock:
+            on_conditions, off_conditions = list(self._on_conditions), list(self._off_conditions)
+            _, position = self._positions.get(entry.get("id"), (None, None))
+            if not apply_condition_change(entry, on_conditions, off_conditions, position):
+                return False
+
+            entry["seq"] = self._seq + 1
+            self.journal.append(entry)
+            self._seq = entry["seq"]
+            self._set(on_conditions, off_conditions)
+            if self.journal.entries >= self.compact_every:
+                self._compact()
+            # Kendi yazdığımız değişikliği dış değişiklik sanmamak için imzayı güncelle
+            self._signature = self._signature_now()
+            return True
+
+    def add_condition(self, condition_type, condition):
+        """Koşulu "on" veya "off" listesinin sonuna ekle."""
+        self._change({"op": "add", "type": condition_type, "condition": dict(condition)})
+
+    def delete_condition(self, condition_type, condition_id):
+        """Koşulu sil; bulunamazsa False döndür."""
+        return self._change({"op": "delete", "type": condition_type, "id": condition_id})
+
+    def toggle_condition(self, condition_type, condition_id):
+        """Koşulun aktif/pasif durumunu değiştir; bulunamazsa False döndür."""
+        return self._change({"op": "toggle", "type": condition_type, "id": condition_id})
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def install_fake_gpio():
+    """Testler motor ve sensör pinlerine dokunmasın diye donanımsız RPi.GPIO modülü kur."""
+    gpio = types.ModuleType("RPi.GPIO")
+    constants = {
+        "BOARD": 10, "BCM": 11, "OUT": 0, "IN": 1, "LOW": 0, "HIGH": 1,
+        "PUD_UP": 22, "RISING": 31, "FALLING": 32
+    }
+    for name, value in constants.items():
+        setattr(gpio, name, value)
+    for name in ("setwarnings", "setmode", "setup", "output", "cleanup", "add_event_detect", "remove_event_detect"):
+        setattr(gpio, name, lambda *args, **kwargs: None)
+    gpio.input = lambda pin: gpio.LOW
+
+    rpi = types.ModuleType("RPi")
+    rpi.GPIO = gpio
+    sys.modules["RPi"] = rpi
+    sys.modules["RPi.GPIO"] = gpio
+
+
+install_fake_gpio()
+
+
+@pytest.fixture
+def bot(tmp_path, monkeypatch):
+    """Geçici dizindeki depolarla, sahte motor sürücüsüyle bot modülü."""
+    pytest.importorskip("telegram")
+    pytest.importorskip("dotenv")
+    monkeypatch.chdir(tmp_path)
+
+    import actuator
+    import bot as module
+    import history
+    import render_cache
+    import rules
+    import stores
+
+    monkeypatch.setattr(module, "HISTORY", history.History(str(tmp_path / "history.bin"), flush_every=1))
+    monkeypatch.setattr(module, "CONDITION_STORE", stores.ConditionStore(str(tmp_path / "conditions.json")))
+    monkeypatch.setattr(module, "control_stale", frozenset())
+
+    # Sürüm numaraları her yeni depoda baştan başladığı için önbellekler sıfırlanır
+    monkeypatch.setattr(rules, "_cached_plan", None)
+    monkeypatch.setattr(rules, "_incremental_plan", None)
+    monkeypatch.setattr(module, "DASHBOARD_BODY_CACHE", render_cache.VersionedValue())
+    monkeypatch.setattr(module, "MANAGEMENT_PAGE_CACHE", render_cache.VersionedValue())
+
+    motor = actuator.MotorActuator(lambda: True, lambda: True, lambda: False)
+    motor.start()
+    monkeypatch.setattr(module, "MOTOR", motor)
+    yield module
+    motor.stop()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+import types
+
+import pytest
+
+
+class FakeQuery:
+    def __init__(self, data):
+        self.data = data
+        self.message = types.SimpleNamespace(chat_id=1, message_id=10)
+        self.answers = []
+
+    def answer(self, text=None):
+        self.answers.append(text)
+
+
+class FakeOutbox:
+    def __init__(self):
+        self.edits = []
+
+    def edit(self, chat_id, message_id, text, reply_markup=None, on_error=None):
+        self.edits.append((chat_id, message_id, text, reply_markup))
+
+
+@pytest.fixture
+def outbox(bot, monkeypatch):
+    fake = FakeOutbox()
+    monkeypatch.setattr(bot, "OUTBOX", fake)
+    return fake
+
+
+def condition(condition_id):
+    return {"id": condition_id, "type": "light", "operator": ">", "value": 500, "logical": "NONE", "state": True}
+
+
+@pytest.mark.parametrize("data", ["mp:", "mp:x", "mp:-1", "mp:²", "mp:1:2"])
+def test_malformed_page_shows_first_page(bot, outbox, data):
+    bot.CONDITION_STORE.replace([condition("a")], [])
+    query = FakeQuery(data)
+
+    bot.handle_callback_query(types.SimpleNamespace(callback_query=query), None)
+
+    assert query.answers == [None]
+    assert len(outbox.edits) == 1
+    assert outbox.edits[0][3] is bot.get_condition_management_keyboard(0)
+
+
+@pytest.mark.parametrize("data", ["mt:", "md:", "mt:x", "md:x:", "mt:x:nope", "md::nope"])
+def test_malformed_condition_action_refreshes_list(bot, outbox, data):
+    bot.CONDITION_STORE.replace([condition("a")], [])
+    query = FakeQuery(data)
+
+    bot.handle_callback_query(types.SimpleNamespace(callback_query=query), None)
+
+    assert query.answers == ["Koşul bulunamadı, liste güncellendi."]
+    assert len(outbox.edits) == 1
+    # Koşul değişmedi
+    assert bot.CONDITION_STORE.get()[0][0]["state"] is True
+
+
+def test_condition_action_with_bad_page_falls_back_to_first_page(bot, outbox, monkeypatch):
+    bot.CONDITION_STORE.replace([condition("a")], [])
+    monkeypatch.setattr(bot, "toggle_condition", lambda update, context, condition_id, condition_type: True)
+    query = FakeQuery(f"mt:x:{bot.CONDITION_STORE.handle('a')}")
+
+    bot.handle_callback_query(types.SimpleNamespace(callback_query=query), None)
+
+    assert query.answers == ["Koşulun durumu değiştirildi!"]
+    assert outbox.edits[0][3] is bot.get_condition_management_keyboard(0)
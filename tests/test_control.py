@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+import history
+import sensor_sampler
+
+
+def light_condition(value):
+    return {"id": "light", "type": "light", "operator": ">", "value": value, "logical": "NONE", "state": True}
+
+
+def test_missing_dht_reading_is_recorded_with_flag(bot, monkeypatch):
+    # DHT11 hiç geçerli ölçüm vermiyor, LDR çalışıyor
+    sampler = sensor_sampler.SensorSampler(lambda: 800.0, lambda: None)
+    sampler.sample()
+    monkeypatch.setattr(bot, "SENSOR_SAMPLER", sampler)
+
+    bot.control_step()
+
+    records = list(bot.HISTORY.records(0, float("inf")))
+    assert len(records) == 1
+    _, _, _, light, _, flags = records[0]
+    assert flags & history.FLAG_NO_CLIMATE
+    assert light == 800.0
+
+    # İklim değerleri özete girmez, ışık girer
+    summary = bot.HISTORY.summary(0, records[0][0] + 1)
+    assert summary["samples"] == 1
+    assert summary["temperature"] is None
+    assert summary["light"].mean == 800.0
+
+
+def test_light_rule_runs_while_dht_is_missing(bot, monkeypatch):
+    sampler = sensor_sampler.SensorSampler(lambda: 800.0, lambda: None)
+    sampler.sample()
+    monkeypatch.setattr(bot, "SENSOR_SAMPLER", sampler)
+    bot.CONDITION_STORE.replace([light_condition(500)], [])
+
+    bot.control_step()
+
+    assert bot.MOTOR.state() is True
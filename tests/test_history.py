@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import history
+
+
+def test_queries_read_unflushed_records_without_writing(tmp_path):
+    path = str(tmp_path / "history.bin")
+    store = history.History(path, flush_every=10)
+    for i in range(15):
+        store.append(1000.0 + i, 20.0, 50.0, 300.0, i % 2, 0)
+
+    # İlk 10 kayıt diske yazıldı, son 5 kayıt bellekte
+    size = os.path.getsize(path)
+    assert size == 10 * history.RECORD.size
+
+    records = list(store.records(1000.0, 2000.0))
+    assert [record[0] for record in records] == [1000.0 + i for i in range(15)]
+    assert [record[0] for record in store.records(1012.0, 1013.0)] == [1012.0, 1013.0]
+    assert store.summary(1000.0, 1014.0)["samples"] == 15
+    assert os.path.getsize(path) == size
+
+    store.flush()
+    assert list(store.records(1000.0, 2000.0)) == records
+
+
+def filled_history(tmp_path, now, duration, step):
+    store = history.History(str(tmp_path / "history.bin"), flush_every=4096)
+    t = now - duration
+    while t <= now:
+        store.append(t, 20.0, 50.0, 300.0, 0, 0)
+        t += step
+    return store
+
+
+def test_short_windows_use_minute_buckets(tmp_path):
+    now = 1_700_000_000.0
+    store = filled_history(tmp_path, now, 3 * 3600, 10)
+
+    for window, resolution in ((30 * 60, 120), (60 * 60, 180), (2 * 3600, 300)):
+        result_resolution, buckets = store.query(now - window, now, 24)
+        assert result_resolution == resolution
+        # En fazla bütçe kadar nokta (kısmi kenar kovası yüzünden bir fazlası)
+        assert window // resolution <= len(buckets) <= 25
+        assert all(bucket.resolution == resolution for bucket in buckets)
+
+
+def test_window_shorter_than_budget_keeps_minute_resolution(tmp_path):
+    now = 1_700_000_000.0
+    store = filled_history(tmp_path, now, 3600, 10)
+
+    resolution, buckets = store.query(now - 10 * 60, now, 24)
+
+    assert resolution == 60
+    assert 10 <= len(buckets) <= 11
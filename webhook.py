@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import hmac
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from telegram import Update
+
+logger = logging.getLogger(__name__)
+
+# Telegram'ın set_webhook(secret_token=...) ile verilen değeri gönderdiği başlık
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+# Kabul edilen en büyük istek gövdesi (bayt); güncellemeler bunun çok altındadır
+MAX_BODY_BYTES = 1024 * 1024
+
+# Uçtan uca test için kaydedilmiş örnek güncelleme: dashboard'daki "Yenile" butonu
+SAMPLE_UPDATE = {
+    "update_id": 100000001,
+    "callback_query": {
+        "id": "4382bfdwdsb323b2d9",
+        "from": {"id": 1111111, "is_bot": False, "first_name": "Test", "username": "test"},
+        "message": {
+            "message_id": 42,
+            "date": 1700000000,
+            "chat": {"id": 1111111, "type": "private", "first_name": "Test", "username": "test"},
+            "text": "📅 Tarih/Saat: 2023-11-14 22:13:20"
+        },
+        "chat_instance": "-1234567890123456789",
+        "data": "refresh"
+    }
+}
+
+
+class WebhookServer:
+    """Telegram güncellemelerini HTTP POST ile alıp update_queue'ya koyan sunucu.
+
+    Sadece path'e gelen ve gizli anahtar başlığı doğru olan istekler kabul
+    edilir. Gövde Update nesnesine çevrilip kuyruğa konur ve hemen 200
+    döndürülür; handler'lar dispatcher tarafından çalıştırılır.
+    """
+
+    def __init__(self, update_queue, bot, listen="127.0.0.1", port=8443, path="/telegram", secret_token=None):
+        self.update_queue = update_queue
+        self.bot = bot
+        self.path = path if path.startswith("/") else f"/{path}"
+        self.secret_token = secret_token
+
+        self.received_count = 0
+        self.rejected_count = 0
+
+        self.httpd = ThreadingHTTPServer((listen, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                server.handle_post(self)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Webhook: {format % args}")
+
+        return Handler
+
+    def start(self):
+        """Sunucuyu arka plan thread'inde başlat."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="webhook", daemon=True)
+        self._thread.start()
+        logger.info(f"Webhook sunucusu {self.httpd.server_address[0]}:{self.port}{self.path} adresinde dinliyor.")
+
+    def stop(self):
+        """Sunucuyu durdur."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def handle_post(self, request):
+        if request.path != self.path:
+            self._reject(request, 404)
+            return
+
+        if self.secret_token is not None:
+            token = request.headers.get(SECRET_HEADER, "")
+            if not hmac.compare_digest(token.encode(), self.secret_token.encode()):
+                logger.warning(f"Webhook: geçersiz gizli anahtar ({request.client_address[0]}).")
+                self._reject(request, 403)
+                return
+
+        try:
+            length = int(request.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self._reject(request, 400)
+            return
+
+        try:
+            data = json.loads(request.rfile.read(length))
+            update = Update.de_json(data, self.bot)
+        except Exception as e:
+            logger.error(f"Webhook: güncelleme çözümlenemedi: {e}")
+            self._reject(request, 400)
+            return
+
+        self.update_queue.put(update)
+        self.received_count += 1
+        request.send_response(200)
+        request.send_header("Content-Length", "0")
+        request.end_headers()
+
+    def _reject(self, request, status):
+        self.rejected_count += 1
+        request.send_response(status)
+        request.send_header("Content-Length", "0")
+        request.end_headers()
+
+
+def post_update(url, update, secret_token=None, timeout=5):
+    """Kaydedilmiş bir güncellemeyi webhook adresine POST et; HTTP durum kodunu döndür."""
+    headers = {"Content-Type": "application/json"}
+    if secret_token is not None:
+        headers[SECRET_HEADER] = secret_token
+    request = urllib.request.Request(url, data=json.dumps(update).encode(), headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+if __name__ == "__main__":
+    # Kullanım:
+    #   python webhook.py              yerel sunucuyla uçtan uca test
+    #   python webhook.py update.json  çalışan bot'un webhook sunucusuna kayıtlı güncellemeyi gönder
+    if len(sys.argv) > 1:
+        from dotenv import load_dotenv
+        load_dotenv()
+        port = int(os.getenv("WEBHOOK_PORT", "8443"))
+        path = os.getenv("WEBHOOK_PATH", "/telegram")
+        with open(sys.argv[1], 'r') as file:
+            recorded = json.load(file)
+        status = post_update(f"http://127.0.0.1:{port}{path}", recorded, os.getenv("WEBHOOK_SECRET"))
+        print(f"HTTP {status}")
+        sys.exit(0 if status == 200 else 1)
+
+    updates = queue.Queue()
+    server = WebhookServer(updates, None, port=0, secret_token="test-secret")
+    server.start()
+    url = f"http://127.0.0.1:{server.port}{server.path}"
+    try:
+        started = time.perf_counter()
+        status = post_update(url, SAMPLE_UPDATE, "test-secret")
+        update = updates.get(timeout=1)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"Geçerli anahtar: HTTP {status}, callback_data={update.callback_query.data!r} ({elapsed:.1f} ms)")
+        print(f"Yanlış anahtar: HTTP {post_update(url, SAMPLE_UPDATE, 'wrong')}")
+        print(f"Anahtarsız: HTTP {post_update(url, SAMPLE_UPDATE)}")
+        print(f"Yanlış yol: HTTP {post_update(url + 'x', SAMPLE_UPDATE, 'test-secret')}")
+    finally:
+        server.stop()